@@ -0,0 +1,80 @@
+"""
+Бенчмарк: время расчёта конфликтов(calculate_conflicts_and_stages) прежней реализацией
+(перебор всех фаз для каждой группы с проверкой _supervisor_conflicts) и по матрице
+совместимости направлений в битовых масках(ConflictsMatrix).
+
+Запуск: python -m benchmarks.bench_conflicts
+"""
+import random
+import time
+
+from sdp_lib.conflicts.calculate_conflicts import (
+    BaseConflictsAndStagesCalculations,
+    DataFields
+)
+
+
+NUM_CALLS = 20
+SIZES = ((8, 8), (24, 32), (48, 128))
+
+
+class LegacyConflictsAndStagesCalculations(BaseConflictsAndStagesCalculations):
+
+    def calculate_conflicts_and_stages(self) -> None:
+        """ Прежняя реализация BaseConflictsAndStagesCalculations.calculate_conflicts_and_stages. """
+        groups_prop = self.instance_data[DataFields.groups_property.value]
+        for group in self.instance_data.get(DataFields.sorted_all_num_groups.value):
+            groups_prop[group] = self._get_conflicts_and_stages_properties_for_group(group)
+
+    def _get_conflicts_and_stages_properties_for_group(self, num_group: int):
+        group_in_stages = set()
+        conflict_groups = {g for g in self.instance_data[DataFields.all_num_groups.value] if g != num_group}
+        for stage, groups_in_stage in self.instance_data[DataFields.sorted_stages_data.value].items():
+            if num_group in groups_in_stage:
+                group_in_stages.add(stage)
+                for g in groups_in_stage:
+                    conflict_groups.discard(g)
+        assert conflict_groups == self._supervisor_conflicts(num_group)
+        is_always_red: bool = False if group_in_stages else True
+        is_always_green: bool = group_in_stages == set(self.instance_data[DataFields.sorted_stages_data.value].keys())
+        return {
+            DataFields.stages.value: group_in_stages,
+            DataFields.enemy_groups.value: conflict_groups,
+            DataFields.always_red.value: is_always_red,
+            DataFields.always_green.value: is_always_green
+        }
+
+
+def create_stages(num_groups: int, num_stages: int) -> dict[str, str]:
+    rnd = random.Random(num_groups * num_stages)
+    return {
+        str(stage): ','.join(map(str, rnd.sample(range(1, num_groups + 1), rnd.randint(1, num_groups // 2))))
+        for stage in range(1, num_stages + 1)
+    }
+
+
+def measure(calc_class: type[BaseConflictsAndStagesCalculations], stages: dict[str, str]) -> tuple[float, dict]:
+    elapsed = 0.
+    for _ in range(NUM_CALLS):
+        calc = calc_class(stages)
+        calc.processing_data_for_calculation()
+        start_time = time.perf_counter()
+        calc.calculate_conflicts_and_stages()
+        elapsed += time.perf_counter() - start_time
+    return elapsed / NUM_CALLS, calc.instance_data[DataFields.groups_property.value]
+
+
+def main():
+    for num_groups, num_stages in SIZES:
+        stages = create_stages(num_groups, num_stages)
+        elapsed_old, groups_property_old = measure(LegacyConflictsAndStagesCalculations, stages)
+        elapsed_new, groups_property_new = measure(BaseConflictsAndStagesCalculations, stages)
+        assert groups_property_old == groups_property_new
+        print(
+            f'{num_groups:2} групп / {num_stages:3} фаз: перебор {elapsed_old * 1e3:8.3f} ms   '
+            f'ConflictsMatrix {elapsed_new * 1e3:8.3f} ms   x{elapsed_old / elapsed_new:.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
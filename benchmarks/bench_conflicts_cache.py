@@ -0,0 +1,53 @@
+"""
+Бенчмарк: время build_data для набора объектов с повторяющимся распределением направлений
+по фазам без кэша результатов и с кэшем(ConflictsResultsCache).
+
+Запуск: python -m benchmarks.bench_conflicts_cache
+"""
+import random
+import time
+
+from benchmarks.bench_conflicts import create_stages
+from sdp_lib.conflicts.calculate_conflicts import (
+    CommonConflictsAndStagesAPI,
+    DataFields
+)
+from sdp_lib.conflicts.results_cache import ConflictsResultsCache
+
+
+NUM_OBJECTS = 500
+# Количество различных распределений направлений по фазам
+NUM_LAYOUTS = 50
+
+
+def create_objects() -> list[dict[str, str]]:
+    rnd = random.Random(NUM_OBJECTS)
+    layouts = [create_stages(rnd.randint(8, 48), rnd.randint(4, 16)) for _ in range(NUM_LAYOUTS)]
+    return [dict(rnd.choice(layouts)) for _ in range(NUM_OBJECTS)]
+
+
+def measure(objects: list[dict[str, str]], cache: ConflictsResultsCache | None) -> tuple[float, list]:
+    results = []
+    start_time = time.perf_counter()
+    for stages in objects:
+        calc = CommonConflictsAndStagesAPI(stages)
+        calc.results_cache = cache
+        calc.build_data()
+        results.append(calc.instance_data[DataFields.matrix_F997.value])
+    return time.perf_counter() - start_time, results
+
+
+def main():
+    objects = create_objects()
+    elapsed_no_cache, results_no_cache = measure(objects, None)
+    cache = ConflictsResultsCache()
+    elapsed_cache, results_cache = measure(objects, cache)
+    assert results_no_cache == results_cache
+    print(
+        f'{NUM_OBJECTS} объектов / {NUM_LAYOUTS} распределений: без кэша {elapsed_no_cache * 1e3:8.1f} ms   '
+        f'с кэшем {elapsed_cache * 1e3:8.1f} ms   x{elapsed_no_cache / elapsed_cache:.1f}   {cache.export()}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Бенчмарк: время расчёта конфликтов NUM_CONFIGS объектов последовательно в одном процессе
+и calculate_many в пуле процессов.
+
+Запуск: python -m benchmarks.bench_conflicts_many
+"""
+import os
+import random
+import time
+
+from benchmarks.bench_conflicts import create_stages
+from sdp_lib.conflicts.calculate_many import calculate_many
+
+
+NUM_CONFIGS = 500
+
+
+def main():
+    rnd = random.Random(0)
+    configs = [create_stages(rnd.randint(8, 48), rnd.randint(4, 64)) for _ in range(NUM_CONFIGS)]
+    start_time = time.perf_counter()
+    calculate_many(configs, workers=1)
+    elapsed_serial = time.perf_counter() - start_time
+    workers = max(os.cpu_count() or 1, 2)
+    start_time = time.perf_counter()
+    results = calculate_many(configs, workers=workers)
+    elapsed_pool = time.perf_counter() - start_time
+    assert all(result.error is None for result in results)
+    print(
+        f'{NUM_CONFIGS} объектов: последовательно {elapsed_serial:6.2f} s   '
+        f'calculate_many(workers={workers}) {elapsed_pool:6.2f} s   x{elapsed_serial / elapsed_pool:.1f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Бенчмарк: время формирования выходных данных расчёта конфликтов(create_data_for_output):
+общей матрицы, матрицы F997, конфликтных направлений F994 и бинарных значений фаз
+прежней реализацией(построчно, ячейка за ячейкой) и матрицами NumPy.
+
+Запуск: python -m benchmarks.bench_conflicts_output
+"""
+import time
+
+from benchmarks.bench_conflicts import create_stages
+from sdp_lib.conflicts.calculate_conflicts import (
+    DataFields,
+    OutputDataCalculations
+)
+
+
+NUM_CALLS = 20
+SIZES = ((8, 8), (24, 32), (48, 64), (48, 128))
+
+output_fields = (
+    DataFields.output_matrix, DataFields.matrix_F997, DataFields.numbers_conflicts_groups,
+    DataFields.stages_bin_vals, DataFields.stages_bin_vals_f009, DataFields.sum_conflicts
+)
+
+
+class LegacyOutputDataCalculations(OutputDataCalculations):
+    """ Прежняя реализация OutputDataCalculations.create_data_for_output. """
+
+    def _create_row_output_matrix(self, all_numbers_groups, current_group=None, enemy_groups=None, first_row=False):
+        if not first_row:
+            row = [f'|0{current_group}|' if len(str(current_group)) == 1 else f'|{current_group}|']
+            row += [
+                DataFields.no_conflict_O.value if gr not in enemy_groups else DataFields.conflict_K.value
+                for gr in all_numbers_groups
+            ]
+            row[len(self.instance_data[DataFields.output_matrix.value])] = DataFields.cross_group_star_matrix.value
+        else:
+            row = [DataFields.cross_group_star_matrix.value]
+            row += [f'|0{g}|' if len(str(g)) == 1 else f'|{g}|' for g in all_numbers_groups]
+        return row
+
+    def _create_row_f997(self, num_groups, current_group, enemy_groups):
+        return [
+            DataFields.cross_group997.value if i + 1 == current_group else
+            DataFields.conflictF997.value if i + 1 in enemy_groups else DataFields.no_conflictF997.value
+            for i in range(num_groups)
+        ]
+
+    def _get_bin_val_stages(self, stages):
+        return sum(map(lambda x: 2 ** x if x != 8 else 2 ** 0, (int(s) for s in stages)))
+
+    def create_data_for_output(self):
+        num_groups = self.instance_data[DataFields.number_of_groups.value]
+        groups_property = self.instance_data[DataFields.groups_property.value]
+        all_numbers_groups = sorted(self.instance_data[DataFields.all_num_groups.value])
+        create_bin_vals_stages = self.instance_data[DataFields.allow_make_config.value]
+
+        self.instance_data[DataFields.output_matrix.value] = [
+            self._create_row_output_matrix(all_numbers_groups, first_row=True)
+        ]
+        f997, numbers_conflicts_groups, stages_bin_vals = [], [], []
+        sum_conflicts = 0
+
+        for num_group, property_group in groups_property.items():
+            enemy_groups = property_group[DataFields.enemy_groups.value]
+            self.instance_data[DataFields.output_matrix.value].append(
+                self._create_row_output_matrix(all_numbers_groups, num_group, enemy_groups)
+            )
+            if self.instance_data[DataFields.allow_make_config.value]:
+                f997.append(self._create_row_f997(num_groups, num_group, enemy_groups))
+                numbers_conflicts_groups.append(f"{';'.join(map(str, sorted(enemy_groups)))};")
+            sum_conflicts += len(enemy_groups)
+            if create_bin_vals_stages:
+                stages_bin_vals.append(self._get_bin_val_stages(stages=property_group[DataFields.stages.value]))
+
+        self.instance_data[DataFields.matrix_F997.value] = f997
+        self.instance_data[DataFields.numbers_conflicts_groups.value] = numbers_conflicts_groups
+        self.instance_data[DataFields.stages_bin_vals.value] = stages_bin_vals
+        self.instance_data[DataFields.stages_bin_vals_f009.value] = self._get_bin_vals_stages_for_swarco_f009()
+        self.instance_data[DataFields.sum_conflicts.value] = sum_conflicts
+
+
+def measure(calc_class: type[OutputDataCalculations], stages: dict[str, str]) -> tuple[float, list]:
+    elapsed = 0.
+    for _ in range(NUM_CALLS):
+        calc = calc_class(stages)
+        calc.processing_data_for_calculation()
+        calc.calculate_conflicts_and_stages()
+        start_time = time.perf_counter()
+        calc.create_data_for_output()
+        elapsed += time.perf_counter() - start_time
+    return elapsed / NUM_CALLS, [calc.instance_data[field.value] for field in output_fields]
+
+
+def main():
+    for num_groups, num_stages in SIZES:
+        stages = create_stages(num_groups, num_stages)
+        elapsed_old, output_old = measure(LegacyOutputDataCalculations, stages)
+        elapsed_new, output_new = measure(OutputDataCalculations, stages)
+        assert output_old == output_new
+        print(
+            f'{num_groups:2} групп / {num_stages:3} фаз: построчно {elapsed_old * 1e3:8.3f} ms   '
+            f'NumPy {elapsed_new * 1e3:8.3f} ms   x{elapsed_old / elapsed_new:.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
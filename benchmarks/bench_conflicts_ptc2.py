@@ -0,0 +1,115 @@
+"""
+Бенчмарк: время и пиковая память формирования NUM_CONFIGS файлов .PTC2
+прежней реализацией SwarcoConflictsAndStagesAPI.create_config(запись каждой строки
+отдельным write) и генератором строк(iter_config_lines + writelines).
+
+Запуск: python -m benchmarks.bench_conflicts_ptc2
+"""
+import pathlib
+import tempfile
+import time
+import tracemalloc
+from typing import Iterator, TextIO
+
+from benchmarks.bench_conflicts import create_stages
+from sdp_lib.conflicts.calculate_conflicts import (
+    DataFields,
+    SwarcoConflictsAndStagesAPI
+)
+
+
+NUM_CONFIGS = 200
+NUM_FILLER_LINES = 3000
+
+
+class LegacySwarcoConflictsAndStagesAPI(SwarcoConflictsAndStagesAPI):
+    """ Прежняя реализация SwarcoConflictsAndStagesAPI.create_config. """
+
+    def write_data_to_file(
+            self,
+            file_for_write: TextIO,
+            file_for_read: Iterator,
+            curr_line_from_file_for_write: str,
+            matrix=None,
+            stages_bin_vals=None
+    ):
+        file_for_write.write(f'{curr_line_from_file_for_write}')
+        if matrix is not None:
+            for matrix_line in matrix:
+                file_for_write.write(f'{"".join(matrix_line)}\n')
+        elif stages_bin_vals is not None:
+            for val in stages_bin_vals:
+                zeros = f'{"0" * 1 * (3 - len(str(val)))}'
+                file_for_write.write(f';{zeros}{val};;1;\n')
+        while 'NeXt' not in curr_line_from_file_for_write:
+            curr_line_from_file_for_write = next(file_for_read)
+        file_for_write.write(curr_line_from_file_for_write)
+
+    def create_config(self):
+        p = pathlib.Path(self.path_to_src_config)
+        path_to_new_PTC2 = p.parent / f'{self.prefix_new_config}{p.name}'
+        with open(self.path_to_src_config) as src, open(path_to_new_PTC2, 'w') as new_file:
+            for line in src:
+                if self.conflicts_f997 in line or self.conflicts_f992 in line:
+                    self.write_data_to_file(new_file, src, line, matrix=self.instance_data[DataFields.matrix_F997.value])
+                elif self.conflicts_f006 in line:
+                    self.write_data_to_file(new_file, src, line)
+                elif self.stage_bin_vals_f009 in line:
+                    self.write_data_to_file(
+                        new_file, src, line, stages_bin_vals=self.instance_data[DataFields.stages_bin_vals.value]
+                    )
+                else:
+                    new_file.write(line)
+        self.push_result_to_instance_data(path_to_new_PTC2)
+
+
+def create_src_config(path: pathlib.Path) -> None:
+    filler = ''.join(f';{i};0;0;0;\n' for i in range(NUM_FILLER_LINES))
+    path.write_text(
+        f'{filler}'
+        f'{SwarcoConflictsAndStagesAPI.conflicts_f997}\n' + ';old;\n' * 48 + 'NeXt\n'
+        f'{filler}'
+        f'{SwarcoConflictsAndStagesAPI.conflicts_f992}\n' + ';old;\n' * 48 + 'NeXt\n'
+        f'{SwarcoConflictsAndStagesAPI.conflicts_f006}\n' + ';old;\n' * 48 + 'NeXt\n'
+        f'{SwarcoConflictsAndStagesAPI.stage_bin_vals_f009}\n' + ';000;;1;\n' * 48 + 'NeXt\n'
+        f'{filler}'
+    )
+
+
+def measure(api_class: type[SwarcoConflictsAndStagesAPI], calcs: list, src: pathlib.Path) -> tuple[float, int, str]:
+    for calc in calcs:
+        calc.__class__ = api_class
+        calc.path_to_src_config = str(src)
+    start_time = time.perf_counter()
+    for calc in calcs:
+        calc.create_config()
+    elapsed = time.perf_counter() - start_time
+    tracemalloc.start()
+    calcs[0].create_config()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, (src.parent / f'new_{src.name}').read_text()
+
+
+def main():
+    calcs = []
+    for _ in range(NUM_CONFIGS):
+        calc = SwarcoConflictsAndStagesAPI(create_stages(48, 16))
+        calc.processing_data_for_calculation()
+        calc.calculate_conflicts_and_stages()
+        calc.create_data_for_output()
+        calcs.append(calc)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = pathlib.Path(tmp_dir) / 'src.PTC2'
+        create_src_config(src)
+        elapsed_old, peak_old, config_old = measure(LegacySwarcoConflictsAndStagesAPI, calcs, src)
+        elapsed_new, peak_new, config_new = measure(SwarcoConflictsAndStagesAPI, calcs, src)
+    assert config_old == config_new
+    print(
+        f'{NUM_CONFIGS} .PTC2: write {elapsed_old:6.3f} s, пик {peak_old / 2 ** 10:7.1f} KiB   '
+        f'writelines {elapsed_new:6.3f} s, пик {peak_new / 2 ** 10:7.1f} KiB   x{elapsed_old / elapsed_new:.2f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
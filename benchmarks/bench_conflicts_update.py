@@ -0,0 +1,79 @@
+"""
+Бенчмарк: время пересчёта конфликтов после изменения направлений одной фазы
+полным расчётом(build_data) и инкрементально(update_stage).
+
+Запуск: python -m benchmarks.bench_conflicts_update
+"""
+import random
+import time
+
+from benchmarks.bench_conflicts import create_stages
+from sdp_lib.conflicts.calculate_conflicts import (
+    CommonConflictsAndStagesAPI,
+    DataFields
+)
+
+
+NUM_CALLS = 50
+SIZES = ((8, 8), (24, 32), (48, 64), (48, 128))
+
+output_fields = (
+    DataFields.groups_property, DataFields.output_matrix, DataFields.matrix_F997,
+    DataFields.numbers_conflicts_groups, DataFields.stages_bin_vals, DataFields.stages_bin_vals_f009,
+    DataFields.sum_conflicts
+)
+
+
+def create_edits(stages: dict[str, str], num_groups: int) -> list[tuple[str, str]]:
+    """
+    Изменения фаз, не меняющие состав направлений: каждое направление остаётся хотя бы в одной фазе.
+    """
+    rnd = random.Random(num_groups)
+    edits = []
+    for _ in range(NUM_CALLS):
+        stage = rnd.choice(list(stages))
+        groups = set(stages[stage].split(','))
+        used_elsewhere = {group for other, val in stages.items() if other != stage for group in val.split(',')}
+        groups = (groups & used_elsewhere) | {str(rnd.randint(1, num_groups))}
+        edits.append((stage, ','.join(sorted(groups, key=int))))
+    return edits
+
+
+def measure_full(stages: dict[str, str], edits: list[tuple[str, str]]) -> tuple[float, list]:
+    stages, elapsed = dict(stages), 0.
+    for stage, groups in edits:
+        stages[stage] = groups
+        start_time = time.perf_counter()
+        calc = CommonConflictsAndStagesAPI(dict(stages))
+        # Полный расчёт без кэша результатов
+        calc.results_cache = None
+        calc.build_data()
+        elapsed += time.perf_counter() - start_time
+    return elapsed / len(edits), [calc.instance_data[field.value] for field in output_fields]
+
+
+def measure_update(stages: dict[str, str], edits: list[tuple[str, str]]) -> tuple[float, list]:
+    calc, elapsed = CommonConflictsAndStagesAPI(dict(stages)), 0.
+    calc.build_data()
+    for stage, groups in edits:
+        start_time = time.perf_counter()
+        calc.update_stage(stage, groups)
+        elapsed += time.perf_counter() - start_time
+    return elapsed / len(edits), [calc.instance_data[field.value] for field in output_fields]
+
+
+def main():
+    for num_groups, num_stages in SIZES:
+        stages = create_stages(num_groups, num_stages)
+        edits = create_edits(stages, num_groups)
+        elapsed_full, output_full = measure_full(stages, edits)
+        elapsed_update, output_update = measure_update(stages, edits)
+        assert output_full == output_update
+        print(
+            f'{num_groups:2} групп / {num_stages:3} фаз: build_data {elapsed_full * 1e3:8.3f} ms   '
+            f'update_stage {elapsed_update * 1e3:8.3f} ms   x{elapsed_full / elapsed_update:.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Бенчмарк: память для хранения входов NUM_HOSTS ДК Peek в виде словарей InputsPageParser
+и в виде InputsTable, а также время формирования payloads установки фазы
+по словарю(прежняя реализация InputsVarbinds) и по InputsTable.
+
+Запуск: python -m benchmarks.bench_peek_inputs
+"""
+import time
+import tracemalloc
+
+from tests.recorded_peek_pages import inputs_page
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.http.peek.inputs_table import InputsTable
+from sdp_lib.management_controllers.http.peek.static_data import (
+    ActuatorAsChar,
+    ActuatorAsValue
+)
+from sdp_lib.management_controllers.http.peek.varbinds import (
+    MPP_MAN,
+    PREFIX_MAN_STAGE_PEEK,
+    InputsVarbinds,
+    mpp_stages_inputs
+)
+from sdp_lib.management_controllers.parsers.parsers_peek_http_new import InputsPageParser
+from sdp_lib.management_controllers.structures import InputsStructure
+
+
+NUM_HOSTS = 500
+NUM_CALLS = 20000
+
+
+def get_varbinds_set_stage_from_dict(inputs: dict, stage: int) -> list:
+    """ Прежняя реализация InputsVarbinds._get_varbinds_set_stage. """
+    varbinds = InputsVarbinds()
+    payloads = []
+    if inputs[MPP_MAN][InputsStructure.STATE] == '0' or inputs[MPP_MAN][InputsStructure.ACTUATOR] in (
+            ActuatorAsChar.VF, ActuatorAsChar.OFF
+    ):
+        payloads.append(varbinds.create_payload(inputs[MPP_MAN][InputsStructure.INDEX], ActuatorAsValue.ON))
+    mpp_ph_to_set = f'{PREFIX_MAN_STAGE_PEEK}{stage}'
+    for mpp in mpp_stages_inputs:
+        if (mpp != mpp_ph_to_set
+            and inputs[mpp][InputsStructure.STATE] != '0'
+            and inputs[mpp][InputsStructure.ACTUATOR] != ActuatorAsChar.OFF
+        ):
+            payloads.append(varbinds.create_payload(inputs[mpp][InputsStructure.INDEX], ActuatorAsValue.OFF))
+    if inputs[mpp_ph_to_set][InputsStructure.ACTUATOR] != ActuatorAsChar.ON:
+        payloads.append(varbinds.create_payload(inputs[mpp_ph_to_set][InputsStructure.INDEX], ActuatorAsValue.ON))
+    return payloads
+
+
+def measure_memory(create) -> int:
+    tracemalloc.start()
+    hosts = [create(i) for i in range(NUM_HOSTS)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del hosts
+    return size
+
+
+def main():
+    page_parts = inputs_page.split('\n')
+
+    def create_dict(i):
+        # Уникальные строки для каждого хоста, как после получения страниц разных ДК
+        content = '\n'.join(part.replace(';0;', f';{i % 2};', 1) for part in page_parts)
+        return InputsPageParser().parse(content)[str(FieldsNames.inputs)]
+
+    dict_size = measure_memory(create_dict)
+    table_size = measure_memory(lambda i: InputsTable.from_dict(create_dict(i)))
+    print(
+        f'{NUM_HOSTS} хостов: dict {dict_size / 2 ** 20:6.2f} MiB   '
+        f'InputsTable {table_size / 2 ** 20:6.2f} MiB   x{dict_size / table_size:.2f}'
+    )
+
+    inputs = create_dict(0)
+    table = InputsTable.from_dict(inputs)
+    varbinds = InputsVarbinds(table)
+    assert sorted(get_varbinds_set_stage_from_dict(inputs, 3)) == sorted(varbinds.get_varbinds_set_stage(3))
+
+    start_time = time.perf_counter()
+    for _ in range(NUM_CALLS):
+        get_varbinds_set_stage_from_dict(inputs, 3)
+    elapsed_old = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for _ in range(NUM_CALLS):
+        varbinds.get_varbinds_set_stage(3)
+    elapsed_new = time.perf_counter() - start_time
+    print(
+        f'set_stage payloads: dict {elapsed_old / NUM_CALLS * 1e6:6.2f} us   '
+        f'InputsTable {elapsed_new / NUM_CALLS * 1e6:6.2f} us   x{elapsed_old / elapsed_new:.2f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Бенчмарк: пропускная способность MainPageParser.parse(разбор за один проход регулярным выражением)
+в сравнении с прежним построчным разбором(splitlines() и проверка каждого шаблона в каждой строке).
+
+Запуск: python -m benchmarks.bench_peek_parsers
+"""
+import time
+
+from tests.recorded_peek_pages import (
+    main_page,
+    main_page_4_streams
+)
+from sdp_lib.management_controllers.parsers.parsers_peek_http_new import MainPageParser
+
+
+NUM_PAGES = 20000
+
+
+def get_line_data(line: str, pattern: str) -> str:
+    return line.split(pattern)[-1]
+
+
+def parse_xp_data(lines: list[str]) -> tuple[str, str, str, str]:
+    mode, stage = get_line_data(lines[5], ':D;;##T_MODE## (##T_STAGE##);').split()
+    return (
+        get_line_data(lines[0], '<b>##T_STREAM## ').replace('</b>', ''),
+        get_line_data(lines[3], ':D;;##T_STATE##;'),
+        mode,
+        stage.replace('(', '').replace(')', '')
+    )
+
+
+def parse_line_by_line(parser: MainPageParser, content: str):
+    """ Прежняя реализация MainPageParser.parse. """
+    content_as_list = content.splitlines()
+    common_data_is_extracted = False
+    for i, line in enumerate(content_as_list):
+        if not common_data_is_extracted:
+            if ':SUBTITLE;' in line:
+                parser.address = get_line_data(line, ':SUBTITLE;')
+            elif ':D;;##T_PLAN##;' in line:
+                parser.current_plan = get_line_data(line, ':D;;##T_PLAN##;').split(maxsplit=1)[0]
+            elif '##T_TIMINGSET##;' in line:
+                parser.current_plan_param = get_line_data(line, '##T_TIMINGSET##;')
+            elif ':D;;##T_TIME##;' in line:
+                parser.current_time = get_line_data(line, ':D;;##T_TIME##;')
+            elif ':D;;##T_ALARMS##;' in line:
+                parser.current_alarms = get_line_data(line, ':D;;##T_ALARMS##;')
+            elif ':ENDTABLE' in line:
+                common_data_is_extracted = True
+        elif '<b>##T_STREAM## ' in line:
+            parser.all_xp_data.append(parse_xp_data(content_as_list[i: i + 7]))
+    return parser.build_attr_data_for_response(parser._get_properties())
+
+
+def run(parse_func, content: str) -> float:
+    start_time = time.perf_counter()
+    for _ in range(NUM_PAGES):
+        parse_func(MainPageParser(), content)
+    return time.perf_counter() - start_time
+
+
+def main():
+    for name, content in (('2 потока', main_page), ('4 потока', main_page_4_streams)):
+        assert parse_line_by_line(MainPageParser(), content) == MainPageParser().parse(content)
+        elapsed_old = run(parse_line_by_line, content)
+        elapsed_new = run(MainPageParser.parse, content)
+        mib = len(content.encode()) * NUM_PAGES / 2 ** 20
+        print(
+            f'{name:<10} old {NUM_PAGES / elapsed_old:9.0f} pages/s ({mib / elapsed_old:6.1f} MiB/s)   '
+            f'new {NUM_PAGES / elapsed_new:9.0f} pages/s ({mib / elapsed_new:6.1f} MiB/s)   '
+            f'x{elapsed_old / elapsed_new:.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
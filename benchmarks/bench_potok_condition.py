@@ -0,0 +1,60 @@
+"""
+Бенчмарк: время вычисления условия перехода/продления ДК Поток по множеству снимков
+значений токенов разбором строки(ConditionResult.get_condition_result: замена токенов,
+лексер и парсер rply) и скомпилированным условием(compile).
+
+Запуск: python -m benchmarks.bench_potok_condition
+"""
+import contextlib
+import io
+import random
+import time
+
+from sdp_lib.potok_controller.potok_user_api import (
+    ConditionResult,
+    compile
+)
+
+
+NUM_SNAPSHOTS = 2000
+
+condition_string = (
+    '(ddr(D41) and (ddr(D42) or ddo(D45)) or (not ddr(D43) and ddr(D44)) and mr(G1)) '
+    'and fctg(G1) >= 40 or (ddr(D33) or ddr(D34) or ddr(D35) or ddr(D36)) and (fctg(G2)<66)'
+)
+
+
+def main():
+    compiled = compile(condition_string)
+    rnd = random.Random(NUM_SNAPSHOTS)
+    snapshots = [{token: rnd.randint(0, 1) for token in compiled.tokens} for _ in range(NUM_SNAPSHOTS)]
+
+    condition = ConditionResult(condition_string)
+    start_time = time.perf_counter()
+    # get_condition_result выводит результат каждого вычисления
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [
+            condition.get_condition_result(condition.func_to_val(snapshot)) for snapshot in snapshots
+        ]
+    elapsed_parse = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    compiled = compile(condition_string)
+    results_dict = [compiled(snapshot) for snapshot in snapshots]
+    elapsed_dict = time.perf_counter() - start_time
+
+    arrays = [[snapshot[token] for token in compiled.tokens] for snapshot in snapshots]
+    start_time = time.perf_counter()
+    results_array = [compiled(values) for values in arrays]
+    elapsed_array = time.perf_counter() - start_time
+
+    assert expected == results_dict == results_array
+    print(
+        f'{NUM_SNAPSHOTS} снимков, {len(compiled.tokens)} токенов: разбор строки {elapsed_parse * 1e3:8.1f} ms   '
+        f'compile + dict {elapsed_dict * 1e3:6.1f} ms(x{elapsed_parse / elapsed_dict:.0f})   '
+        f'массив {elapsed_array * 1e3:6.1f} ms(x{elapsed_parse / elapsed_array:.0f})'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Бенчмарк: количество snmp-get запросов в секунду и процессорное время клиента на запрос
+через get_cmd(транспорты из TransportTargetsCache) и через BatchSnmpEngine(один UDP сокет
+на все запросы). Количество запросов в секунду ограничено производительностью респондера.
+Запросы отправляются локальному респонденту на 127.0.0.1:161(требуются права root),
+запущенному в отдельном процессе.
+
+Запуск: python -m benchmarks.bench_snmp_batch
+"""
+import asyncio
+import time
+
+from pysnmp.hlapi.v3arch.asyncio import (
+    CommunityData,
+    ContextData,
+    ObjectIdentity,
+    ObjectType,
+    SnmpEngine,
+    get_cmd
+)
+
+from tests.snmp_responder import start_responder_process
+from sdp_lib.management_controllers.snmp.snmp_batch import BatchSnmpEngine
+from sdp_lib.management_controllers.snmp.snmp_requests import get_transport_targets_cache
+
+
+IP = '127.0.0.1'
+NUM_REQUESTS = 1000
+CONCURRENCY = 50
+varbinds = [ObjectType(ObjectIdentity(f'1.3.6.1.4.1.1618.3.7.2.{i}.1.0')) for i in range(1, 8)]
+
+
+async def run(name: str, request_method) -> None:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def single():
+        async with semaphore:
+            error_indication, *_ = await request_method()
+            assert error_indication is None, error_indication
+
+    await single()  # прогрев
+    start_time, start_cpu_time = time.perf_counter(), time.process_time()
+    await asyncio.gather(*(single() for _ in range(NUM_REQUESTS)))
+    elapsed, cpu_time = time.perf_counter() - start_time, time.process_time() - start_cpu_time
+    print(
+        f'{name:<28} {NUM_REQUESTS / elapsed:10.1f} req/s  '
+        f'cpu {cpu_time / NUM_REQUESTS * 1e6:8.1f} us/request  ({elapsed:.3f} s)'
+    )
+
+
+async def main():
+    responder = start_responder_process(IP)
+    engine = SnmpEngine()
+    batch_engine = BatchSnmpEngine()
+    batch_engine_lookup_mib = BatchSnmpEngine(lookup_mib=True)
+    try:
+        async def request_get_cmd():
+            return await get_cmd(
+                engine,
+                CommunityData('public'),
+                await get_transport_targets_cache(engine).get(IP, 1, 0),
+                ContextData(),
+                *varbinds
+            )
+
+        async def request_batch():
+            return await batch_engine.get(IP, 'public', varbinds, timeout=1)
+
+        async def request_batch_lookup_mib():
+            return await batch_engine_lookup_mib.get(IP, 'public', varbinds, timeout=1)
+
+        await run('get_cmd', request_get_cmd)
+        await run('BatchSnmpEngine(lookup_mib)', request_batch_lookup_mib)
+        await run('BatchSnmpEngine', request_batch)
+    finally:
+        batch_engine.close()
+        batch_engine_lookup_mib.close()
+        responder.terminate()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""
+Бенчмарк: время парса записанных varbinds ответов get_states парсером
+с некомпилированной конфигурацией(str()/prettyPrint() для каждого varbind)
+и с компилированной конфигурацией(BaseSnmpParser.parse_compiled).
+
+Запуск: python -m benchmarks.bench_snmp_parsers
+"""
+import time
+
+from benchmarks.recorded_varbinds import (
+    potok_p_states,
+    potok_s_states,
+    scn_as_ascii_string,
+    swarco_states
+)
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.parsers.snmp_parsers.processing_methods import (
+    build_func_with_remove_scn,
+    get_val_as_str
+)
+from sdp_lib.management_controllers.parsers.snmp_parsers.varbinds_parsers import (
+    ParsersVarbindsPotokP,
+    ParsersVarbindsPotokS,
+    ParsersVarbindsSwarco,
+    pretty_processing_stcip
+)
+
+
+NUM_RESPONSES = 20000
+
+pretty_processing_ug405 = pretty_processing_stcip._replace(
+    oid_handler=build_func_with_remove_scn(scn_as_ascii_string, get_val_as_str),
+    host_protocol=FieldsNames.protocol_ug405,
+    oid_suffix=scn_as_ascii_string
+)
+
+cases = (
+    ('Swarco', ParsersVarbindsSwarco, swarco_states, pretty_processing_stcip),
+    ('Поток (S)', ParsersVarbindsPotokS, potok_s_states, pretty_processing_stcip),
+    ('Поток (P)', ParsersVarbindsPotokP, potok_p_states, pretty_processing_ug405),
+)
+
+
+def run(parser_class, varbinds, config) -> float:
+    parser = parser_class()
+    start_time = time.perf_counter()
+    for _ in range(NUM_RESPONSES):
+        parser.parsed_content_as_dict = {}
+        parser.parse(varbinds=varbinds, config=config)
+    return time.perf_counter() - start_time
+
+
+def main():
+    for name, parser_class, varbinds, config in cases:
+        elapsed_old = run(parser_class, varbinds, config._replace(compiled=False))
+        elapsed_new = run(parser_class, varbinds, config)
+        print(
+            f'{name:<10} old {elapsed_old / NUM_RESPONSES * 1e6:8.2f} us/response   '
+            f'compiled {elapsed_new / NUM_RESPONSES * 1e6:8.2f} us/response   '
+            f'x{elapsed_old / elapsed_new:.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
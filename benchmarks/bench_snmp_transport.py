@@ -0,0 +1,95 @@
+"""
+Бенчмарк: время подготовки транспорта и количество snmp-get запросов в секунду
+при создании UdpTransportTarget на каждый запрос и при использовании TransportTargetsCache.
+Запросы отправляются локальному респондеру на 127.0.0.1:161(требуются права root),
+запущенному в отдельном процессе.
+
+Запуск: python -m benchmarks.bench_snmp_transport
+"""
+import asyncio
+import time
+
+from pysnmp.hlapi.v3arch.asyncio import (
+    CommunityData,
+    ContextData,
+    ObjectIdentity,
+    ObjectType,
+    SnmpEngine,
+    UdpTransportTarget,
+    get_cmd
+)
+
+from tests.snmp_responder import start_responder_process
+from sdp_lib.management_controllers.snmp.snmp_requests import get_transport_targets_cache
+
+
+IP = '127.0.0.1'
+NUM_REQUESTS = 1000
+NUM_TARGETS = 5000
+CONCURRENCY = 50
+varbinds = [ObjectType(ObjectIdentity(f'1.3.6.1.4.1.1618.3.7.2.{i}.1.0')) for i in range(1, 8)]
+
+
+async def request_without_cache(engine: SnmpEngine):
+    return await get_cmd(
+        engine,
+        CommunityData('public'),
+        await UdpTransportTarget.create((IP, 161), timeout=1, retries=0),
+        ContextData(),
+        *varbinds
+    )
+
+
+async def request_with_cache(engine: SnmpEngine):
+    return await get_cmd(
+        engine,
+        CommunityData('public'),
+        await get_transport_targets_cache(engine).get(IP, 1, 0),
+        ContextData(),
+        *varbinds
+    )
+
+
+async def run_targets_setup() -> None:
+    start_time = time.perf_counter()
+    for _ in range(NUM_TARGETS):
+        await UdpTransportTarget.create((IP, 161), timeout=1, retries=0)
+    elapsed = time.perf_counter() - start_time
+    print(f'{"create per request":<24} {elapsed / NUM_TARGETS * 1e6:10.2f} us/target')
+
+    cache = get_transport_targets_cache(SnmpEngine())
+    start_time = time.perf_counter()
+    for _ in range(NUM_TARGETS):
+        await cache.get(IP, 1, 0)
+    elapsed = time.perf_counter() - start_time
+    print(f'{"TransportTargetsCache":<24} {elapsed / NUM_TARGETS * 1e6:10.2f} us/target')
+
+
+async def run(name: str, request_method) -> None:
+    engine = SnmpEngine()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def single():
+        async with semaphore:
+            error_indication, *_ = await request_method(engine)
+            assert error_indication is None, error_indication
+
+    await single()  # прогрев
+    start_time = time.perf_counter()
+    await asyncio.gather(*(single() for _ in range(NUM_REQUESTS)))
+    elapsed = time.perf_counter() - start_time
+    print(f'{name:<24} {NUM_REQUESTS / elapsed:10.1f} req/s  ({elapsed:.3f} s)')
+
+
+async def main():
+    await run_targets_setup()
+    responder = start_responder_process(IP)
+    try:
+        await run('create per request', request_without_cache)
+        await run('TransportTargetsCache', request_with_cache)
+    finally:
+        responder.terminate()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
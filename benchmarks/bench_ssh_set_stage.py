@@ -0,0 +1,72 @@
+"""
+Бенчмарк: время установки фазы SwarcoSSH.set_stage через имитацию терминала ДК
+при чтении stdout с фиксированным таймаутом(прежняя реализация, read_timed),
+до появления приглашения терминала(read_until_prompt) и при отправке команд
+одной записью(SwarcoSSH.pipeline_commands).
+
+Запуск: python -m benchmarks.bench_ssh_set_stage
+"""
+import asyncio
+import time
+
+from tests.itc_ssh_server import ItcTerminalServer
+from sdp_lib.management_controllers.ssh import ssh_core
+from sdp_lib.management_controllers.ssh.ssh_core import (
+    SshSessionPool,
+    SwarcoSSH,
+    read_timed
+)
+
+
+NUM_CALLS = 3
+RESPONSE_DELAY = .005
+RTT = .02
+
+
+async def read_timed_legacy(stream, timeout: float = .6, bufsize: int = 1024, **kwargs) -> str:
+    """ Прежнее чтение stdout в SwarcoItcUserConnectionsSSH. """
+    return await read_timed(stream, timeout=.6, bufsize=bufsize)
+
+
+async def measure(server: ItcTerminalServer, pipeline_commands: bool) -> float:
+    pool = SshSessionPool(port=server.port)
+    try:
+        host = SwarcoSSH('127.0.0.1')
+        host.session_pool = pool
+        # Первое подключение и вход на уровень L2 не учитываются
+        await host.set_stage(1)
+        start_time = time.perf_counter()
+        for stage in range(2, NUM_CALLS + 2):
+            host = SwarcoSSH('127.0.0.1')
+            host.session_pool = pool
+            host.pipeline_commands = pipeline_commands
+            await host.set_stage(stage)
+            assert not host.response_errors
+        return (time.perf_counter() - start_time) / NUM_CALLS
+    finally:
+        pool.close()
+
+
+async def main():
+    # Алгоритмы и кодировка asyncssh по умолчанию вместо заданных в .env для ДК
+    ssh_core.kex_algs, ssh_core.enc_algs, ssh_core.proc_ssh_encoding = (), (), 'utf-8'
+    server = ItcTerminalServer(response_delay=RESPONSE_DELAY, rtt=RTT)
+    await server.start()
+    try:
+        read_until_prompt = ssh_core.read_until_prompt
+        ssh_core.read_until_prompt = read_timed_legacy
+        elapsed_old = await measure(server, pipeline_commands=False)
+        ssh_core.read_until_prompt = read_until_prompt
+        elapsed_prompt = await measure(server, pipeline_commands=False)
+        elapsed_pipeline = await measure(server, pipeline_commands=True)
+    finally:
+        server.close()
+    print(
+        f'set_stage: read_timed {elapsed_old * 1e3:8.1f} ms   '
+        f'read_until_prompt {elapsed_prompt * 1e3:8.1f} ms   x{elapsed_old / elapsed_prompt:.1f}   '
+        f'pipeline {elapsed_pipeline * 1e3:8.1f} ms   x{elapsed_old / elapsed_pipeline:.1f}'
+    )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
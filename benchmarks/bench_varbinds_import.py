@@ -0,0 +1,55 @@
+"""
+Бенчмарк: время импорта sdp_lib.management_controllers.api и пиковый объём памяти(RSS) процесса
+при ленивом создании varbinds Поток(P)(ScnVarbindsCache) и при создании varbinds
+для CO1..CO9999 заранее(create_varbinds_get_state_with_scn, как при импорте ранее).
+Каждый замер выполняется в отдельном процессе.
+
+Запуск: python -m benchmarks.bench_varbinds_import
+"""
+import subprocess
+import sys
+
+
+NUM_RUNS = 5
+
+measure_code = """
+import resource, time
+start_time = time.perf_counter()
+import sdp_lib.management_controllers.api
+{extra}
+elapsed = time.perf_counter() - start_time
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+modes = {
+    'lazy': '',
+    'lazy + warm_up(1000)': (
+        'from sdp_lib.management_controllers.snmp.snmp_utils import potok_ug405_varbinds\n'
+        'potok_ug405_varbinds.warm_up(f"CO{i}" for i in range(1, 1001))'
+    ),
+    'eager CO1..CO9999': (
+        'from sdp_lib.management_controllers.snmp import oids\n'
+        'from sdp_lib.management_controllers.snmp.snmp_utils import create_varbinds_get_state_with_scn\n'
+        'create_varbinds_get_state_with_scn(oids.oids_state_potok_p)'
+    ),
+}
+
+
+def measure(extra: str) -> tuple[float, int]:
+    output = subprocess.run(
+        [sys.executable, '-c', measure_code.format(extra=extra)],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[-2]), int(output[-1])
+
+
+def main():
+    for name, extra in modes.items():
+        results = [measure(extra) for _ in range(NUM_RUNS)]
+        elapsed = min(r[0] for r in results)
+        max_rss = min(r[1] for r in results)
+        print(f'{name:<24} import {elapsed * 1000:8.1f} ms   max rss {max_rss / 1024:8.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
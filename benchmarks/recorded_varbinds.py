@@ -0,0 +1,65 @@
+"""
+Записанные varbinds ответов get_states ДК, разрешённые так же, как это делает pysnmp
+для ответа get_cmd(ObjectType(ObjectIdentity(...)).resolve_with_mib).
+"""
+from pysnmp.proto.rfc1902 import (
+    Integer32,
+    ObjectName,
+    OctetString,
+    Unsigned32
+)
+from pysnmp.smi import (
+    builder,
+    view
+)
+from pysnmp.smi.rfc1902 import (
+    ObjectIdentity,
+    ObjectType
+)
+
+from sdp_lib.management_controllers.snmp.oids import Oids
+from sdp_lib.management_controllers.snmp.snmp_utils import convert_chars_string_to_ascii_string
+
+
+mib_view_controller = view.MibViewController(builder.MibBuilder())
+
+scn_as_chars = 'CO3995'
+scn_as_ascii_string = convert_chars_string_to_ascii_string(scn_as_chars)
+
+
+def build_varbinds(oids_and_values) -> tuple[ObjectType, ...]:
+    return tuple(
+        ObjectType(ObjectIdentity(ObjectName(str(oid))), val).resolve_with_mib(mib_view_controller)
+        for oid, val in oids_and_values
+    )
+
+
+swarco_states = build_varbinds((
+    (Oids.swarcoUTCTrafftechFixedTimeStatus, Integer32(0)),
+    (Oids.swarcoUTCTrafftechPlanSource, Integer32(7)),
+    (Oids.swarcoUTCStatusEquipment, Integer32(1)),
+    (Oids.swarcoUTCTrafftechPhaseStatus, Integer32(3)),
+    (Oids.swarcoUTCTrafftechPlanCurrent, Integer32(5)),
+    (Oids.swarcoUTCDetectorQty, Integer32(12)),
+    (Oids.swarcoSoftIOStatus, OctetString('0' * 179 + '10' + '0' * 75)),
+))
+
+potok_s_states = build_varbinds((
+    (Oids.swarcoUTCStatusEquipment, Integer32(1)),
+    (Oids.swarcoUTCTrafftechPhaseStatus, Integer32(4)),
+    (Oids.swarcoUTCTrafftechPlanCurrent, Integer32(2)),
+    (Oids.swarcoUTCStatusMode, Integer32(8)),
+    (Oids.swarcoUTCDetectorQty, Unsigned32(4)),
+))
+
+potok_p_states = build_varbinds((
+    (Oids.utcType2OperationMode, Integer32(1)),
+    (f'{Oids.potokP_utcReplyDarkStatus}{scn_as_ascii_string}', Integer32(0)),
+    (f'{Oids.utcReplyFR}{scn_as_ascii_string}', Integer32(0)),
+    (f'{Oids.utcReplyGn}{scn_as_ascii_string}', OctetString(hexValue='0400')),
+    (f'{Oids.potokP_utcReplyPlanStatus}{scn_as_ascii_string}', Integer32(3)),
+    (f'{Oids.potokP_utcReplyLocalAdaptiv}{scn_as_ascii_string}', Integer32(1)),
+    (Oids.utcType2ScootDetectorCount, Integer32(8)),
+    (f'{Oids.utcReplyDF}{scn_as_ascii_string}', Integer32(0)),
+    (f'{Oids.utcReplyMC}{scn_as_ascii_string}', Integer32(0)),
+))
@@ -9,7 +9,17 @@ from pathlib import Path
 from typing import Dict, Set, Tuple, List, Iterator, TextIO
 import logging
 
-from sdp_lib.utils_common import set_curr_datetime
+import numpy as np
+
+from sdp_lib.conflicts.conflicts_matrix import (
+    ConflictsMatrix,
+    get_bits
+)
+from sdp_lib.conflicts.results_cache import (
+    ConflictsResultsCache,
+    conflicts_results_cache
+)
+from sdp_lib.utils_common.utils_common import set_curr_datetime
 
 # from toolkit.sdp_lib.utils_common import set_curr_datetime
 
@@ -94,6 +104,9 @@ class Utils:
 
 class BaseConflictsAndStagesCalculations:
 
+    # Проверять конфликты каждой группы полным перебором(self._supervisor_conflicts)
+    check_with_supervisor = False
+
     def __init__(self, stages_groups_data: Dict):
 
         self.instance_data = {
@@ -114,6 +127,7 @@ class BaseConflictsAndStagesCalculations:
             DataFields.stages_bin_vals.value: None,
             DataFields.sum_conflicts.value: None
         }
+        self.conflicts_matrix: ConflictsMatrix | None = None
 
     def _get_all_data_curr_calculate(self):
         return json.dumps(self.instance_data, indent=4)
@@ -133,7 +147,7 @@ class BaseConflictsAndStagesCalculations:
         unsorted_num_groups = self.instance_data[DataFields.all_num_groups.value]
         try:
             for stage, groups in self.instance_data['raw_stages_data'].items():
-                unsorted_stages = {int(g) if g.isdigit() else float(g) for g in groups.split(separator) if g}
+                unsorted_stages = self._parse_groups(groups, separator)
                 processed_stages[stage] = unsorted_stages
                 unsorted_num_groups |= unsorted_stages
         except ValueError as err:
@@ -150,6 +164,16 @@ class BaseConflictsAndStagesCalculations:
             processed_stages, unsorted_all_num_groups, always_red_groups
         )
 
+    @staticmethod
+    def _parse_groups(groups: str, separator: str = ',') -> Set:
+        """
+        Формирует set из направлений фазы.
+        :param groups: Направления фазы через separator. Пример: '1,4,5.1'
+        :param separator: разделитель для формирования списка направлений
+        :return: set из направлений типа int или float(для направлений типа 5.1)
+        """
+        return {int(g) if g.isdigit() else float(g) for g in groups.split(separator) if g}
+
     def _check_data_for_calculate_is_valid(self, num_groups: int, num_stages: int):
         """
         Проверяет валидное количество направлений и фаз. Если передано недопустимое количество фаз
@@ -223,12 +247,17 @@ class BaseConflictsAndStagesCalculations:
 
     def calculate_conflicts_and_stages(self) -> None:
         """
-        Формирует словарь для всех групп с данными о группе: конфликтами и фазами, в которых участвует направеление
+        Формирует словарь для всех групп с данными о группе: конфликтами и фазами, в которых участвует направеление.
+        Конфликты рассчитываются по матрице совместимости направлений в битовых масках(self.conflicts_matrix).
         :return: None
         """
 
+        self.conflicts_matrix = ConflictsMatrix(
+            self.instance_data[DataFields.sorted_stages_data.value],
+            self.instance_data[DataFields.sorted_all_num_groups.value]
+        )
         groups_prop = self.instance_data[DataFields.groups_property.value]
-        for group in self.instance_data.get(DataFields.sorted_all_num_groups.value):
+        for group in self.conflicts_matrix.groups:
             groups_prop[group] = self._get_conflicts_and_stages_properties_for_group(group)
 
     def _get_conflicts_and_stages_properties_for_group(self, num_group: int):
@@ -243,25 +272,95 @@ class BaseConflictsAndStagesCalculations:
                 Пример data: {'stages': {'1', '2'}, 'enemy_groups': {'4', '5', '6'}}
         """
 
-        group_in_stages = set()
-        conflict_groups = {g for g in self.instance_data[DataFields.all_num_groups.value] if g != num_group}
-        for stage, groups_in_stage in self.instance_data[DataFields.sorted_stages_data.value].items():
-            if num_group in groups_in_stage:
-                group_in_stages.add(stage)
-                for g in groups_in_stage:
-                    conflict_groups.discard(g)
-        assert conflict_groups == self._supervisor_conflicts(num_group)
-        is_always_red: bool = False if group_in_stages else True
-        is_always_green: bool = group_in_stages == set(self.instance_data[DataFields.sorted_stages_data.value].keys())
+        matrix = self.conflicts_matrix
+        conflict_groups = matrix.get_enemy_groups(num_group)
+        if self.check_with_supervisor:
+            assert conflict_groups == self._supervisor_conflicts(num_group)
+        is_always_red = matrix.is_always_red(num_group)
+        is_always_green = matrix.is_always_green(num_group)
         assert not ((is_always_red is True) and (is_always_green is True))
         data = {
-            DataFields.stages.value: group_in_stages,
+            DataFields.stages.value: matrix.get_group_stages(num_group),
             DataFields.enemy_groups.value: conflict_groups,
             DataFields.always_red.value: is_always_red,
             DataFields.always_green.value: is_always_green
         }
         return data
 
+    def _get_calculation_steps(self) -> tuple:
+        return self.processing_data_for_calculation, self.calculate_conflicts_and_stages
+
+    def _calculate(self) -> None:
+        """
+        Выполняет шаги расчёта(self._get_calculation_steps) до первой ошибки.
+        :return: None
+        """
+        for func in self._get_calculation_steps():
+            if self.instance_data[DataFields.errors.value]:
+                break
+            func()
+
+    def _recalculate(self) -> None:
+        """
+        Выполняет все шаги расчёта заново по self.instance_data['raw_stages_data'].
+        :return: None
+        """
+        raw_stages_data = self.instance_data['raw_stages_data']
+        type_controller = self.instance_data[DataFields.type_controller.value]
+        BaseConflictsAndStagesCalculations.__init__(self, raw_stages_data)
+        self.instance_data[DataFields.type_controller.value] = type_controller
+        self._calculate()
+
+    def _allow_update_stage(self, stage: str, groups: Set) -> bool:
+        """
+        Проверяет, можно ли изменить направления фазы без полного расчёта: расчёт выполнен без ошибок,
+        фаза и направления уже есть в матрице, и каждое направление остаётся хотя бы в одной фазе
+        или остаётся "постоянно красным", то есть состав направлений и фаз не изменится.
+        :param stage: Фаза.
+        :param groups: Новые направления фазы.
+        :return: True, если данные можно обновить только для изменённых направлений, иначе False.
+        """
+        matrix = self.conflicts_matrix
+        if matrix is None or self.instance_data[DataFields.errors.value] or stage not in matrix.stages:
+            return False
+        if not all(group in matrix for group in groups):
+            return False
+        stage_row = matrix.stages.index(stage)
+        removed_mask = matrix.stages_masks[stage_row] & ~matrix.get_groups_mask(groups)
+        return all(matrix.groups_stages_masks[row] != 1 << stage_row for row in get_bits(removed_mask))
+
+    def update_stage(self, stage: str, groups: str, separator: str = ',') -> Set:
+        """
+        Заменяет направления фазы и пересчитывает конфликты и свойства только направлений,
+        входивших в фазу до или после изменения. Если изменение меняет состав направлений или фаз
+        (новая фаза, новое направление, направление больше не участвует ни в одной фазе) или
+        расчёт ещё не выполнен, выполняет все шаги расчёта заново.
+        :param stage: Фаза.
+        :param groups: Направления фазы через separator, как в исходных данных. Пример: '1,4,5'
+        :param separator: разделитель для формирования списка направлений
+        :return: set из направлений, данные которых пересчитаны.
+        """
+        self.instance_data['raw_stages_data'] = {**self.instance_data['raw_stages_data'], stage: groups}
+        try:
+            processed_groups = self._parse_groups(groups, separator)
+        except ValueError:
+            processed_groups = None
+        if processed_groups is None or not self._allow_update_stage(stage, processed_groups):
+            self._recalculate()
+            return set(self.instance_data[DataFields.groups_property.value])
+
+        matrix = self.conflicts_matrix
+        affected_mask, _ = matrix.update_stage(stage, processed_groups)
+        self.instance_data[DataFields.sorted_stages_data.value][stage] = processed_groups
+        self.instance_data[DataFields.always_red_groups.value] = (
+            set(self.instance_data[DataFields.always_red_groups.value]) - processed_groups
+        )
+        groups_prop = self.instance_data[DataFields.groups_property.value]
+        affected_groups = matrix.get_groups(affected_mask)
+        for group in affected_groups:
+            groups_prop[group] = self._get_conflicts_and_stages_properties_for_group(group)
+        return affected_groups
+
     def _supervisor_conflicts(self, num_group: int) -> Set:
         """
         Метод формирует set из групп, с которыми есть конфликт у группы num_group. Является проверкой
@@ -296,56 +395,56 @@ class OutputDataCalculations(BaseConflictsAndStagesCalculations):
     def _unpack_matrix(self, matrix: List[List]) -> str:
         return '\n'.join((''.join(m) for m in matrix)) + '\n'
 
-    def _create_row_output_matrix(
-            self, all_numbers_groups: List, current_group: int = None, enemy_groups: Set = None, first_row=False
-    ) -> List[str]:
+    def _get_group_label(self, group) -> str:
+        return f'|0{group}|' if len(str(group)) == 1 else f'|{group}|'
+
+    def _create_output_matrix(self, conflicts: np.ndarray) -> List[List[str]]:
         """
-        Формирует строку для матрицы в виде списка.
-        :param all_numbers_groups: Номер всех групп в запросе.
-        :param current_group: Номер группы, для которой будет сформирован список.
-        :param enemy_groups: Коллекция set из конфликтных групп для current_group.
-        :param first_row: Является ли строка первой строкой матрицы("шапка")
-        :return: Список-строка для матрицы конфликтов группы current_group, если first_row == False,
-                 иначе список-шапка матрицы
+        Формирует общую матрицу конфликтов: первая строка - "шапка", далее строки групп.
+        :param conflicts: Матрица конфликтов групп(ConflictsMatrix.as_array).
+        :return: Матрица в виде двумерного списка строк '| K|', '| O|', '| *|'.
         """
 
-        if not first_row:
-            row = [f'|0{current_group}|' if len(str(current_group)) == 1 else f'|{current_group}|']
-            row += [
-                DataFields.no_conflict_O.value if gr not in enemy_groups else DataFields.conflict_K.value
-                for gr in all_numbers_groups
-            ]
-            row[len(self.instance_data[DataFields.output_matrix.value])] = DataFields.cross_group_star_matrix.value
-        else:
-            row = [DataFields.cross_group_star_matrix.value]
-            row += [f'|0{g}|' if len(str(g)) == 1 else f'|{g}|' for g in all_numbers_groups]
-        print(f'row: {row}')
-        return row
+        labels = [self._get_group_label(g) for g in self.conflicts_matrix.groups]
+        cells = np.where(conflicts, DataFields.conflict_K.value, DataFields.no_conflict_O.value)
+        np.fill_diagonal(cells, DataFields.cross_group_star_matrix.value)
+        matrix = [[DataFields.cross_group_star_matrix.value, *labels]]
+        matrix += [[label, *row] for label, row in zip(labels, cells.tolist())]
+        return matrix
 
-    def _create_row_f997(self, num_groups, current_group: int, enemy_groups: Set[int]) -> List[str]:
+    def _create_matrix_f997(self, conflicts: np.ndarray, num_groups: int) -> List[List[str]]:
         """
-        Формирует строку матрицы для F997 конфигурации Swarco.
+        Формирует матрицу для F997 конфигурации Swarco. Столбец i соответствует группе с номером i + 1.
+        :param conflicts: Матрица конфликтов групп(ConflictsMatrix.as_array).
         :param num_groups: Количетсво групп в запросе.
-        :param current_group: Номер группы, для которой будет сформирован список.
-        :param enemy_groups: Коллекция set из конфликтных групп для current_group.
-        :return: Список-строка для матрицы конфликтов группы current_group
+        :return: Матрица в виде двумерного списка строк '03.0;', '  . ;', 'X;'.
         """
 
-        row = [
-            DataFields.cross_group997.value if i + 1 == current_group else
-            DataFields.conflictF997.value if i + 1 in enemy_groups else DataFields.no_conflictF997.value
-            for i in range(num_groups)
-        ]
-        return row
+        groups = np.array(self.conflicts_matrix.groups)
+        numbers = np.arange(1, num_groups + 1)
+        # Строки матрицы конфликтов для групп с номерами столбцов F997
+        columns = np.searchsorted(groups, numbers)
+        exists = columns < len(groups)
+        exists[exists] = groups[columns[exists]] == numbers[exists]
+        conflicts_f997 = np.zeros((len(groups), num_groups), dtype=bool)
+        conflicts_f997[:, exists] = conflicts[:, columns[exists]]
+        cells = np.where(conflicts_f997, DataFields.conflictF997.value, DataFields.no_conflictF997.value)
+        cells[groups[:, None] == numbers] = DataFields.cross_group997.value
+        return cells.tolist()
 
-    def _get_bin_val_stages(self, stages: Set[int]) -> int:
+    def _get_bin_vals_stages(self) -> List[int]:
         """
-        Формирует бинарное значение всех фаз из коллекции.
-        :param stages: set с фазами, бинарное значение которых необходимо вычислить.
-        :return: Бинарное значение, представленное в виде целого натурального числа.
+        Формирует бинарные значения фаз групп: сумма 2 ** фаза(для фазы 8 - 2 ** 0) всех фаз группы.
+        :return: Список бинарных значений в порядке групп.
         """
 
-        return sum(map(lambda x: 2 ** x if x != 8 else 2 ** 0, (int(s) for s in stages)))
+        weights = self._get_stages_weights()
+        # Значения фаз больше 62 не помещаются в int64
+        weights = np.array(weights, dtype=np.int64 if max(weights, default=0) < 2 ** 62 else object)
+        return (self.conflicts_matrix.stages_as_array() @ weights).tolist()
+
+    def _get_stages_weights(self) -> List[int]:
+        return [2 ** int(s) if int(s) != 8 else 2 ** 0 for s in self.conflicts_matrix.stages]
 
     def _get_bin_vals_stages_for_swarco_f009(self, bin_vals: list[int] = None) -> str | None:
         """
@@ -367,32 +466,90 @@ class OutputDataCalculations(BaseConflictsAndStagesCalculations):
 
         num_groups = self.instance_data[DataFields.number_of_groups.value]
         groups_property = self.instance_data[DataFields.groups_property.value]
-        all_numbers_groups = sorted(self.instance_data[DataFields.all_num_groups.value])
-        create_bin_vals_stages = self.instance_data[DataFields.allow_make_config.value]
-
-        self.instance_data[DataFields.output_matrix.value] = [
-            self._create_row_output_matrix(all_numbers_groups, first_row=True)
-        ]
-        f997, numbers_conflicts_groups, stages_bin_vals = [], [], []
-        sum_conflicts = 0
-
-        for num_group, property_group in groups_property.items():
-            enemy_groups = property_group[DataFields.enemy_groups.value]
-            self.instance_data[DataFields.output_matrix.value].append(
-                self._create_row_output_matrix(all_numbers_groups, num_group, enemy_groups)
-            )
-            if self.instance_data[DataFields.allow_make_config.value]:
-                f997.append(self._create_row_f997(num_groups, num_group, enemy_groups))
-                numbers_conflicts_groups.append(f"{';'.join(map(str, sorted(enemy_groups)))};")
-            sum_conflicts += len(enemy_groups)
-            if create_bin_vals_stages:
-                stages_bin_vals.append(self._get_bin_val_stages(stages=property_group[DataFields.stages.value]))
-
-        self.instance_data[DataFields.matrix_F997.value] = f997
-        self.instance_data[DataFields.numbers_conflicts_groups.value] = numbers_conflicts_groups
-        self.instance_data[DataFields.stages_bin_vals.value] = stages_bin_vals
+        allow_make_config = self.instance_data[DataFields.allow_make_config.value]
+        conflicts = self.conflicts_matrix.as_array()
+
+        self.instance_data[DataFields.output_matrix.value] = self._create_output_matrix(conflicts)
+        if allow_make_config:
+            self.instance_data[DataFields.matrix_F997.value] = self._create_matrix_f997(conflicts, num_groups)
+            self.instance_data[DataFields.numbers_conflicts_groups.value] = [
+                f"{';'.join(map(str, sorted(property_group[DataFields.enemy_groups.value])))};"
+                for property_group in groups_property.values()
+            ]
+            self.instance_data[DataFields.stages_bin_vals.value] = self._get_bin_vals_stages()
+        else:
+            self.instance_data[DataFields.matrix_F997.value] = []
+            self.instance_data[DataFields.numbers_conflicts_groups.value] = []
+            self.instance_data[DataFields.stages_bin_vals.value] = []
         self.instance_data[DataFields.stages_bin_vals_f009.value] = self._get_bin_vals_stages_for_swarco_f009()
-        self.instance_data[DataFields.sum_conflicts.value] = sum_conflicts
+        self.instance_data[DataFields.sum_conflicts.value] = int(conflicts.sum())
+
+    def _get_calculation_steps(self) -> tuple:
+        return *super()._get_calculation_steps(), self.create_data_for_output
+
+    def update_stage(self, stage: str, groups: str, separator: str = ',') -> Set:
+        """
+        Заменяет направления фазы и пересчитывает конфликты, свойства направлений и выходные данные
+        (строки и столбцы матриц, F994, бинарные значения фаз) только направлений, входивших
+        в фазу до или после изменения. Подробнее: BaseConflictsAndStagesCalculations.update_stage.
+        :param stage: Фаза.
+        :param groups: Направления фазы через separator, как в исходных данных. Пример: '1,4,5'
+        :param separator: разделитель для формирования списка направлений
+        :return: set из направлений, данные которых пересчитаны.
+        """
+        matrix = self.conflicts_matrix
+        output_created = self.instance_data[DataFields.output_matrix.value] is not None
+        affected_groups = super().update_stage(stage, groups, separator)
+        # Если расчёт выполнен заново, выходные данные уже сформированы полностью
+        if self.conflicts_matrix is matrix and output_created:
+            self._update_data_for_output([matrix.get_row(group) for group in affected_groups])
+        return affected_groups
+
+    def _update_data_for_output(self, rows: List[int]) -> None:
+        """
+        Обновляет строки и столбцы выходных данных направлений строк rows матрицы конфликтов.
+        :param rows: Номера строк направлений в self.conflicts_matrix.
+        :return: None
+        """
+
+        matrix = self.conflicts_matrix
+        num_rows = len(matrix)
+        output_matrix = self.instance_data[DataFields.output_matrix.value]
+        conflict, no_conflict = DataFields.conflict_K.value, DataFields.no_conflict_O.value
+        for row in rows:
+            enemy_mask = matrix.get_enemy_mask(row)
+            for other_row in range(num_rows):
+                cell = conflict if enemy_mask >> other_row & 1 else no_conflict
+                output_matrix[row + 1][other_row + 1] = output_matrix[other_row + 1][row + 1] = cell
+            output_matrix[row + 1][row + 1] = DataFields.cross_group_star_matrix.value
+
+        if self.instance_data[DataFields.allow_make_config.value]:
+            f997 = self.instance_data[DataFields.matrix_F997.value]
+            numbers_conflicts_groups = self.instance_data[DataFields.numbers_conflicts_groups.value]
+            stages_bin_vals = self.instance_data[DataFields.stages_bin_vals.value]
+            num_groups = self.instance_data[DataFields.number_of_groups.value]
+            conflict, no_conflict = DataFields.conflictF997.value, DataFields.no_conflictF997.value
+            # Строки матрицы направлений с номерами 1..num_groups(столбцы F997)
+            numbers_rows = [(number, matrix.get_row(number)) for number in range(1, num_groups + 1)]
+            weights = self._get_stages_weights()
+            for row in rows:
+                group, enemy_mask = matrix.groups[row], matrix.get_enemy_mask(row)
+                f997[row] = [
+                    conflict if other_row is not None and enemy_mask >> other_row & 1 else no_conflict
+                    for number, other_row in numbers_rows
+                ]
+                # Столбец F997 направления с номером group
+                if 1 <= group <= num_groups:
+                    f997[row][group - 1] = DataFields.cross_group997.value
+                    for other_row in range(num_rows):
+                        if other_row != row:
+                            f997[other_row][group - 1] = conflict if enemy_mask >> other_row & 1 else no_conflict
+                numbers_conflicts_groups[row] = f"{';'.join(map(str, sorted(matrix.get_groups(enemy_mask))))};"
+                stages_bin_vals[row] = sum(weights[s] for s in get_bits(matrix.groups_stages_masks[row]))
+            self.instance_data[DataFields.stages_bin_vals_f009.value] = self._get_bin_vals_stages_for_swarco_f009()
+        self.instance_data[DataFields.sum_conflicts.value] = sum(
+            matrix.get_enemy_mask(row).bit_count() for row in range(num_rows)
+        )
 
     # def create_data_for_output(self):
     #
@@ -429,6 +586,9 @@ class CommonConflictsAndStagesAPI(OutputDataCalculations):
     """
     controller_type = 'Общий'
 
+    # Кэш результатов расчёта. Если None, расчёт выполняется всегда
+    results_cache: ConflictsResultsCache | None = conflicts_results_cache
+
     def __init__(self, stages_groups_data: Dict, create_txt: bool = False, path_to_save_txt: str = None):
         super().__init__(stages_groups_data)
         self.instance_data[DataFields.type_controller.value] = self.get_controller_type()
@@ -500,6 +660,51 @@ class CommonConflictsAndStagesAPI(OutputDataCalculations):
             DataFields.created.value: True if err is None else False
         }
 
+    def _calculate(self) -> None:
+        """
+        Выполняет шаги расчёта. Если задан self.results_cache, после обработки исходных данных
+        результат расчёта тех же фаз и направлений берётся из кэша, иначе рассчитывается и
+        сохраняется в кэш. Исходные данные(raw_stages_data, sorted_stages_data) остаются данными
+        текущего расчёта.
+        :return: None
+        """
+        cache = self.results_cache
+        if cache is None:
+            super()._calculate()
+            return
+
+        self.processing_data_for_calculation()
+        if self.instance_data[DataFields.errors.value]:
+            return
+        key = cache.make_key(self.get_controller_type(), self.instance_data[DataFields.sorted_stages_data.value])
+        cached = cache.get(key)
+        if cached is not None:
+            instance_data, self.conflicts_matrix = cached
+            del instance_data['raw_stages_data'], instance_data[DataFields.sorted_stages_data.value]
+            self.instance_data.update(instance_data)
+            return
+        for func in self._get_calculation_steps():
+            if self.instance_data[DataFields.errors.value]:
+                break
+            if func != self.processing_data_for_calculation:
+                func()
+        if not self.instance_data[DataFields.errors.value]:
+            cache.put(key, self.instance_data, self.conflicts_matrix)
+
+    def update_stage(self, stage: str, groups: str, separator: str = ',') -> Set:
+        """
+        Заменяет направления фазы и пересчитывает данные только изменённых направлений
+        (OutputDataCalculations.update_stage). Множества в self.instance_data заменяются
+        на списки, как после build_data.
+        :param stage: Фаза.
+        :param groups: Направления фазы через separator, как в исходных данных. Пример: '1,4,5'
+        :param separator: разделитель для формирования списка направлений
+        :return: set из направлений, данные которых пересчитаны.
+        """
+        affected_groups = super().update_stage(stage, groups, separator)
+        Utils.set_to_list(self.instance_data)
+        return affected_groups
+
     def build_data(self, create_json=False):
         """
         Основной метод для получения данных по расчетам конфликтов, привзяки фаз и прочих значений.
@@ -507,13 +712,7 @@ class CommonConflictsAndStagesAPI(OutputDataCalculations):
         :return:
         """
 
-        functions: tuple = (
-            self.processing_data_for_calculation, self.calculate_conflicts_and_stages, self.create_data_for_output
-        )
-        for func in functions:
-            if self.instance_data[DataFields.errors.value]:
-                break
-            func()
+        self._calculate()
         if create_json:
             Utils.save_json_to_file(self.instance_data)
         else:
@@ -582,35 +781,79 @@ class SwarcoConflictsAndStagesAPI(CreateConfigurationFileBase):
 
     controller_type = 'Swarco'
 
-    def write_data_to_file(
-            self,
-            file_for_write: TextIO,
-            file_for_read: Iterator,
-            curr_line_from_file_for_write: str,
-            matrix=None,
-            stages_bin_vals=None
-    ):
+    sheet_prefix = 'NewSheet693'
+    conflicts_f997 = f'{sheet_prefix}  : Work.997'
+    conflicts_f992 = f'{sheet_prefix}  : Work.992'
+    conflicts_f006 = f'{sheet_prefix}  : Work.006'
+    stage_bin_vals_f009 = f'{sheet_prefix}  : Work.009'
+
+    def iter_matrix_lines(self) -> Iterator[str]:
         """
-        Записывает данные в файл конфигурации .PTC2
-        :param file_for_write: Файл, в который будут записаны данные
-        :param file_for_read: Файл, из которого читаются данные
-        :param curr_line_from_file_for_write: текущая прочитанная строка из file_for_read
-        :param matrix: матрица в виде двумерного списка. Если не None, будет записана в файл для F994, F997, F006
-        :param stages_bin_vals: список с бинарныт значениями  принадлжености направлений в фазам дл F009
-        :return:
+        Генерирует строки матрицы конфликтов F997 для записи в .PTC2.
+        :return: Итератор по строкам матрицы.
         """
+        for matrix_line in self.instance_data[DataFields.matrix_F997.value]:
+            yield f'{"".join(matrix_line)}\n'
 
-        file_for_write.write(f'{curr_line_from_file_for_write}')
-        if matrix is not None:
-            for matrix_line in matrix:
-                file_for_write.write(f'{"".join(matrix_line)}\n')
-        elif stages_bin_vals is not None:
-            for val in stages_bin_vals:
-                zeros = f'{"0" * 1 * (3 - len(str(val)))}'
-                file_for_write.write(f';{zeros}{val};;1;\n')
-        while 'NeXt' not in curr_line_from_file_for_write:
-            curr_line_from_file_for_write = next(file_for_read)
-        file_for_write.write(curr_line_from_file_for_write)
+    def iter_stages_bin_vals_lines(self) -> Iterator[str]:
+        """
+        Генерирует строки привязки направлений к фазам F009 для записи в .PTC2.
+        :return: Итератор по строкам вида ';006;;1;'
+        """
+        for val in self.instance_data[DataFields.stages_bin_vals.value]:
+            yield f';{val:03};;1;\n'
+
+    def get_section_lines(self, line: str) -> Iterator[str] | None:
+        """
+        Возвращает генератор строк функции, данные которой формируются по расчётам.
+        :param line: Строка исходного файла .PTC2
+        :return: Итератор по строкам функции, если line - заголовок функции F997, F992, F006 или F009,
+                 иначе None. Для F006 строки функции не записываются.
+        """
+        if self.conflicts_f997 in line or self.conflicts_f992 in line:
+            return self.iter_matrix_lines()
+        elif self.conflicts_f006 in line:
+            return iter(())
+        elif self.stage_bin_vals_f009 in line:
+            return self.iter_stages_bin_vals_lines()
+        return None
+
+    def iter_config_chunks(self, src: TextIO, block_size: int = 1 << 16) -> Iterator[str]:
+        """
+        Генерирует данные нового файла .PTC2. Данные исходного файла передаются без изменений блоками,
+        кроме строк функций F994, F997, F006, F009: после заголовка функции передаются строки,
+        сформированные по расчётам, строки исходного файла пропускаются до строки 'NeXt'.
+        :param src: Исходный файл .PTC2
+        :param block_size: Размер блока, читаемого из src. Блок дополняется до конца строки.
+        :return: Итератор по частям нового файла .PTC2
+        """
+        skipping = False
+        while block := src.read(block_size):
+            block += src.readline()
+            pos = 0
+            while pos < len(block):
+                # Заголовки всех заменяемых функций начинаются с self.sheet_prefix
+                idx = block.find('NeXt' if skipping else self.sheet_prefix, pos)
+                if idx == -1:
+                    if not skipping:
+                        yield block[pos:]
+                    break
+                line_start = block.rfind('\n', pos, idx) + 1 or pos
+                line_end = block.find('\n', idx) + 1 or len(block)
+                if skipping:
+                    yield block[line_start:line_end]
+                    skipping = False
+                else:
+                    line = block[line_start:line_end]
+                    section_lines = self.get_section_lines(line)
+                    yield block[pos:line_end]
+                    if section_lines is not None:
+                        yield from section_lines
+                        if 'NeXt' in line:
+                            yield line
+                        else:
+                            skipping = True
+                pos = line_end
 
     def create_config(self):
         """
@@ -618,41 +861,15 @@ class SwarcoConflictsAndStagesAPI(CreateConfigurationFileBase):
         Алгоритм:
                  исходный файл конфига .PTC2 читается построчно. Каждая прочитанная строчка записывается в
                  новый файл, кроме строк, принадлежащих функциям F994, F997, F006, F009. Строки для
-                 этих функций будут взяты из self.instance_data
+                 этих функций формируются построчно из self.instance_data(self.iter_config_chunks)
         :return:
         """
 
         p = pathlib.Path(self.path_to_src_config)
         path_to_new_PTC2 = p.parent / f'{self.prefix_new_config}{p.name}'
-        conflicts_f997 = 'NewSheet693  : Work.997'
-        conflicts_f992 = 'NewSheet693  : Work.992'
-        conflicts_f006 = 'NewSheet693  : Work.006'
-        stage_bin_vals_f009 = 'NewSheet693  : Work.009'
 
         with open(self.path_to_src_config) as src, open(path_to_new_PTC2, 'w') as new_file:
-            for line in src:
-                if conflicts_f997 in line or conflicts_f992 in line:
-                    self.write_data_to_file(
-                        file_for_write=new_file,
-                        file_for_read=src,
-                        curr_line_from_file_for_write=line,
-                        matrix=self.instance_data[DataFields.matrix_F997.value]
-                    )
-                elif conflicts_f006 in line:
-                    self.write_data_to_file(
-                        file_for_write=new_file,
-                        file_for_read=src,
-                        curr_line_from_file_for_write=line
-                    )
-                elif stage_bin_vals_f009 in line:
-                    self.write_data_to_file(
-                        file_for_write=new_file,
-                        file_for_read=src,
-                        curr_line_from_file_for_write=line,
-                        stages_bin_vals=self.instance_data[DataFields.stages_bin_vals.value]
-                    )
-                else:
-                    new_file.write(line)
+            new_file.writelines(self.iter_config_chunks(src))
 
         self.push_result_to_instance_data(path_to_new_PTC2)
 
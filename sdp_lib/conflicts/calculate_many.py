@@ -0,0 +1,88 @@
+import os
+from collections.abc import (
+    Iterable,
+    Sequence
+)
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    NamedTuple
+)
+
+from sdp_lib.conflicts.calculate_conflicts import CommonConflictsAndStagesAPI
+
+
+class CalculationResult(NamedTuple):
+    data: dict[str, Any] | None
+    error: str | None
+
+
+def calculate_one(
+        stages_groups_data: dict[str, str],
+        api_class: type[CommonConflictsAndStagesAPI] = CommonConflictsAndStagesAPI
+) -> CalculationResult:
+    """
+    Выполняет расчёт конфликтов одного объекта.
+    :param stages_groups_data: Словарь вида {фаза: направления фазы через запятую}.
+    :param api_class: Класс API, выполняющий расчёт(build_data).
+    :return: CalculationResult с instance_data или текстом исключения, возникшего при расчёте.
+             Ошибки входных данных(количество групп, номера направлений) содержатся
+             в data[DataFields.errors.value], как при расчёте одного объекта.
+    """
+    try:
+        calc = api_class(stages_groups_data)
+        calc.build_data()
+        return CalculationResult(calc.instance_data, None)
+    except Exception as exc:
+        return CalculationResult(None, f'{type(exc).__name__}: {exc}')
+
+
+def _calculate_shard(
+        shard: Sequence[dict[str, str]],
+        api_class: type[CommonConflictsAndStagesAPI]
+) -> list[CalculationResult]:
+    return [calculate_one(stages_groups_data, api_class) for stages_groups_data in shard]
+
+
+def calculate_many(
+        configs: Iterable[dict[str, str]],
+        workers: int = None,
+        *,
+        shard_size: int = None,
+        api_class: type[CommonConflictsAndStagesAPI] = CommonConflictsAndStagesAPI
+) -> list[CalculationResult]:
+    """
+    Выполняет расчёт конфликтов множества объектов в workers процессах. Объекты делятся
+    на части по shard_size, каждая часть рассчитывается в одном процессе.
+    Ошибка расчёта объекта не прерывает расчёт остальных объектов.
+    Пример:
+        results = calculate_many([{'1': '1,2,3', '2': '4,5'}, {'1': '1,4', '2': '2,3'}], workers=4)
+        results[0].data[DataFields.groups_property.value]
+    :param configs: Объекты расчёта вида {фаза: направления фазы через запятую}.
+    :param workers: Количество процессов. Если не передано - os.cpu_count(). Если 1,
+                    расчёт выполняется в текущем процессе.
+    :param shard_size: Количество объектов, передаваемых процессу за один раз. Если не передано,
+                       объекты делятся так, чтобы на каждый процесс пришлось около 4 частей.
+    :param api_class: Класс API, выполняющий расчёт(build_data). Должен быть доступен
+                      для импорта в дочерних процессах.
+    :return: Список CalculationResult в порядке configs.
+    """
+    configs = list(configs)
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f'Значение workers должно быть больше 0, передано: {workers}')
+    if workers == 1 or len(configs) < 2:
+        return _calculate_shard(configs, api_class)
+
+    shard_size = shard_size or max(len(configs) // (workers * 4), 1)
+    shards = [configs[i: i + shard_size] for i in range(0, len(configs), shard_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        futures = [executor.submit(_calculate_shard, shard, api_class) for shard in shards]
+        results = []
+        for shard, future in zip(shards, futures):
+            try:
+                results += future.result()
+            except Exception as exc:
+                # Например, BrokenProcessPool при аварийном завершении процесса
+                results += [CalculationResult(None, f'{type(exc).__name__}: {exc}')] * len(shard)
+    return results
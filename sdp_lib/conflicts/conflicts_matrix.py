@@ -0,0 +1,165 @@
+from collections.abc import Iterable
+
+import numpy as np
+
+
+def get_bits(mask: int) -> list[int]:
+    """
+    Возвращает номера установленных битов маски в порядке возрастания.
+    :param mask: Битовая маска.
+    :return: Список номеров установленных битов.
+    """
+    return [i for i, bit in enumerate(bin(mask)[:1:-1]) if bit == '1']
+
+
+def masks_to_array(masks: Iterable[int], width: int) -> np.ndarray:
+    """
+    Преобразует битовые маски в двумерный массив bool: строка i - маска i, столбец j - бит j.
+    :param masks: Битовые маски.
+    :param width: Количество битов(столбцов).
+    :return: Массив bool размером len(masks) × width.
+    """
+    masks = list(masks)
+    num_bytes = max((width + 7) // 8, 1)
+    data = np.frombuffer(b''.join(mask.to_bytes(num_bytes, 'little') for mask in masks), dtype=np.uint8)
+    bits = np.unpackbits(data.reshape(len(masks), num_bytes), axis=1, bitorder='little')
+    return bits[:, :width].astype(bool)
+
+
+class ConflictsMatrix:
+    """
+    Матрица совместимости направлений в виде битовых масок.
+    Бит i маски направлений соответствует направлению groups[i], бит j маски фаз - фазе stages[j].
+    Каждая фаза кодируется маской своих направлений. Маска совместимости направления -
+    объединение(OR) масок всех фаз, в которых оно участвует. Направления, не входящие в маску
+    совместимости, конфликтны с направлением.
+    Пример:
+        matrix = ConflictsMatrix({'1': {1, 2}, '2': {2, 3}}, [1, 2, 3])
+        matrix.get_enemy_groups(1) -> {3}
+    """
+
+    __slots__ = ('groups', 'stages', 'stages_masks', 'compatible_masks', 'groups_stages_masks', 'all_groups_mask',
+                 'all_stages_mask', '_rows')
+
+    def __init__(self, stages_data: dict[str, Iterable], groups: Iterable):
+        """
+        :param stages_data: Словарь вида {фаза: направления фазы}.
+        :param groups: Все направления в порядке строк матрицы, включая не участвующие ни в одной фазе.
+        """
+        self.groups = list(groups)
+        self.stages = list(stages_data)
+        self._rows = {group: row for row, group in enumerate(self.groups)}
+        self.all_groups_mask = (1 << len(self.groups)) - 1
+        self.all_stages_mask = (1 << len(self.stages)) - 1
+        self.stages_masks = []
+        self.compatible_masks = [0] * len(self.groups)
+        self.groups_stages_masks = [0] * len(self.groups)
+        for stage_row, groups_in_stage in enumerate(stages_data.values()):
+            stage_bit = 1 << stage_row
+            rows = [self._rows[group] for group in groups_in_stage]
+            stage_mask = 0
+            for row in rows:
+                stage_mask |= 1 << row
+            self.stages_masks.append(stage_mask)
+            for row in rows:
+                self.compatible_masks[row] |= stage_mask
+                self.groups_stages_masks[row] |= stage_bit
+
+    def __len__(self):
+        return len(self.groups)
+
+    def __contains__(self, group):
+        return group in self._rows
+
+    def get_row(self, group) -> int | None:
+        return self._rows.get(group)
+
+    def get_groups_mask(self, groups: Iterable) -> int:
+        """
+        Возвращает маску направлений.
+        :param groups: Направления, присутствующие в матрице.
+        :return: Битовая маска направлений.
+        """
+        mask = 0
+        for group in groups:
+            mask |= 1 << self._rows[group]
+        return mask
+
+    def get_groups(self, mask: int) -> set:
+        groups = self.groups
+        return {groups[row] for row in get_bits(mask)}
+
+    def get_stages(self, mask: int) -> set[str]:
+        stages = self.stages
+        return {stages[row] for row in get_bits(mask)}
+
+    def get_enemy_mask(self, row: int) -> int:
+        """
+        Возвращает маску направлений, конфликтных с направлением строки row.
+        :param row: Номер строки направления.
+        :return: Битовая маска конфликтных направлений.
+        """
+        return self.all_groups_mask & ~self.compatible_masks[row] & ~(1 << row)
+
+    def get_enemy_groups(self, group) -> set:
+        return self.get_groups(self.get_enemy_mask(self._rows[group]))
+
+    def get_group_stages(self, group) -> set[str]:
+        return self.get_stages(self.groups_stages_masks[self._rows[group]])
+
+    def is_always_red(self, group) -> bool:
+        """
+        True, если направление не участвует ни в одной фазе.
+        """
+        return not self.groups_stages_masks[self._rows[group]]
+
+    def is_always_green(self, group) -> bool:
+        """
+        True, если направление участвует во всех фазах.
+        """
+        return self.groups_stages_masks[self._rows[group]] == self.all_stages_mask
+
+    def is_conflict(self, group1, group2) -> bool:
+        row1, row2 = self._rows[group1], self._rows[group2]
+        return row1 != row2 and not self.compatible_masks[row1] >> row2 & 1
+
+    def update_stage(self, stage: str, groups: Iterable) -> tuple[int, int]:
+        """
+        Заменяет направления фазы и пересчитывает маски совместимости только направлений,
+        входивших в фазу до или после изменения: совместимость остальных направлений не меняется.
+        :param stage: Фаза, присутствующая в матрице.
+        :param groups: Новые направления фазы, присутствующие в матрице.
+        :return: Кортеж из маски направлений, маски совместимости которых пересчитаны, и маски
+                 направлений, добавленных в фазу или удалённых из неё.
+        """
+        stage_row = self.stages.index(stage)
+        stage_bit = 1 << stage_row
+        old_mask, new_mask = self.stages_masks[stage_row], self.get_groups_mask(groups)
+        self.stages_masks[stage_row] = new_mask
+        changed_mask = old_mask ^ new_mask
+        for row in get_bits(changed_mask):
+            self.groups_stages_masks[row] ^= stage_bit
+        affected_mask = old_mask | new_mask
+        stages_masks = self.stages_masks
+        for row in get_bits(affected_mask):
+            compatible_mask = 0
+            for other_stage_row in get_bits(self.groups_stages_masks[row]):
+                compatible_mask |= stages_masks[other_stage_row]
+            self.compatible_masks[row] = compatible_mask
+        return affected_mask, changed_mask
+
+    def as_array(self) -> np.ndarray:
+        """
+        Возвращает матрицу конфликтов направлений.
+        :return: Массив bool размером groups × groups, True - направления конфликтны.
+        """
+        conflicts = ~masks_to_array(self.compatible_masks, len(self.groups))
+        np.fill_diagonal(conflicts, False)
+        return conflicts
+
+    def stages_as_array(self) -> np.ndarray:
+        """
+        Возвращает матрицу участия направлений в фазах.
+        :return: Массив bool размером groups × stages, True - направление участвует в фазе.
+        """
+        return masks_to_array(self.groups_stages_masks, len(self.stages))
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from sdp_lib.conflicts.conflicts_matrix import ConflictsMatrix
+
+
+T_CachedResult = tuple[dict[str, Any], ConflictsMatrix]
+
+
+class ConflictsResultsCache:
+    """
+    Кэш результатов расчёта конфликтов, ключ - хэш содержимого фаз и типа ДК(self.make_key).
+    Одинаковое распределение направлений по фазам у разных объектов рассчитывается один раз.
+    Результаты хранятся в памяти(LRU, не более max_size) в виде pickle, поэтому каждый
+    вызов self.get возвращает независимую копию. Если передан path, результаты также сохраняются
+    в каталог path и доступны другим процессам и после перезапуска. Каталог должен быть доверенным:
+    файлы загружаются через pickle.
+    """
+
+    def __init__(self, max_size: int = 256, path: str | Path = None):
+        """
+        :param max_size: Максимальное количество результатов в памяти.
+        :param path: Каталог для хранения результатов на диске. Если не передан, только память.
+        """
+        if max_size < 1:
+            raise ValueError(f'Значение max_size должно быть больше 0, передано: {max_size}')
+        self.max_size = max_size
+        self.path = Path(path) if path is not None else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._results: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    @staticmethod
+    def make_key(controller_type: str | None, sorted_stages_data: dict[str, Any]) -> str:
+        """
+        Возвращает ключ кэша. Порядок фаз и направлений в фазах не влияет на ключ,
+        направления 5 и 5.0 различаются, как и при расчёте.
+        :param controller_type: Тип ДК(CommonConflictsAndStagesAPI.controller_type).
+        :param sorted_stages_data: Словарь вида {фаза: направления фазы}.
+        :return: sha256 в виде hex строки.
+        """
+        content = repr((
+            controller_type,
+            sorted((stage, sorted(groups)) for stage, groups in sorted_stages_data.items())
+        ))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _get_file(self, key: str) -> Path:
+        return self.path / f'{key}.pickle'
+
+    def _add(self, key: str, data: bytes) -> None:
+        self._results[key] = data
+        self._results.move_to_end(key)
+        if len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def get(self, key: str) -> T_CachedResult | None:
+        """
+        Возвращает результат расчёта из памяти или с диска.
+        :param key: Ключ кэша(self.make_key).
+        :return: Кортеж из копии instance_data и матрицы конфликтов или None, если результата нет.
+        """
+        data = self._results.get(key)
+        if data is not None:
+            self._results.move_to_end(key)
+        elif self.path is not None:
+            try:
+                data = self._get_file(key).read_bytes()
+            except OSError:
+                data = None
+            else:
+                self.disk_hits += 1
+                self._add(key, data)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(data)
+
+    def put(self, key: str, instance_data: dict[str, Any], conflicts_matrix: ConflictsMatrix) -> None:
+        """
+        Сохраняет результат расчёта.
+        :param key: Ключ кэша(self.make_key).
+        :param instance_data: Данные расчёта(CommonConflictsAndStagesAPI.instance_data).
+        :param conflicts_matrix: Матрица конфликтов расчёта.
+        :return: None
+        """
+        data = pickle.dumps((instance_data, conflicts_matrix), protocol=pickle.HIGHEST_PROTOCOL)
+        self._add(key, data)
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            file = self._get_file(key)
+            tmp_file = file.with_name(f'{file.name}.{os.getpid()}.tmp')
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, file)
+
+    def clear(self) -> None:
+        """
+        Очищает результаты в памяти и счётчики. Файлы на диске не удаляются.
+        :return: None
+        """
+        self._results.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def export(self) -> dict[str, int]:
+        """
+        Возвращает счётчики кэша для мониторинга.
+        :return: Словарь вида {'size': ..., 'hits': ..., 'disk_hits': ..., 'misses': ...}
+        """
+        return {'size': len(self._results), 'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses}
+
+
+# Общий кэш результатов расчёта конфликтов
+conflicts_results_cache = ConflictsResultsCache()
@@ -4,6 +4,8 @@ from sdp_lib.management_controllers.snmp.snmp_core import (
     PotokS,
     PeekUg405
 )
+from sdp_lib.management_controllers.snmp.snmp_fleet import FleetPoller
+from sdp_lib.management_controllers.state_store import StateStore
 from sdp_lib.management_controllers.snmp.snmp_requests import snmp_engine
 from sdp_lib.management_controllers.http.peek.peek_http import PeekWebHosts
 
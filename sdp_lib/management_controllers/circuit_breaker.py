@@ -0,0 +1,152 @@
+import time
+from enum import StrEnum
+from typing import Any
+
+
+class CircuitState(StrEnum):
+    CLOSED    = 'closed'
+    OPEN      = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class Circuit:
+
+    __slots__ = ('state', 'failures', 'opened_at', 'open_timeout', 'last_error')
+
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.
+        self.open_timeout = 0.
+        self.last_error: Exception | str | None = None
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель запросов к хостам, ключ - ipv4 хоста.
+
+    -- CLOSED: запросы отправляются. После failure_threshold ошибок подключения подряд
+       цепь переходит в OPEN.
+    -- OPEN: запросы не отправляются, вызывающий код сразу получает последнюю ошибку
+       подключения(self.get_error). Через open_timeout секунд цепь переходит в HALF_OPEN.
+    -- HALF_OPEN: отправляется один пробный запрос. Если он успешен, цепь переходит в CLOSED,
+       иначе снова в OPEN с удвоенным open_timeout(но не более max_open_timeout).
+    """
+
+    def __init__(
+            self,
+            *,
+            failure_threshold: int = 3,
+            open_timeout: float = 10,
+            max_open_timeout: float = 300
+    ):
+        """
+        :param failure_threshold: Количество ошибок подключения подряд для перехода в OPEN.
+        :param open_timeout: Время в состоянии OPEN до первого пробного запроса, в секундах.
+        :param max_open_timeout: Максимальное время в состоянии OPEN, в секундах.
+        """
+        self._failure_threshold = failure_threshold
+        self._open_timeout = open_timeout
+        self._max_open_timeout = max_open_timeout
+        self._circuits: dict[str, Circuit] = {}
+
+    def __len__(self):
+        return len(self._circuits)
+
+    def get_state(self, ipv4: str) -> CircuitState:
+        try:
+            return self._circuits[ipv4].state
+        except KeyError:
+            return CircuitState.CLOSED
+
+    def get_error(self, ipv4: str) -> Exception | str | None:
+        """
+        Возвращает последнюю ошибку подключения к хосту.
+        :param ipv4: ipv4 хоста.
+        :return: Экземпляр Exception, текст ошибки или None.
+        """
+        try:
+            return self._circuits[ipv4].last_error
+        except KeyError:
+            return None
+
+    def allow_request(self, ipv4: str) -> bool:
+        """
+        Проверяет, можно ли отправить запрос хосту.
+        Если у OPEN цепи истёк open_timeout, переводит её в HALF_OPEN и разрешает пробный запрос.
+        Если пробный запрос не завершился за open_timeout(например, был отменён), разрешает новый.
+        :param ipv4: ipv4 хоста.
+        :return: True, если запрос можно отправить, иначе False.
+        """
+        circuit = self._circuits.get(ipv4)
+        if circuit is None or circuit.state == CircuitState.CLOSED:
+            return True
+        now = time.monotonic()
+        if now - circuit.opened_at < circuit.open_timeout:
+            return False
+        circuit.state = CircuitState.HALF_OPEN
+        circuit.opened_at = now
+        return True
+
+    def record_success(self, ipv4: str) -> None:
+        """
+        Учитывает успешный запрос к хосту: цепь переходит в CLOSED.
+        :param ipv4: ipv4 хоста.
+        :return: None
+        """
+        self._circuits.pop(ipv4, None)
+
+    def record_failure(self, ipv4: str, error: Exception | str) -> None:
+        """
+        Учитывает ошибку подключения к хосту.
+        :param ipv4: ipv4 хоста.
+        :param error: Ошибка подключения, которая будет возвращаться при OPEN цепи.
+        :return: None
+        """
+        try:
+            circuit = self._circuits[ipv4]
+        except KeyError:
+            circuit = self._circuits[ipv4] = Circuit()
+        circuit.failures += 1
+        circuit.last_error = error
+        if circuit.state == CircuitState.HALF_OPEN:
+            circuit.state = CircuitState.OPEN
+            circuit.opened_at = time.monotonic()
+            circuit.open_timeout = min(circuit.open_timeout * 2, self._max_open_timeout)
+        elif circuit.state == CircuitState.CLOSED and circuit.failures >= self._failure_threshold:
+            circuit.state = CircuitState.OPEN
+            circuit.opened_at = time.monotonic()
+            circuit.open_timeout = self._open_timeout
+
+    def reset(self, ipv4: str = None) -> None:
+        """
+        Переводит цепь хоста ipv4 в CLOSED. Если ipv4 не передан, сбрасывает цепи всех хостов.
+        :param ipv4: ipv4 хоста.
+        :return: None
+        """
+        if ipv4 is None:
+            self._circuits.clear()
+        else:
+            self._circuits.pop(ipv4, None)
+
+    def export(self) -> dict[str, dict[str, Any]]:
+        """
+        Возвращает состояние цепей хостов для мониторинга.
+        :return: Словарь вида {ipv4: {'state': ..., 'failures': ..., 'open_timeout': ..., 'last_error': ...}}
+        """
+        return {
+            ipv4: {
+                'state': str(circuit.state),
+                'failures': circuit.failures,
+                'open_timeout': circuit.open_timeout,
+                'last_error': str(circuit.last_error),
+            }
+            for ipv4, circuit in self._circuits.items()
+        }
+
+
+# Выключатели хостов по протоколам: ошибки подключения одного протокола(например, таймауты snmp
+# из-за неверного community) не размыкают цепь и не подменяют ошибку запросов других протоколов к хосту
+snmp_circuit_breaker = CircuitBreaker()
+http_circuit_breaker = CircuitBreaker()
+ssh_circuit_breaker = CircuitBreaker()
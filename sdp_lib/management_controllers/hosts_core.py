@@ -181,6 +181,8 @@ class Responses:
 
     def remove_data_from_data_response(self):
         self._data_response = {}
+        self._response[HostResponseStructure.DATA_RESPONSE] = self._data_response
 
     def remove_errors_from_errors(self):
         self._errors = []
+        self._response[HostResponseStructure.ERRORS] = self._errors
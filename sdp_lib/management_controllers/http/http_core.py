@@ -1,3 +1,4 @@
+import asyncio
 from typing import Callable
 
 import aiohttp
@@ -10,13 +11,108 @@ from sdp_lib.management_controllers.structures import HttpResponseStructure
 from sdp_lib.utils_common.utils_common import check_is_ipv4
 
 
+class HttpSessionFactory:
+    """
+    Управляемая aiohttp.ClientSession для http хостов. Все хосты используют один
+    TCPConnector с ограничением количества соединений(в том числе на каждый хост),
+    keep-alive соединений и кэшем DNS. Также хранит семафоры хостов, ограничивающие
+    количество одновременных запросов к одному хосту.
+    """
+
+    def __init__(
+            self,
+            *,
+            limit: int = 100,
+            limit_per_host: int = 2,
+            keepalive_timeout: float = 30,
+            ttl_dns_cache: int = 300,
+            timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=5)
+    ):
+        """
+        :param limit: Максимальное количество соединений.
+        :param limit_per_host: Максимальное количество соединений и одновременных запросов к одному хосту.
+        :param keepalive_timeout: Время жизни неиспользуемого keep-alive соединения, в секундах.
+        :param ttl_dns_cache: Время жизни записи кэша DNS, в секундах.
+        :param timeout: Таймаут запросов сессии по умолчанию.
+        """
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._ttl_dns_cache = ttl_dns_cache
+        self._timeout = timeout
+        self._session: aiohttp.ClientSession | None = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def limit_per_host(self) -> int:
+        return self._limit_per_host
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Возвращает сессию. Если сессия ещё не создана или закрыта, создаёт новую.
+        Должен вызываться из запущенного event loop.
+        :return: Экземпляр aiohttp.ClientSession.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._limit,
+                    limit_per_host=self._limit_per_host,
+                    keepalive_timeout=self._keepalive_timeout,
+                    use_dns_cache=True,
+                    ttl_dns_cache=self._ttl_dns_cache
+                ),
+                timeout=self._timeout
+            )
+            self._host_semaphores.clear()
+        return self._session
+
+    def get_host_semaphore(self, ipv4: str) -> asyncio.Semaphore:
+        """
+        Возвращает семафор хоста, ограничивающий количество одновременных запросов к нему.
+        :param ipv4: ipv4 хоста.
+        :return: Экземпляр asyncio.Semaphore(limit_per_host).
+        """
+        try:
+            return self._host_semaphores[ipv4]
+        except KeyError:
+            return self._host_semaphores.setdefault(ipv4, asyncio.Semaphore(self._limit_per_host))
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._host_semaphores.clear()
+
+
 class HttpHosts(Host):
 
     protocol = FieldsNames.protocol_http
 
-    def __init__(self, ipv4: str = None, host_id = None, session: aiohttp.ClientSession = None):
+    # Максимальное количество одновременных запросов к хосту, если не задан session_factory
+    max_concurrent_requests = 2
+
+    def __init__(
+            self,
+            ipv4: str = None,
+            host_id = None,
+            session: aiohttp.ClientSession = None,
+            session_factory: HttpSessionFactory = None
+    ):
+        """
+        :param session: Сессия, через которую отправляются запросы.
+        :param session_factory: Фабрика сессий. Используется, если session не передана.
+        """
         super().__init__(ipv4=ipv4, host_id=host_id)
         self._base_url = f'{Names.http_prefix}{self._ipv4}' if ipv4 is not None else ''
+        self._session_factory = session_factory
+        self._semaphore: asyncio.Semaphore | None = None
         self.set_driver(session)
         self._request_sender = AsyncHttpRequests(self)
         self._request_method: Callable | None = None
@@ -34,6 +130,23 @@ class HttpHosts(Host):
     def base_url(self):
         return self._base_url
 
+    @property
+    def driver(self) -> aiohttp.ClientSession:
+        if self._driver is None and self._session_factory is not None:
+            return self._session_factory.get_session()
+        return self._driver
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """
+        Семафор, ограничивающий количество одновременных запросов к хосту.
+        """
+        if self._session_factory is not None:
+            return self._session_factory.get_host_semaphore(self._ipv4)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        return self._semaphore
+
     def check_http_response_errors_and_add_to_host_data_if_has(self):
         """
 
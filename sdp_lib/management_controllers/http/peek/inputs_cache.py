@@ -0,0 +1,158 @@
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from sdp_lib.management_controllers.http.peek.inputs_table import (
+    InputsTable,
+    T_inp_props,
+    get_actuator_code
+)
+from sdp_lib.management_controllers.http.peek.varbinds import inputs_prefix
+
+
+class CachedInputs:
+
+    __slots__ = ('inputs', 'version', 'updated_at')
+
+    def __init__(self, inputs: InputsTable, version: int):
+        self.inputs = inputs
+        self.version = version
+        self.updated_at = time.monotonic()
+
+
+class PeekInputsCache:
+    """
+    Кэш состояния входов ДК Peek, ключ - ipv4 хоста.
+    Состояние обновляется полностью после получения web страницы входов(self.update)
+    и частично после успешной установки значений входов(self.apply_payloads).
+    Каждое изменение увеличивает версию состояния. Состояние старше max_age секунд
+    считается устаревшим, и кэш его не возвращает.
+    """
+
+    def __init__(self, *, max_age: float = 30):
+        """
+        :param max_age: Время, в течение которого состояние входов считается актуальным, в секундах.
+        """
+        self._max_age = max_age
+        self._hosts: dict[str, CachedInputs] = {}
+
+    def __len__(self):
+        return len(self._hosts)
+
+    def get(self, ipv4: str) -> CachedInputs | None:
+        """
+        Возвращает актуальное состояние входов хоста.
+        :param ipv4: ipv4 хоста.
+        :return: Экземпляр CachedInputs или None, если состояния нет или оно устарело.
+        """
+        cached = self._hosts.get(ipv4)
+        if cached is None or time.monotonic() - cached.updated_at > self._max_age:
+            return None
+        return cached
+
+    def get_version(self, ipv4: str) -> int:
+        try:
+            return self._hosts[ipv4].version
+        except KeyError:
+            return 0
+
+    def update(self, ipv4: str, inputs: InputsTable | dict[str, T_inp_props]) -> int:
+        """
+        Заменяет состояние входов хоста данными web страницы входов.
+        :param ipv4: ipv4 хоста.
+        :param inputs: Таблица входов или данные входов вида {имя входа: (index, num, name, state, time, actuator)}.
+        :return: Версия нового состояния.
+        """
+        if isinstance(inputs, dict):
+            inputs = InputsTable.from_dict(inputs)
+        version = self.get_version(ipv4) + 1
+        self._hosts[ipv4] = CachedInputs(inputs, version)
+        return version
+
+    def apply_payloads(self, ipv4: str, payloads: Iterable[tuple], version: int) -> bool:
+        """
+        Применяет к состоянию входов хоста успешно отправленные payloads(InputsVarbinds.create_payload).
+        Актуатор входа принимает установленное значение, состояние входа при ВКЛ/ВЫКЛ -
+        '1'/'0', при '-' остаётся прежним, так как зависит от логики ДК.
+        Если версия состояния изменилась после формирования payloads, состояние сбрасывается.
+        :param ipv4: ipv4 хоста.
+        :param payloads: Отправленные payloads вида ((key, prefix + index), (key, значение актуатора)).
+        :param version: Версия состояния, по которому были сформированы payloads.
+        :return: True, если состояние обновлено, иначе False.
+        """
+        cached = self._hosts.get(ipv4)
+        if cached is None or cached.version != version:
+            self.invalidate(ipv4)
+            return False
+        for (_, inp), (_, actuator_val) in payloads:
+            row = cached.inputs.get_row_by_index(inp.removeprefix(inputs_prefix))
+            if row is None:
+                self.invalidate(ipv4)
+                return False
+            cached.inputs.set_actuator(row, get_actuator_code(actuator_val))
+        cached.version += 1
+        return True
+
+    def get_payloads_inputs(self, ipv4: str, payloads: Iterable[tuple]) -> list[str] | None:
+        """
+        Возвращает имена входов, затронутых payloads.
+        :param ipv4: ipv4 хоста.
+        :param payloads: Payloads вида ((key, prefix + index), (key, значение актуатора)).
+        :return: Список имён входов или None, если состояния хоста нет или вход отсутствует в состоянии.
+        """
+        cached = self._hosts.get(ipv4)
+        if cached is None:
+            return None
+        names = []
+        for (_, inp), _ in payloads:
+            row = cached.inputs.get_row_by_index(inp.removeprefix(inputs_prefix))
+            if row is None:
+                return None
+            names.append(cached.inputs.names[row])
+        return names
+
+    def confirm(self, ipv4: str, inputs: dict[str, T_inp_props]) -> list[str]:
+        """
+        Подтверждает состояние входов хоста данными, прочитанными с web страницы входов после установки.
+        Данные входов в состоянии заменяются прочитанными. Если актуатор хотя бы одного входа
+        отличается от ожидаемого(установленного self.apply_payloads), состояние помечается как устаревшее.
+        :param ipv4: ipv4 хоста.
+        :param inputs: Прочитанные данные входов вида {имя входа: (index, num, name, state, time, actuator)}.
+        :return: Список имён входов, состояние которых не подтверждено.
+        """
+        cached = self._hosts.get(ipv4)
+        if cached is None:
+            return list(inputs)
+        not_confirmed = []
+        for name, props in inputs.items():
+            if name not in cached.inputs or cached.inputs[name][-1] != props[-1]:
+                not_confirmed.append(name)
+            cached.inputs.append(*props)
+        if not_confirmed:
+            self.invalidate(ipv4)
+        return not_confirmed
+
+    def invalidate(self, ipv4: str) -> None:
+        """
+        Помечает состояние входов хоста как устаревшее, версия состояния сохраняется.
+        :param ipv4: ipv4 хоста.
+        :return: None
+        """
+        cached = self._hosts.get(ipv4)
+        if cached is not None:
+            cached.updated_at = float('-inf')
+
+    def export(self) -> dict[str, dict[str, Any]]:
+        """
+        Возвращает версии и возраст состояний входов хостов для мониторинга.
+        :return: Словарь вида {ipv4: {'version': ..., 'age': ...}}
+        """
+        now = time.monotonic()
+        return {
+            ipv4: {'version': cached.version, 'age': now - cached.updated_at}
+            for ipv4, cached in self._hosts.items()
+        }
+
+
+# Общий для web хостов Peek кэш состояния входов
+peek_inputs_cache = PeekInputsCache()
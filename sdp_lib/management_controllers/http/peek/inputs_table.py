@@ -0,0 +1,198 @@
+import sys
+from array import array
+from collections.abc import (
+    Iterable,
+    Iterator
+)
+from typing import Self
+
+from sdp_lib.management_controllers.http.peek.static_data import (
+    ActuatorAsChar,
+    ActuatorAsValue,
+    matches_actuators
+)
+
+
+T_inp_props = tuple[str, str, str, str, str, str]
+
+# Код неизвестного значения состояния или актуатора входа
+UNKNOWN = -1
+
+# Коды актуатора по его обозначению и по значению
+actuators_codes = {
+    **{str(char): int(matches_actuators[char]) for char in ActuatorAsChar},
+    **{str(value): int(value) for value in ActuatorAsValue},
+}
+actuators_chars = {int(matches_actuators[char]): str(char) for char in ActuatorAsChar}
+actuators_values = {int(value): value for value in ActuatorAsValue}
+
+
+def get_actuator_code(actuator: ActuatorAsChar | ActuatorAsValue | str) -> int:
+    """
+    Возвращает код актуатора(int(ActuatorAsValue)) по его значению или обозначению.
+    :param actuator: Значение('0', '1', '2') или обозначение('-', 'ВЫКЛ', 'ВКЛ') актуатора.
+    :return: Код актуатора или UNKNOWN.
+    """
+    return actuators_codes.get(actuator, UNKNOWN)
+
+
+def get_state_code(state: str) -> int:
+    try:
+        return int(state)
+    except ValueError:
+        return UNKNOWN
+
+
+class InputsTable:
+    """
+    Таблица входов ДК Peek, хранящая данные по столбцам. Состояние и актуатор входа
+    хранятся целочисленными кодами в array: состояние - 0/1, актуатор - int(ActuatorAsValue).
+    Неизвестные значения кодируются UNKNOWN. Доступ к строке таблицы по имени входа
+    выполняется через индекс имён, по номеру входа из payload - через индекс номеров.
+    """
+
+    __slots__ = ('names', 'indexes', 'numbers', 'states', 'times', 'actuators', '_rows_by_name', '_rows_by_index')
+
+    def __init__(self, inputs: Iterable[T_inp_props] = ()):
+        """
+        Имена и номера входов одинаковы для всех ДК и интернируются,
+        чтобы таблицы разных хостов ссылались на одни и те же строки.
+        :param inputs: Данные входов вида (index, num, name, state, time, actuator).
+        """
+        self.names: list[str] = []
+        self.indexes: list[str] = []
+        self.numbers: list[str] = []
+        self.times: list[str] = []
+        self.states = array('b')
+        self.actuators = array('b')
+        self._rows_by_name: dict[str, int] = {}
+        self._rows_by_index: dict[str, int] = {}
+        for index, num, name, state, _time, actuator in inputs:
+            self.append(index, num, name, state, _time, actuator)
+
+    @classmethod
+    def from_dict(cls, inputs: dict[str, T_inp_props]) -> Self:
+        """
+        Создаёт таблицу из данных InputsPageParser.
+        :param inputs: Данные входов вида {имя входа: (index, num, name, state, time, actuator)}.
+        :return: Экземпляр InputsTable.
+        """
+        return cls(inputs.values())
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name: str):
+        return name in self._rows_by_name
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __getitem__(self, name: str) -> T_inp_props:
+        return self.get_props(self._rows_by_name[name])
+
+    def append(self, index: str, num: str, name: str, state: str, _time: str, actuator: str) -> None:
+        index, num, name = sys.intern(index), sys.intern(num), sys.intern(name)
+        if name in self._rows_by_name:
+            row = self._rows_by_name[name]
+            del self._rows_by_index[self.indexes[row]]
+            self.indexes[row], self.numbers[row], self.times[row] = index, num, _time
+            self.states[row], self.actuators[row] = get_state_code(state), get_actuator_code(actuator)
+        else:
+            row = self._rows_by_name[name] = len(self.names)
+            self.names.append(name)
+            self.indexes.append(index)
+            self.numbers.append(num)
+            self.times.append(_time)
+            self.states.append(get_state_code(state))
+            self.actuators.append(get_actuator_code(actuator))
+        self._rows_by_index[index] = row
+
+    def get_row(self, name: str) -> int:
+        return self._rows_by_name[name]
+
+    def get_row_by_index(self, index: str) -> int | None:
+        return self._rows_by_index.get(index)
+
+    def get_rows(self, names: Iterable[str]) -> list[int]:
+        """
+        Возвращает номера строк входов names, присутствующих в таблице, в порядке строк таблицы.
+        :param names: Имена входов.
+        :return: Список номеров строк.
+        """
+        return sorted(self._rows_by_name[name] for name in names if name in self._rows_by_name)
+
+    def get_props(self, row: int) -> T_inp_props:
+        """
+        Возвращает данные входа строки row в виде InputsPageParser.
+        :param row: Номер строки.
+        :return: Кортеж вида (index, num, name, state, time, actuator).
+        """
+        state = self.states[row]
+        return (
+            self.indexes[row],
+            self.numbers[row],
+            self.names[row],
+            str(state) if state != UNKNOWN else '',
+            self.times[row],
+            actuators_chars.get(self.actuators[row], '')
+        )
+
+    def select(
+            self,
+            rows: Iterable[int] = None,
+            *,
+            state: int = None,
+            actuator: int = None,
+            exclude_actuator: int = None
+    ) -> list[int]:
+        """
+        Отбирает строки таблицы по коду состояния и коду актуатора.
+        Пример: все входы MPP_PH, актуатор которых ВКЛ:
+            table.select(table.get_rows(mpp_stages_inputs), actuator=ActuatorAsValue.ON)
+        :param rows: Номера строк для отбора. Если не переданы, отбор из всех строк.
+        :param state: Код состояния, который должен быть у входа.
+        :param actuator: Код актуатора, который должен быть у входа.
+        :param exclude_actuator: Код актуатора, которого не должно быть у входа.
+        :return: Список номеров отобранных строк.
+        """
+        rows = range(len(self.names)) if rows is None else rows
+        states, actuators = self.states, self.actuators
+        if state is not None:
+            rows = [row for row in rows if states[row] == state]
+        if actuator is not None:
+            actuator = int(actuator)
+            rows = [row for row in rows if actuators[row] == actuator]
+        if exclude_actuator is not None:
+            exclude_actuator = int(exclude_actuator)
+            rows = [row for row in rows if actuators[row] != exclude_actuator]
+        return list(rows)
+
+    def set_actuator(self, row: int, actuator: int) -> None:
+        """
+        Устанавливает код актуатора входа. При ВКЛ/ВЫКЛ код состояния входа становится 1/0,
+        при '-' остаётся прежним, так как зависит от логики ДК.
+        :param row: Номер строки.
+        :param actuator: Код актуатора.
+        :return: None
+        """
+        self.actuators[row] = actuator
+        if actuator == int(ActuatorAsValue.ON):
+            self.states[row] = 1
+        elif actuator == int(ActuatorAsValue.OFF):
+            self.states[row] = 0
+
+    def copy(self) -> Self:
+        table = InputsTable()
+        table.names, table.indexes = self.names.copy(), self.indexes.copy()
+        table.numbers, table.times = self.numbers.copy(), self.times.copy()
+        table.states, table.actuators = array('b', self.states), array('b', self.actuators)
+        table._rows_by_name, table._rows_by_index = self._rows_by_name.copy(), self._rows_by_index.copy()
+        return table
+
+    def as_dict(self) -> dict[str, T_inp_props]:
+        """
+        Возвращает данные входов в виде InputsPageParser.
+        :return: Словарь вида {имя входа: (index, num, name, state, time, actuator)}.
+        """
+        return {name: self.get_props(row) for row, name in enumerate(self.names)}
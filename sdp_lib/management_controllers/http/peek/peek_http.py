@@ -3,6 +3,7 @@ from enum import IntEnum
 from functools import cached_property
 from typing import (
     Callable,
+    Self,
     Type,
     TypeVar
 )
@@ -11,13 +12,22 @@ import aiohttp
 
 from sdp_lib.management_controllers.exceptions import (
     BadControllerType,
-    BadValueToSet
+    BadValueToSet,
+    ErrorSetValue
 )
-from sdp_lib.management_controllers.http.http_core import HttpHosts
+from sdp_lib.management_controllers.http.http_core import (
+    HttpHosts,
+    HttpSessionFactory
+)
+from sdp_lib.management_controllers.fields_names import FieldsNames
 from sdp_lib.management_controllers.http.peek import (
     routes,
     static_data
 )
+from sdp_lib.management_controllers.http.peek.inputs_cache import (
+    PeekInputsCache,
+    peek_inputs_cache
+)
 from sdp_lib.management_controllers.http.peek.varbinds import InputsVarbinds
 from sdp_lib.management_controllers.parsers.parsers_peek_http_new import (
     MainPageParser,
@@ -38,11 +48,18 @@ class DataFromWeb(IntEnum):
 
 class PeekWebHosts(HttpHosts):
 
+    inputs_cache: PeekInputsCache = peek_inputs_cache
+
+    # Если True, контент страниц парсится по мере получения(AsyncHttpRequests.fetch_and_parse),
+    # иначе после получения тела ответа целиком(AsyncHttpRequests.fetch)
+    stream_parsing = True
+
     @cached_property
     def matches(self) -> dict[DataFromWeb, tuple[str, Callable, Type[T_Parsers]]]:
+        fetch = self._request_sender.fetch_and_parse if self.stream_parsing else self._request_sender.fetch
         return {
-            DataFromWeb.main_page_get: (routes.main_page, self._request_sender.fetch, MainPageParser),
-            DataFromWeb.inputs_page_get: (routes.get_inputs, self._request_sender.fetch, InputsPageParser),
+            DataFromWeb.main_page_get: (routes.main_page, fetch, MainPageParser),
+            DataFromWeb.inputs_page_get: (routes.get_inputs, fetch, InputsPageParser),
             DataFromWeb.inputs_page_set: (routes.set_inputs, self._request_sender.post_request, None),
         }
 
@@ -53,6 +70,9 @@ class PeekWebHosts(HttpHosts):
             parser_class,
             **kwargs
     ):
+        parser = parser_class() if parser_class is not None else None
+        if method == self._request_sender.fetch_and_parse:
+            kwargs['parser'] = parser
         self.last_response = await self._request_sender.http_request_to_host(
             url=url,
             method=method,
@@ -63,12 +83,12 @@ class PeekWebHosts(HttpHosts):
 
         # print(f'self.last_response: {self.last_response}')
 
-        if parser_class is None:
+        if parser is None:
             # Вернуть ответ из self._request_sender.http_request_to_host если парсер не задан
             return self.last_response[HttpResponseStructure.CONTENT]
 
-        parser = parser_class()
-        parser.parse(self.last_response[HttpResponseStructure.CONTENT])
+        if 'parser' not in kwargs:
+            parser.parse(self.last_response[HttpResponseStructure.CONTENT])
         # print(f'parser.data_for_response: {parser.data_for_response}')
         if not parser.data_for_response:
             self.add_data_to_data_response_attrs(error=BadControllerType())
@@ -99,23 +119,28 @@ class PeekWebHosts(HttpHosts):
         return await self.fetch_all_pages(DataFromWeb.main_page_get)
 
     async def get_inputs(self):
-        return await self.fetch_all_pages(DataFromWeb.inputs_page_get)
+        await self.fetch_all_pages(DataFromWeb.inputs_page_get)
+        if not self.response_errors:
+            self.inputs_cache.update(self._ipv4, self.response_data[str(FieldsNames.inputs)])
+        return self
 
     """ Management """
 
+    async def _single_common_request_with_semaphore(self, *args, **kwargs):
+        async with self.semaphore:
+            return await self._single_common_request(*args, **kwargs)
+
     async def post_all_pages(self, page, payload_data: list[tuple]):
         async with asyncio.TaskGroup() as tg:
             results = []
             print(f'page: {page}\npayload: {payload_data}')
             route, method, parser_class = self.matches.get(page)
-            max_concurrent_tasks = 5
-            for num_task, payload in enumerate(payload_data, 1):
-                if num_task % max_concurrent_tasks == 0:
-                    print(f'DEBUG len(payload_data) : {len(payload_data)}')
-                    await asyncio.sleep(1) # Peek сбрасывает при коннект при большом количестве запросов
+            # Peek сбрасывает коннект при большом количестве одновременных запросов,
+            # поэтому их количество ограничено семафором хоста
+            for payload in payload_data:
                 results.append(
                     tg.create_task(
-                        self._single_common_request(
+                        self._single_common_request_with_semaphore(
                             self._base_url + route, method, parser_class,
                             cookies=static_data.cookies,
                             data=payload
@@ -134,22 +159,85 @@ class PeekWebHosts(HttpHosts):
             inps_name_and_vals: dict | tuple = None,
             stage: int = None,
     ):
-        await self.get_inputs()
-        if self.response_errors:
-            return self
-        _inputs = self.response_as_dict['data']['inputs']
+        """
+        Устанавливает значения входов ДК.
+        Payloads формируются по состоянию входов из self.inputs_cache. Web страница входов
+        запрашивается перед установкой, только если состояния нет в кэше или оно устарело.
+        После успешной отправки затронутые входы читаются с web страницы входов(чтение прекращается,
+        как только найдены все затронутые входы) и подтверждаются в кэше. Если отправка или
+        подтверждение завершились ошибкой, состояние входов запрашивается полностью.
+        :param inps_name_and_vals: Имена входов и значения актуаторов для установки.
+        :param stage: Фаза для установки. Если передана, inps_name_and_vals не используется.
+        :return: self
+        """
+        cached = self.inputs_cache.get(self._ipv4)
+        if cached is None:
+            await self.get_inputs()
+            if self.response_errors:
+                return self
+            cached = self.inputs_cache.get(self._ipv4)
+        version = cached.version
 
         if stage is not None:
-            payloads = InputsVarbinds(_inputs).get_varbinds_set_stage(stage)
+            payloads = InputsVarbinds(cached.inputs).get_varbinds_set_stage(stage)
         else:
-            payloads = InputsVarbinds(_inputs).get_varbinds_as_from_name(inps_name_and_vals)
+            payloads = InputsVarbinds(cached.inputs).get_varbinds_as_from_name(inps_name_and_vals)
 
         print(f'payloads: {payloads}')
+        names = self.inputs_cache.get_payloads_inputs(self._ipv4, payloads)
         await self.post_all_pages(
             DataFromWeb.inputs_page_set,
             payload_data=payloads
         )
+        if (
+            self.response_errors
+            or names is None
+            or not self.inputs_cache.apply_payloads(self._ipv4, payloads, version)
+        ):
+            return await self._refresh_inputs_after_error()
+        if names:
+            not_confirmed = await self._confirm_inputs(names)
+            if not_confirmed is None:
+                return await self._refresh_inputs_after_error()
+            if not_confirmed:
+                self.add_data_to_data_response_attrs(ErrorSetValue(f'не подтверждены входы {not_confirmed}'))
+                return await self._refresh_inputs_after_error()
+        self.add_data_to_data_response_attrs(data={str(FieldsNames.inputs): cached.inputs.as_dict()})
+        return self
+
+    async def _confirm_inputs(self, names: list[str]) -> list[str] | None:
+        """
+        Читает затронутые входы с web страницы входов и подтверждает их состояние в self.inputs_cache.
+        :param names: Имена затронутых входов.
+        :return: Список имён входов, состояние которых не подтверждено, или None при ошибке запроса.
+        """
+        parser = InputsPageParser(names)
+        self.last_response = await self._request_sender.http_request_to_host(
+            url=self._base_url + routes.get_inputs,
+            method=self._request_sender.fetch_and_parse,
+            parser=parser
+        )
+        if self.check_http_response_errors_and_add_to_host_data_if_has():
+            return None
+        inputs = parser.data_for_response[str(FieldsNames.inputs)]
+        return (
+            self.inputs_cache.confirm(self._ipv4, inputs)
+            + [name for name in names if name not in inputs]
+        )
+
+    async def _refresh_inputs_after_error(self) -> Self:
+        """
+        Запрашивает состояние входов полностью после ошибки установки. Ошибки установки
+        сохраняются в response после запроса, чтобы кэш входов был обновлён полученными данными.
+        :return: self
+        """
+        errors = list(self.response_errors)
+        self.remove_errors_from_response()
+        self.inputs_cache.invalidate(self._ipv4)
         await self.get_inputs()
+        for error in errors:
+            self.add_data_to_data_response_attrs(error)
+        self.remove_data_from_response()
         return self
 
     async def set_stage(self, stage: int):
@@ -167,9 +255,8 @@ async def main():
     """
     Тестовая функция.
     """
-    try:
-        sess = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(1))
-        obj = PeekWebHosts('10.179.75.113', host_id='3290', session=sess)
+    async with HttpSessionFactory(timeout=aiohttp.ClientTimeout(1)) as session_factory:
+        obj = PeekWebHosts('10.179.75.113', host_id='3290', session_factory=session_factory)
         # await obj.get_states()
         # await obj.request_all_types(AvailableDataFromWeb.main_page_get)
         await obj.set_inputs_to_web(inps_name_and_vals=(('MPP_PH2', '-'),
@@ -178,8 +265,6 @@ async def main():
                                                         ('MPP_PH4', '0')))
 
         # await obj.get_states()
-    finally:
-        await sess.close()
 
     # print(obj)
 
@@ -1,10 +1,13 @@
 import os
 
-from sdp_lib.management_controllers.http.peek.static_data import (
-    ActuatorAsChar,
-    ActuatorAsValue, matches_actuators
+from sdp_lib.management_controllers.http.peek.inputs_table import (
+    UNKNOWN,
+    InputsTable,
+    T_inp_props,
+    actuators_values,
+    get_actuator_code
 )
-from sdp_lib.management_controllers.structures import InputsStructure
+from sdp_lib.management_controllers.http.peek.static_data import ActuatorAsValue
 
 
 all_mpp_inputs = set(os.getenv('ALL_MPP_INPUTS').split())
@@ -19,33 +22,34 @@ inputs_prefix = os.getenv('INPUT_PREFIX_FOR_SET_VAL')
 
 
 def get_actuator_val_for_payload(value):
-    if value in [el for el in ActuatorAsValue]:
-        return value
-    elif value in [el for el in ActuatorAsChar]:
-        return matches_actuators.get(value)
-    else:
+    code = get_actuator_code(value)
+    if code == UNKNOWN:
         raise ValueError(f'Некорректное значение актуатора: {value!r}')
+    return actuators_values[code]
 
 
-T_inp_props = tuple[str, str, str, str, str]
 T_inps_container = list[tuple[str, str]] | tuple[tuple[str, str], ...] | dict[str, str]
 
 
 class InputsVarbinds:
 
-    def __init__(self, inputs_from_web: dict[str, T_inp_props] = None):
-        self._inputs_from_web = None
-        self._mpp_man_index = None
-        self._mpp_man_state = None
-        self._mpp_man_actuator = None
+    def __init__(self, inputs_from_web: InputsTable | dict[str, T_inp_props] = None):
+        """
+        :param inputs_from_web: Таблица входов или данные входов InputsPageParser
+                                вида {имя входа: (index, num, name, state, time, actuator)}.
+        """
+        self._inputs_from_web: InputsTable | None = None
+        self._mpp_man_row = None
+        self._mpp_stages_rows = None
         self.set_inputs_from_web_data(inputs_from_web)
 
-    def set_inputs_from_web_data(self, inputs_from_web) -> None:
+    def set_inputs_from_web_data(self, inputs_from_web: InputsTable | dict[str, T_inp_props]) -> None:
+        if isinstance(inputs_from_web, dict):
+            inputs_from_web = InputsTable.from_dict(inputs_from_web)
         self._inputs_from_web = inputs_from_web
         if self._inputs_from_web is not None:
-            self._mpp_man_index = self._inputs_from_web[MPP_MAN][InputsStructure.INDEX]
-            self._mpp_man_state = self._inputs_from_web[MPP_MAN][InputsStructure.STATE]
-            self._mpp_man_actuator = self._inputs_from_web[MPP_MAN][InputsStructure.ACTUATOR]
+            self._mpp_man_row = self._inputs_from_web.get_row(MPP_MAN)
+            self._mpp_stages_rows = self._inputs_from_web.get_rows(mpp_stages_inputs)
 
     def refresh_inputs_from_web_data(self, inputs_from_web):
         self.set_inputs_from_web_data(inputs_from_web)
@@ -57,13 +61,13 @@ class InputsVarbinds:
         if isinstance(data, dict):
             data = data.items()
 
+        table = self._inputs_from_web
         for inp_name, actuator_val in data:
-            if (inp_name in self._inputs_from_web
-                and self._inputs_from_web[inp_name][InputsStructure.ACTUATOR] != actuator_val
-            ):
-                payloads.append(
-                    self.create_payload(self._inputs_from_web[inp_name][InputsStructure.INDEX], actuator_val)
-                )
+            if inp_name not in table:
+                continue
+            row = table.get_row(inp_name)
+            if table.actuators[row] != get_actuator_code(actuator_val):
+                payloads.append(self.create_payload(table.indexes[row], actuator_val))
         return payloads
 
     def get_varbinds_set_stage(self, stage: int = 0) -> list:
@@ -75,45 +79,40 @@ class InputsVarbinds:
 
     def _get_varbinds_set_stage(self, stage: int) -> list:
         payloads = []
-        if self._mpp_man_state == '0' or self._mpp_man_actuator in (ActuatorAsChar.VF, ActuatorAsChar.OFF):
+        table = self._inputs_from_web
+        if (table.states[self._mpp_man_row] == 0
+            or table.actuators[self._mpp_man_row] in (int(ActuatorAsValue.VF), int(ActuatorAsValue.OFF))
+        ):
             payloads.append(
-                self.create_payload(self._mpp_man_index, ActuatorAsValue.ON)
+                self.create_payload(table.indexes[self._mpp_man_row], ActuatorAsValue.ON)
             )
 
-        # stage = str(stage)
-        mpp_ph_to_set = f'{PREFIX_MAN_STAGE_PEEK}{stage}'
-        for mpp in mpp_stages_inputs:
-
-            if (mpp != mpp_ph_to_set
-                and self._inputs_from_web[mpp][InputsStructure.STATE] != '0'
-                and self._inputs_from_web[mpp][InputsStructure.ACTUATOR] != ActuatorAsChar.OFF
-            ):
+        mpp_ph_to_set_row = table.get_row(f'{PREFIX_MAN_STAGE_PEEK}{stage}')
+        for row in table.select(self._mpp_stages_rows, exclude_actuator=ActuatorAsValue.OFF):
+            if row != mpp_ph_to_set_row and table.states[row] != 0:
                 payloads.append(
-                    self.create_payload(self._inputs_from_web[mpp][InputsStructure.INDEX], ActuatorAsValue.OFF)
+                    self.create_payload(table.indexes[row], ActuatorAsValue.OFF)
                 )
-        if self._inputs_from_web[mpp_ph_to_set][InputsStructure.ACTUATOR] != ActuatorAsChar.ON:
+        if table.actuators[mpp_ph_to_set_row] != int(ActuatorAsValue.ON):
             payloads.append(
-                self.create_payload(self._inputs_from_web[mpp_ph_to_set][InputsStructure.INDEX], ActuatorAsValue.ON)
+                self.create_payload(table.indexes[mpp_ph_to_set_row], ActuatorAsValue.ON)
             )
         return payloads
 
     def get_varbinds_reset_man(self) -> list:
         payloads = []
-        if (self._inputs_from_web[MPP_MAN][InputsStructure.STATE] == '1'
-            or self._inputs_from_web[MPP_MAN][InputsStructure.ACTUATOR] == ActuatorAsChar.ON
+        table = self._inputs_from_web
+        if (table.states[self._mpp_man_row] == 1
+            or table.actuators[self._mpp_man_row] == int(ActuatorAsValue.ON)
         ):
             payloads.append(
-                self.create_payload(self._inputs_from_web[MPP_MAN][InputsStructure.INDEX], ActuatorAsValue.OFF)
+                self.create_payload(table.indexes[self._mpp_man_row], ActuatorAsValue.OFF)
             )
 
-        for mpp_inp in mpp_stages_inputs:
-            # if (self._inputs_from_web[mpp_inp][InputsStructure.STATE] == '1'
-            #    or self._inputs_from_web[mpp_inp][InputsStructure.ACTUATOR] != ActuatorAsChar.VF
-            # ):
-            if self._inputs_from_web[mpp_inp][InputsStructure.ACTUATOR] != ActuatorAsChar.VF:
-                payloads.append(
-                    self.create_payload(self._inputs_from_web[mpp_inp][InputsStructure.INDEX], ActuatorAsValue.VF)
-                )
+        for row in table.select(self._mpp_stages_rows, exclude_actuator=ActuatorAsValue.VF):
+            payloads.append(
+                self.create_payload(table.indexes[row], ActuatorAsValue.VF)
+            )
         return payloads
 
     def create_payload(self, inp_index: str, actuator_val: ActuatorAsValue | str) -> tuple:
@@ -122,4 +121,3 @@ class InputsVarbinds:
             (key_payload, f'{inputs_prefix}{inp_index}'),
             (val_payload, get_actuator_val_for_payload(actuator_val))
         )
-
@@ -1,13 +1,24 @@
 import asyncio
-from typing import Callable
+import codecs
+from typing import (
+    Any,
+    Callable
+)
 
 import aiohttp
 
+from sdp_lib.management_controllers.circuit_breaker import (
+    CircuitBreaker,
+    http_circuit_breaker
+)
 from sdp_lib.management_controllers.exceptions import ConnectionTimeout, BadControllerType
+from sdp_lib.management_controllers.parsers.parsers_peek_http_new import ParserBase
 
 
 class AsyncHttpRequests:
 
+    circuit_breaker: CircuitBreaker = http_circuit_breaker
+
     default_timeout_get_request = .4
     default_timeout_post_request = .6
 
@@ -23,6 +34,33 @@ class AsyncHttpRequests:
             assert response.status == 200
             return await response.text()
 
+    async def fetch_and_parse(
+            self,
+            url: str,
+            parser: ParserBase,
+            timeout: float = .4,
+            chunk_size: int = 4096
+    ) -> dict[str, Any]:
+        """
+        Получает контент веб страницы по частям и передаёт их парсеру по мере получения.
+        Чтение прекращается, как только парсер извлёк все данные(parser.feed вернул True),
+        оставшаяся часть тела ответа не читается, а соединение закрывается.
+        :param url: url веб страницы.
+        :param parser: Парсер, поддерживающий инкрементальный парс(feed/close).
+        :param timeout: Таймаут подключения.
+        :param chunk_size: Максимальный размер части тела ответа в байтах.
+        :return: Данные для response, сформированные парсером.
+        """
+        async with self._instance_host.driver.get(url, timeout=aiohttp.ClientTimeout(connect=timeout)) as response:
+            assert response.status == 200
+            decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                if parser.feed(decoder.decode(chunk)):
+                    break
+            else:
+                parser.feed(decoder.decode(b'', final=True))
+            return parser.close()
+
     async def post_request(
             self,
             url: str,
@@ -52,8 +90,14 @@ class AsyncHttpRequests:
                  [0] -> экземпляр производного класса от Exception
                  при ошибке в получении контента, иначе None.
                  [1] -> контент веб страницы типа str, если запрос выполнен успешно, иначе None.
+                 Если цепь хоста в self.circuit_breaker разомкнута, запрос не отправляется и
+                 сразу возвращается последняя ошибка подключения.
         """
         # print(f'++ self.method: {method.__name__}')
+        ip = self._instance_host.ip_v4
+        if not self.circuit_breaker.allow_request(ip):
+            return self.circuit_breaker.get_error(ip), None
+
         error = content = None
         try:
             content = await method(
@@ -67,6 +111,11 @@ class AsyncHttpRequests:
             error = BadControllerType()
         except aiohttp.client_exceptions.ClientConnectorError:
             error = ConnectionTimeout('from connector')
+
+        if isinstance(error, ConnectionTimeout):
+            self.circuit_breaker.record_failure(ip, error)
+        elif error is None:
+            self.circuit_breaker.record_success(ip)
         return error, content
 
 
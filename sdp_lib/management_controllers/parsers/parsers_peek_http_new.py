@@ -1,6 +1,9 @@
+import abc
 import json
 import pprint
+import re
 import time
+from collections.abc import Iterable
 from typing import (
     Any,
     TypeAlias
@@ -19,7 +22,58 @@ class ParserBase(Parsers):
     """
     def __init__(self):
         super().__init__()
-        self.content_as_list = None
+        # Незавершённая строка последнего переданного в self.feed фрагмента контента
+        self._tail = ''
+        self._is_done = False
+
+    def parse(self, content: str) -> dict[str, properties]:
+        """
+        Парсит контент web страницы целиком.
+        :param content: Контент web страницы.
+        :return: Словарь с данными для response.
+        """
+        self._parse_lines(content)
+        return self._build_data_for_response()
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Парсит очередной фрагмент контента web страницы по мере его получения.
+        Разбираются только завершённые строки, незавершённая строка ожидает следующий фрагмент.
+        :param chunk: Фрагмент контента web страницы.
+        :return: True, если все данные извлечены и остальной контент можно не читать, иначе False.
+        """
+        if self._is_done:
+            return True
+        end = chunk.rfind('\n')
+        if end == -1:
+            self._tail += chunk
+            return False
+        lines, self._tail = self._tail + chunk[:end], chunk[end + 1:]
+        self._is_done = self._parse_lines(lines)
+        return self._is_done
+
+    def close(self) -> dict[str, properties]:
+        """
+        Завершает парс контента, переданного в self.feed.
+        :return: Словарь с данными для response.
+        """
+        if not self._is_done and self._tail:
+            self._parse_lines(self._tail)
+        self._tail = ''
+        self._is_done = True
+        return self._build_data_for_response()
+
+    @abc.abstractmethod
+    def _parse_lines(self, content: str) -> bool:
+        """
+        Парсит завершённые строки контента web страницы.
+        :param content: Строки контента web страницы.
+        :return: True, если все данные извлечены и остальной контент можно не разбирать, иначе False.
+        """
+
+    @abc.abstractmethod
+    def _build_data_for_response(self) -> dict[str, properties]:
+        """ Формирует словарь с данными для response из извлечённых данных. """
 
     def base_extract_data_from_line(self, line: str, pattern: str):
         """
@@ -45,17 +99,26 @@ class MainPageParser(ParserBase):
     Парсер контента главной web страницы ДК Peek.
     """
 
-    pattern_address = ':SUBTITLE;'
-    pattern_plan = ':D;;##T_PLAN##;'
-    pattern_plan_param = '##T_TIMINGSET##;'
-    pattern_time = ':D;;##T_TIME##;'
-    pattern_alarms = ':D;;##T_ALARMS##;'
-    pattern_end_table = ':ENDTABLE'
-
-    pattern_stream = '<b>##T_STREAM## '
-    pattern_state = ':D;;##T_STATE##;'
-    pattern_cycle = ':D;;##T_CYCLE##;'
-    pattern_mode_and_stage = ':D;;##T_MODE## (##T_STAGE##);'
+    # Все искомые строки страницы для разбора за один проход по контенту.
+    # Каждая строка начинается с '\n', благодаря литеральному префиксу поиск совпадения
+    # выполняется быстрее, чем с '^' в режиме re.MULTILINE. Имя группы, совпавшей
+    # последней(match.lastgroup), определяет тип строки. После ':BEGIN_TFT_ONLY' данных нет.
+    pattern_main_page = re.compile(
+        r'\n(?:'
+        r':(?:SUBTITLE;(?P<address>[^\r\n]*)'
+        r'|D;;##T_(?:'
+        r'PLAN##;[ \t]*(?P<plan>[^ \t\r\n]*)[^\r\n]*'
+        r'|TIMINGSET##;(?P<plan_param>[^\r\n]*)'
+        r'|TIME##;(?P<time>[^\r\n]*)'
+        r'|ALARMS##;(?P<alarms>[^\r\n]*)'
+        r'|STATE##;(?P<state>[^\r\n]*)'
+        r'|MODE## \(##T_STAGE##\);(?:(?P<mode>[^ \t\r\n]+)[ \t]+\((?P<stage>[^)\r\n]*)\))?[^\r\n]*'
+        r')'
+        r'|(?P<end>BEGIN_TFT_ONLY))'
+        r'|<b>##T_STREAM## (?P<xp>[^\r\n]*?)(?:</b>)?[ \t]*'
+        r')\r?$',
+        re.MULTILINE
+    )
 
     def __init__(self):
         super().__init__()
@@ -66,6 +129,8 @@ class MainPageParser(ParserBase):
         self.current_alarms = None
         self._num_xp = None
         self.all_xp_data = []
+        # Данные потока(xp), таблица которого разбирается
+        self._xp_data: list[str | None] | None = None
 
     def __repr__(self):
         return (
@@ -79,139 +144,39 @@ class MainPageParser(ParserBase):
             f'self.parsed_content_as_dict: {json.dumps(self.parsed_content_as_dict, indent=4, ensure_ascii=False)}'
         )
 
-    def extract_address(self, line: str) -> str:
-        """
-        Извлекает адрес из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая адрес.
-                     Пример: ":SUBTITLE;Moscow: Панфиловс пр / Андреевка"
-        :return: Адрес объекта. Пример: "Moscow: Панфиловс пр / Андреевка"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_address)
-
-    def extract_current_plan(self, line: str) -> str | None:
-        """
-        Извлекает номер текущего плана ДК из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая номер плана.
-                     Пример: ":D;;##T_PLAN##;006 -             "
-        :return: Текущий номер плана. Пример: "006"
-        """
-        try:
-            return line.split(self.pattern_plan)[-1].split(maxsplit=1)[0]
-        except IndexError:
-            pass
-        return None
-
-    def extract_current_plan_param(self, line: str) -> str | None:
-        """
-        Извлекает параметр текущего плана ДК из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая параметр плана.
-                     Пример: ":D;;##T_TIMINGSET##;005"
-        :return: Текущий параметр плана. Пример: "005"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_plan_param)
-
-    def extract_current_time(self, line: str) -> str | None:
-        """
-        Извлекает текущее время ДК из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущее время.
-                     Пример: ":D;;##T_TIME##;2025-03-01 16:39:57"
-        :return: Текущее время. Пример: "2025-03-01 16:39:57"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_time)
-
-    def extract_current_alarms(self, line: str) -> str | None:
-        """
-        Извлекает текущие ошибки ДК из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущие ошибки.
-                     Пример: ":D;;##T_ALARMS##;ISWC"
-        :return: Текущие ошибки. Пример: "ISWC"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_alarms)
-
-    def extract_current_num_xp(self, line: str) -> str | None:
-        """
-        Извлекает номер текущего потока(xp) переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущие ошибки.
-                     Пример: "<b>##T_STREAM## 1</b>"
-        :return: Номер текущего потока(xp). Пример: "1"
-        """
-        try:
-            return line.split(self.pattern_stream)[-1].replace('</b>', '')
-        except IndexError:
-            pass
-        return line
-
-    def extract_current_xp_state(self, line: str) -> str | None:
-        """
-        Извлекает номер текущего потока(xp) переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущие ошибки.
-                     Пример: ":D;;##T_STATE##;УПРАВЛЕНИЕ"
-        :return: Номер текущего потока(xp). Пример: "УПРАВЛЕНИЕ"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_state)
-
-    def extract_current_xp_mode_and_stage(self, line: str) -> tuple[str | None, str | None]:
-        """
-        Извлекает текущий режим и фазу потока(xp) переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущие ошибки.
-                     Пример: ":D;;##T_MODE## (##T_STAGE##);FT (5)"
-        :return: Кортеж из значений текущего режима и фазы потока(xp). Пример: ("FT", "5")
-        """
-        try:
-            mode, stage = self.base_extract_data_from_line(line, self.pattern_mode_and_stage).split()
-            return mode, stage.replace('(', '').replace(')', '')
-        except IndexError:
-            return None, None
-
-    def parse_xp_data(self, lines: list[str]) -> tuple[str, str, str, str]:
-        """
-        Извлекает текущую информацию для потока(xp) переданного списка lines.
-        :param lines: Список с web страницы ДК Peek, содержащий строки с данными о потоке.
-                      len(lines) == 7.
-                      Пример: ["<b>##T_STREAM## 1</b>",
-                              ":BEGINTABLE",
-                              ":W;;200px;",
-                              ":D;;##T_STATE##;УПРАВЛЕНИЕ",
-                              ":D;;##T_CYCLE##;0 (0)",
-                              ":D;;##T_MODE## (##T_STAGE##);FT (6)",
-                              ":ENDTABLE"]
-        :return: Кортеж из значений текущего режима и фазы потока(xp). Пример: ("FT", "6")
-        """
-        # print(f'lines::: {lines}')
-        num_xp = self.extract_current_num_xp(lines[0])
-        state = self.extract_current_xp_state(lines[3])
-        mode, stage = self.extract_current_xp_mode_and_stage(lines[5])
-        return num_xp, state, mode, stage
-
-    def parse(self, content: str):
+    def _parse_lines(self, content: str) -> bool:
         """
         Парсит данные с основной web страницы ДК Peek, присваивая их соответствующим атрибутам.
-        :param get_parsed_data_as_dict: Параметр является опцией.
-                                        При True -> формирует атрибут self.parsed_content_as_dict.
-        :return: None.
+        Контент разбирается за один проход регулярным выражением self.pattern_main_page,
+        данные потока(xp) заполняются по мере нахождения строк его таблицы.
+        :param content: Строки контента основной web страницы ДК Peek.
+        :return: True, если достигнута строка ':BEGIN_TFT_ONLY', после которой данных нет, иначе False.
         """
-        self.content_as_list = content.splitlines()
-        common_data_is_extracted = False
-        for i, line in enumerate(self.content_as_list):
-            if not common_data_is_extracted:
-                if self.pattern_address in line:
-                    self.address = self.extract_address(line)
-                elif self.pattern_plan in line:
-                    self.current_plan = self.extract_current_plan(line)
-                elif self.pattern_plan_param in line:
-                    self.current_plan_param = self.extract_current_plan_param(line)
-                elif self.pattern_time in line:
-                    self.current_time = self.extract_current_time(line)
-                elif self.pattern_alarms in line:
-                    self.current_alarms = self.extract_current_alarms(line)
-                elif self.pattern_end_table in line:
-                    common_data_is_extracted = True
-            elif self.pattern_stream in line:
-                stream_data = self.content_as_list[i: i + 7]
-                self.all_xp_data.append(self.parse_xp_data(stream_data))
-
-        # assert self.all_xp_data and self.data_for_response #DEBUG
-        # print(f'main_page.build_data_for_response(): {self.build_attr_data_for_response(self._get_properties())}')
+        for match in self.pattern_main_page.finditer(f'\n{content}'):
+            match match.lastgroup:
+                case 'address':
+                    self.address = match['address']
+                case 'plan':
+                    self.current_plan = match['plan'] or None
+                case 'plan_param':
+                    self.current_plan_param = match['plan_param']
+                case 'time':
+                    self.current_time = match['time']
+                case 'alarms':
+                    self.current_alarms = match['alarms']
+                case 'xp':
+                    self._xp_data = [match['xp'], None, None, None]
+                    self.all_xp_data.append(self._xp_data)
+                case 'state' if self._xp_data is not None:
+                    self._xp_data[1] = match['state']
+                case 'stage' if self._xp_data is not None:
+                    self._xp_data[2], self._xp_data[3] = match['mode'], match['stage']
+                case 'end':
+                    return True
+        return False
+
+    def _build_data_for_response(self) -> dict[str, properties]:
+        self.all_xp_data = [tuple(xp_data) for xp_data in self.all_xp_data]
         return self.build_attr_data_for_response(self._get_properties())
 
     def _get_xp_data_as_dict(self, xp_data: tuple[str, str, str, str]):
@@ -299,19 +264,30 @@ class InputsPageParser(ParserBase):
 
     pattern_input_data = ':D;'
 
-    def parse(self, content: str):
+    def __init__(self, names: Iterable[str] = None):
         """
-        Парсит данные с основной web страницы ДК Peek, присваивая их соответствующим атрибутам.
-        :param get_parsed_data_as_dict: Параметр является опцией.
-                                        При True -> формирует атрибут self.parsed_content_as_dict.
-        :return: None.
+        :param names: Имена входов для парса. Если переданы, парсятся только эти входы, и парс
+                      прекращается, как только найдены все входы. Если не переданы - все входы.
+        """
+        super().__init__()
+        self._names = set(names) if names is not None else None
+
+    def _parse_lines(self, content: str) -> bool:
+        """
+        Парсит данные входов с web страницы входов ДК Peek в self.parsed_content_as_dict.
+        :param content: Строки контента web страницы входов ДК Peek.
+        :return: True, если найдены все входы self._names, иначе False(данные входов
+                 содержатся до конца страницы).
         """
-        self.content_as_list = content.splitlines()
-        for line in self.content_as_list:
+        names = self._names
+        for line in content.splitlines():
             if self.pattern_input_data in line:
                 index, num, name, state, _time, actuator = self.extract_data_from_line(line)
-                self.parsed_content_as_dict[name] = (index, num, name, state, _time, actuator)
-        # print(f'inputs_self.build_data_for_response(): {self.build_attr_data_for_response()}')
+                if names is None or name in names:
+                    self.parsed_content_as_dict[name] = (index, num, name, state, _time, actuator)
+        return names is not None and len(self.parsed_content_as_dict) == len(names)
+
+    def _build_data_for_response(self) -> dict[str, properties]:
         return self.build_attr_data_for_response(
             [(str(FieldsNames.inputs), self.parsed_content_as_dict)]
         )
@@ -330,9 +306,9 @@ if __name__ == '__main__':
     s = ':TITLE;##MENU_001a##\n:SUBTITLE;Moscow: Панфиловс пр / Андреевка\n:TFT_NAVBAR;10\n:REFRESH_LOCK;1\n\n:BEGINTABLE\n:W;;200px;\n\n:D;;##T_PLAN##;005 -             \n\n:D;;##T_TIMINGSET##;005\n\n:D;;##T_TIME##;2025-03-01 16:08:41\n:D;;##T_ALARMS##;ISWC\n\n\n:ENDTABLE\n\n<b>##T_STREAM## 1</b>\n:BEGINTABLE\n:W;;200px;\n:D;;##T_STATE##;УПРАВЛЕНИЕ\n:D;;##T_CYCLE##;0 (0)\n:D;;##T_MODE## (##T_STAGE##);FT (3)\n:ENDTABLE\n\n<b>##T_STREAM## 2</b>\n:BEGINTABLE\n:W;;200px;\n:D;;##T_STATE##;УПРАВЛЕНИЕ\n:D;;##T_CYCLE##;0 (0)\n:D;;##T_MODE## (##T_STAGE##);FT (6)\n:ENDTABLE\n\n\n\n\n\n\n\n\n\n\n\n:BEGIN_TFT_ONLY\n<div id="nav_home">\n<br /><br />\n<ul>\n<li><button type=button OnClick=\'top.doDataHref("cell1370.hvi",1)\'>##CELL_1370##</button></li>\n<li><button type=button OnClick=\'top.doDataHref("cell1240.hvi",1)\'>##CELL_1240##</button></li>\n<li><button type=button OnClick=\'top.doHref("detswico.hvi",1)\'>##T_DETSWICO##</button></li>\n</ul>\n</div>\n:END_TFT_ONLY\n'
 
     start_time = time.perf_counter()
-    o = MainPageParser(s)
+    o = MainPageParser()
 
-    o.parse()
+    o.parse(s)
     print(o)
 
     print(f'Время составило: {time.perf_counter() - start_time:.8f}')
@@ -1,21 +1,29 @@
+import re
 from collections.abc import Callable
 
+from pyasn1.type import univ
+from pysnmp.proto import rfc1902
+
 
 def get_val_as_str(val: int | str) -> str:
     return str(val)
 
+
 def get_val_as_int(val: int | str) -> int | str:
     try:
         return int(val)
     except ValueError:
         return str(val)
 
+
 def pretty_print(oid_or_val) -> str:
     return oid_or_val.prettyPrint()
 
+
 def remove_chars(string, substring_to_remove) -> str:
     return str(string).replace(str(substring_to_remove), '')
 
+
 def build_func_with_remove_scn(scn: str, func: Callable) -> Callable:
     def wrapper_func(*args, **kwargs):
         oid_with_removed_scn = remove_chars(str(args[0]), scn)
@@ -23,6 +31,57 @@ def build_func_with_remove_scn(scn: str, func: Callable) -> Callable:
     return wrapper_func
 
 
+printable_octets_pattern = re.compile(rb'[\x20-\x7e]*')
+
+
+def decode_integer_as_str(val) -> str:
+    """
+    Декодирует целочисленные типы в строку с десятичным числом. Результат совпадает
+    с val.prettyPrint(): callback-функции matches сравнивают значения как строки.
+    """
+    return str(int(val))
+
+
+def decode_octet_string(val) -> str:
+    """
+    Декодирует OctetString в строку. Результат совпадает с val.prettyPrint():
+    строка, если все байты печатаемые ascii символы, иначе '0x' + hex.
+    """
+    octets = val.asOctets()
+    if printable_octets_pattern.fullmatch(octets):
+        return octets.decode('iso-8859-1')
+    return f'0x{octets.hex()}'
+
+
+# Декодеры значений оидов по ASN.1 типу в строку, как pretty_print. Для типов, которых нет в словаре,
+# используется pretty_print
+decoders_by_asn1_type: dict[type, Callable] = {
+    rfc1902.Integer32: decode_integer_as_str,
+    rfc1902.Integer: decode_integer_as_str,
+    rfc1902.Counter32: decode_integer_as_str,
+    rfc1902.Gauge32: decode_integer_as_str,
+    rfc1902.Unsigned32: decode_integer_as_str,
+    rfc1902.TimeTicks: decode_integer_as_str,
+    rfc1902.Counter64: decode_integer_as_str,
+    univ.Integer: decode_integer_as_str,
+    rfc1902.OctetString: decode_octet_string,
+    univ.OctetString: decode_octet_string,
+}
+
+
+def decode_val_by_type(val) -> str:
+    return decoders_by_asn1_type.get(type(val), pretty_print)(val)
+
 
+def get_oid_as_tuple(oid) -> tuple[int, ...]:
+    """
+    Возвращает оид в виде кортежа чисел.
+    :param oid: ObjectIdentity(из ответа pysnmp) или ObjectName.
+    """
+    if isinstance(oid, rfc1902.ObjectName):
+        return oid.asTuple()
+    return oid.get_oid().asTuple()
 
 
+def convert_oid_to_tuple(oid: str) -> tuple[int, ...]:
+    return tuple(int(num) for num in oid.split('.') if num)
@@ -12,7 +12,10 @@ from sdp_lib.management_controllers.parsers.snmp_parsers.mixins import (
 )
 from sdp_lib.management_controllers.parsers.snmp_parsers.processing_methods import (
     get_val_as_str,
-    pretty_print
+    pretty_print,
+    convert_oid_to_tuple,
+    decode_val_by_type,
+    get_oid_as_tuple
 )
 from sdp_lib.management_controllers.snmp.user_types import T_Varbinds
 from sdp_lib.management_controllers.snmp.oids import Oids
@@ -29,6 +32,10 @@ class ConfigsParser(typing.NamedTuple):
     oid_handler: Callable
     val_oid_handler: Callable
     host_protocol: str = None
+    # Если True, varbinds парсятся через BaseSnmpParser.parse_compiled
+    compiled: bool = False
+    # Суффикс оидов из matches в ответе(для ug405 - scn в виде ascii строки)
+    oid_suffix: str = ''
 
 
 default_processing = ConfigsParser(
@@ -41,25 +48,32 @@ pretty_processing_stcip = ConfigsParser(
     extras=True,
     oid_handler=get_val_as_str,
     val_oid_handler=pretty_print,
-    host_protocol=FieldsNames.protocol_stcip
+    host_protocol=FieldsNames.protocol_stcip,
+    compiled=True
 )
 
 default_processing_ug405 = ConfigsParser(
     extras=False,
     oid_handler=get_val_as_str,
     val_oid_handler=pretty_print,
-    host_protocol=FieldsNames.protocol_ug405
+    host_protocol=FieldsNames.protocol_ug405,
+    compiled=True
 )
 
 default_processing_stcip = ConfigsParser(
     extras=False,
     oid_handler=get_val_as_str,
     val_oid_handler=pretty_print,
-    host_protocol=FieldsNames.protocol_stcip
+    host_protocol=FieldsNames.protocol_stcip,
+    compiled=True
 )
 
 class BaseSnmpParser(Parsers):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compiled_matches: dict[str, dict[tuple[int, ...], tuple[FieldsNames, Callable]]] = {}
+
     @property
     @abc.abstractmethod
     def matches(self) -> dict[str | Oids, tuple[FieldsNames, Callable]]:
@@ -81,12 +95,64 @@ class BaseSnmpParser(Parsers):
         for field_name, cb_fn in self.extras_methods.items():
             self.parsed_content_as_dict[field_name] = cb_fn()
 
+    def get_compiled_matches(self, oid_suffix: str = '') -> dict[tuple[int, ...], tuple[FieldsNames, Callable]]:
+        """
+        Возвращает self.matches, в котором ключи преобразованы в оиды в виде кортежа чисел.
+        Каждый оид добавляется как без oid_suffix, так и с oid_suffix.
+        Результат кэшируется для каждого oid_suffix.
+        :param oid_suffix: Суффикс оидов в ответе. Пример для ug405(scn): .1.6.67.79.51.57.57.53
+        :return: Словарь вида {(1, 3, 6, ...): (FieldsNames, Callable)}
+        """
+        try:
+            return self._compiled_matches[oid_suffix]
+        except KeyError:
+            compiled_matches = {}
+            for oid, field_name_and_cb_fn in self.matches.items():
+                compiled_matches[convert_oid_to_tuple(oid)] = field_name_and_cb_fn
+                compiled_matches[convert_oid_to_tuple(f'{oid}{oid_suffix}')] = field_name_and_cb_fn
+            if len(self._compiled_matches) > 8:
+                self._compiled_matches.clear()
+            self._compiled_matches[oid_suffix] = compiled_matches
+            return compiled_matches
+
+    def parse_compiled(
+            self,
+            *,
+            varbinds: T_Varbinds,
+            config: ConfigsParser
+    ):
+        """
+        Парс varbinds без преобразования каждого оида в строку: оиды ищутся в
+        self.get_compiled_matches по кортежу чисел, значения декодируются по ASN.1 типу.
+        Результат совпадает с результатом self.parse для некомпилированного config.
+        """
+        matches = self.get_compiled_matches(config.oid_suffix)
+        for oid, val in varbinds:
+            val = decode_val_by_type(val)
+            field_name_and_cb_fn = matches.get(get_oid_as_tuple(oid))
+            if field_name_and_cb_fn is None:
+                self.parsed_content_as_dict[config.oid_handler(oid)] = val
+                continue
+            field_name, cb_fn = field_name_and_cb_fn
+            try:
+                self.parsed_content_as_dict[field_name] = cb_fn(val)
+            except (TypeError, KeyError):
+                self.parsed_content_as_dict[config.oid_handler(oid)] = val
+        if config.extras:
+            self._add_extras_to_response()
+
+        self.add_host_protocol_to_response(config.host_protocol)
+        self.data_for_response = self.parsed_content_as_dict
+        return self.data_for_response
+
     def parse(
             self,
             *,
             varbinds: T_Varbinds,
             config: ConfigsParser = default_processing
     ):
+        if config.compiled:
+            return self.parse_compiled(varbinds=varbinds, config=config)
         for oid, val in varbinds:
             oid, val = config.oid_handler(oid), config.val_oid_handler(val)
             try:
@@ -0,0 +1,174 @@
+import math
+from typing import Any
+
+from pysnmp.entity.engine import SnmpEngine
+from pysnmp.proto import errind
+
+
+class RttEstimator:
+    """
+    Оценка времени ответа(RTT) хоста и таймаута запроса по алгоритму RFC 6298:
+    сглаженное RTT(EWMA) и его отклонение, RTO = SRTT + K * RTTVAR.
+    Таймаут округляется вверх до шага quantum, чтобы ключи TransportTargetsCache
+    (ip, timeout, retries) не менялись на каждый запрос.
+    После unreachable_threshold таймаутов подряд хост считается недоступным
+    и опрашивается с коротким таймаутом unreachable_timeout до первого ответа.
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(
+            self,
+            *,
+            initial_rto: float = 1,
+            min_rto: float = .2,
+            max_rto: float = 3,
+            quantum: float = .05,
+            unreachable_threshold: int = 3,
+            unreachable_timeout: float = .2
+    ):
+        """
+        :param initial_rto: Таймаут до получения первого ответа, в секундах.
+        :param min_rto: Минимальный таймаут, в секундах.
+        :param max_rto: Максимальный таймаут, в секундах.
+        :param quantum: Шаг округления таймаута, в секундах.
+        :param unreachable_threshold: Количество таймаутов подряд, после которого хост считается недоступным.
+        :param unreachable_timeout: Таймаут запроса к недоступному хосту, в секундах.
+        """
+        self._min_rto = min_rto
+        self._max_rto = max_rto
+        self._quantum = quantum
+        self._unreachable_threshold = unreachable_threshold
+        self._unreachable_timeout = unreachable_timeout
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.rto = initial_rto
+        self.consecutive_timeouts = 0
+        self.samples = 0
+        self.timeouts = 0
+
+    @property
+    def is_unreachable(self) -> bool:
+        return self.consecutive_timeouts >= self._unreachable_threshold
+
+    @property
+    def timeout(self) -> float:
+        """
+        Таймаут следующего запроса к хосту, в секундах.
+        """
+        if self.is_unreachable:
+            return self._unreachable_timeout
+        return self._quantize(self.rto)
+
+    def _quantize(self, value: float) -> float:
+        return round(math.ceil(round(value / self._quantum, 6)) * self._quantum, 6)
+
+    def add_sample(self, rtt: float) -> None:
+        """
+        Обновляет оценку по времени ответа хоста.
+        :param rtt: Время от отправки запроса до получения ответа, в секундах.
+        :return: None
+        """
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.rto = min(max(self.srtt + self.K * self.rttvar, self._min_rto), self._max_rto)
+        self.consecutive_timeouts = 0
+        self.samples += 1
+
+    def add_timeout(self) -> None:
+        """
+        Учитывает таймаут запроса: таймаут следующего запроса удваивается(но не более max_rto).
+        :return: None
+        """
+        self.rto = min(self.rto * 2, self._max_rto)
+        self.consecutive_timeouts += 1
+        self.timeouts += 1
+
+    def add_response(
+            self,
+            error_indication: errind.ErrorIndication | None,
+            rtt: float,
+            retries: int = 0
+    ) -> None:
+        """
+        Учитывает результат snmp-запроса.
+        По алгоритму Карна время ответа на запрос с повторными отправками(retries > 0)
+        не используется для оценки RTT, так как неизвестно, на какую отправку пришёл ответ.
+        :param error_indication: error_indication ответа.
+        :param rtt: Время выполнения запроса, в секундах.
+        :param retries: Количество повторных отправок запроса.
+        :return: None
+        """
+        if isinstance(error_indication, errind.RequestTimedOut):
+            self.add_timeout()
+        elif error_indication is None and retries == 0:
+            self.add_sample(rtt)
+        elif error_indication is None:
+            self.consecutive_timeouts = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'srtt': self.srtt,
+            'rttvar': self.rttvar,
+            'rto': self.rto,
+            'timeout': self.timeout,
+            'consecutive_timeouts': self.consecutive_timeouts,
+            'is_unreachable': self.is_unreachable,
+            'samples': self.samples,
+            'timeouts': self.timeouts,
+        }
+
+
+class RttEstimators:
+    """
+    Оценки RTT хостов, ключ - ipv4 хоста.
+    """
+
+    def __init__(self, **estimator_kwargs):
+        """
+        :param estimator_kwargs: Аргументы RttEstimator для новых хостов.
+        """
+        self._estimator_kwargs = estimator_kwargs
+        self._estimators: dict[str, RttEstimator] = {}
+
+    def __len__(self):
+        return len(self._estimators)
+
+    def get(self, ip: str) -> RttEstimator:
+        """
+        Возвращает оценку RTT хоста. Если оценки нет, создаёт новую.
+        :param ip: ipv4 хоста.
+        :return: Экземпляр RttEstimator.
+        """
+        try:
+            return self._estimators[ip]
+        except KeyError:
+            return self._estimators.setdefault(ip, RttEstimator(**self._estimator_kwargs))
+
+    def remove(self, ip: str) -> None:
+        self._estimators.pop(ip, None)
+
+    def export(self) -> dict[str, dict[str, Any]]:
+        """
+        Возвращает состояние оценок всех хостов для мониторинга.
+        :return: Словарь вида {ipv4: RttEstimator.as_dict()}
+        """
+        return {ip: estimator.as_dict() for ip, estimator in self._estimators.items()}
+
+
+def get_rtt_estimators(engine: SnmpEngine) -> RttEstimators:
+    """
+    Возвращает оценки RTT хостов, принадлежащие engine. Оценки хранятся
+    в engine.cache и создаются при первом обращении.
+    :param engine: SnmpEngine, которому принадлежат оценки.
+    :return: Экземпляр RttEstimators.
+    """
+    try:
+        return engine.cache['sdp_lib_rtt_estimators']
+    except KeyError:
+        return engine.cache.setdefault('sdp_lib_rtt_estimators', RttEstimators())
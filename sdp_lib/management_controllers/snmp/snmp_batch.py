@@ -0,0 +1,291 @@
+import asyncio
+import itertools
+import math
+from collections.abc import Sequence
+
+from pyasn1.codec.ber import (
+    decoder,
+    encoder
+)
+from pyasn1.error import PyAsn1Error
+from pysnmp.entity.engine import SnmpEngine
+from pysnmp.hlapi.varbinds import CommandGeneratorVarBinds
+from pysnmp.proto import errind
+from pysnmp.proto.api import v2c
+from pysnmp.proto.rfc1902 import Integer32
+from pysnmp.smi.rfc1902 import (
+    ObjectIdentity,
+    ObjectType
+)
+from pysnmp.smi.view import MibViewController
+
+
+class _PendingRequest:
+
+    __slots__ = ('future', 'message', 'addr', 'retries_left', 'timeout_ticks', 'expires_at')
+
+    def __init__(
+            self,
+            future: asyncio.Future,
+            message: bytes,
+            addr: tuple[str, int],
+            retries_left: int,
+            timeout_ticks: int
+    ):
+        self.future = future
+        self.message = message
+        self.addr = addr
+        self.retries_left = retries_left
+        self.timeout_ticks = timeout_ticks
+        self.expires_at = 0
+
+
+class BatchSnmpEngine(asyncio.DatagramProtocol):
+    """
+    Отправка snmp v2c get запросов множеству хостов через один UDP сокет.
+    Ответы сопоставляются с запросами по request-id, таймауты запросов
+    обрабатываются колесом таймеров(timer wheel) с шагом tick_interval.
+    Результат запроса имеет тот же вид, что и результат get_cmd:
+    (error_indication, error_status, error_index, var_binds).
+    """
+
+    def __init__(
+            self,
+            *,
+            port: int = 161,
+            tick_interval: float = .01,
+            wheel_size: int = 1024,
+            mib_view_controller: MibViewController = None,
+            lookup_mib: bool = False
+    ):
+        """
+        :param port: Порт snmp агента на хостах.
+        :param tick_interval: Шаг колеса таймеров, в секундах.
+        :param wheel_size: Количество слотов колеса таймеров.
+        :param mib_view_controller: MibViewController для разрешения varbinds запроса и ответа.
+        :param lookup_mib: Если True, varbinds ответа разрешаются через mib_view_controller,
+                           как в get_cmd. Иначе var_binds содержит кортежи (ObjectName, значение),
+                           которые парсеры обрабатывают так же, но без затрат на разрешение через MIB.
+        """
+        self._port = port
+        self._tick_interval = tick_interval
+        self._wheel: list[set[int]] = [set() for _ in range(wheel_size)]
+        self._mib_view_controller = mib_view_controller or CommandGeneratorVarBinds.get_mib_view_controller({})
+        self._lookup_mib = lookup_mib
+        self._request_ids = itertools.count(1)
+        self._pending: dict[int, _PendingRequest] = {}
+        self._transport: asyncio.DatagramTransport | None = None
+        self._open_lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._start_time = 0.
+        self._last_tick = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def is_open(self) -> bool:
+        return self._transport is not None
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def connection_lost(self, exc):
+        self._transport = None
+        self._fail_all_pending(errind.RequestTimedOut('Socket closed'))
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]):
+        try:
+            message, _ = decoder.decode(data, asn1Spec=v2c.Message())
+        except PyAsn1Error:
+            return
+        pdu = v2c.apiMessage.get_pdu(message)
+        request_id = int(v2c.apiPDU.get_request_id(pdu))
+        pending = self._pending.get(request_id)
+        if pending is None or pending.addr[0] != addr[0]:
+            return
+        del self._pending[request_id]
+        if pending.future.done():
+            return
+        var_binds = v2c.apiPDU.get_varbinds(pdu)
+        if self._lookup_mib:
+            var_binds = tuple(
+                ObjectType(ObjectIdentity(oid), val).resolve_with_mib(self._mib_view_controller)
+                for oid, val in var_binds
+            )
+        else:
+            var_binds = tuple(var_binds)
+        pending.future.set_result((
+            None,
+            v2c.apiPDU.get_error_status(pdu),
+            v2c.apiPDU.get_error_index(pdu, muteErrors=True),
+            var_binds
+        ))
+
+    def error_received(self, exc):
+        """ Ошибки ICMP(например, port unreachable) не привязаны к request-id, запрос завершится по таймауту. """
+
+    async def open(self) -> None:
+        """
+        Открывает UDP сокет. Вызывается автоматически при первом запросе.
+        :return: None
+        """
+        async with self._open_lock:
+            if self._transport is not None:
+                return
+            loop = asyncio.get_running_loop()
+            await loop.create_datagram_endpoint(lambda: self, local_addr=('0.0.0.0', 0))
+            self._start_time = loop.time()
+            self._last_tick = 0
+
+    def close(self) -> None:
+        """
+        Закрывает UDP сокет. Незавершённые запросы завершаются с ошибкой.
+        :return: None
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._transport is not None:
+            self._transport.close()
+
+    def _fail_all_pending(self, error_indication: errind.ErrorIndication) -> None:
+        for pending in self._pending.values():
+            if not pending.future.done():
+                pending.future.set_result((error_indication, 0, 0, ()))
+        self._pending.clear()
+        for slot in self._wheel:
+            slot.clear()
+
+    def _get_current_tick(self) -> int:
+        return int((asyncio.get_running_loop().time() - self._start_time) / self._tick_interval)
+
+    def _schedule_timeout(self, request_id: int, pending: _PendingRequest) -> None:
+        pending.expires_at = self._get_current_tick() + pending.timeout_ticks
+        self._wheel[pending.expires_at % len(self._wheel)].add(request_id)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._tick_interval, self._on_tick)
+
+    def _on_tick(self) -> None:
+        """
+        Обрабатывает слоты колеса таймеров с последнего обработанного шага до текущего.
+        Запросы, у которых истёк таймаут, отправляются повторно или завершаются
+        с ошибкой RequestTimedOut.
+        """
+        self._timer = None
+        current_tick = self._get_current_tick()
+        ticks_to_process = min(current_tick - self._last_tick, len(self._wheel))
+        for tick in range(current_tick - ticks_to_process + 1, current_tick + 1):
+            slot = self._wheel[tick % len(self._wheel)]
+            for request_id in list(slot):
+                pending = self._pending.get(request_id)
+                if pending is None:
+                    slot.discard(request_id)
+                elif pending.expires_at <= current_tick:
+                    slot.discard(request_id)
+                    self._process_timeout(request_id, pending)
+        self._last_tick = current_tick
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self._tick_interval, self._on_tick)
+
+    def _process_timeout(self, request_id: int, pending: _PendingRequest) -> None:
+        if pending.future.done():
+            del self._pending[request_id]
+        elif pending.retries_left > 0 and self._transport is not None:
+            pending.retries_left -= 1
+            self._transport.sendto(pending.message, pending.addr)
+            self._schedule_timeout(request_id, pending)
+        else:
+            del self._pending[request_id]
+            pending.future.set_result((errind.requestTimedOut, 0, 0, ()))
+
+    def _get_next_request_id(self) -> int:
+        request_id = next(self._request_ids)
+        if request_id >= 2 ** 31 - 1:
+            self._request_ids = itertools.count(1)
+        return request_id
+
+    def _build_message(self, request_id: int, community: str, varbinds: Sequence[ObjectType]) -> bytes:
+        pdu = v2c.GetRequestPDU()
+        v2c.apiPDU.set_defaults(pdu)
+        v2c.apiPDU.set_request_id(pdu, request_id)
+        v2c.apiPDU.set_varbinds(
+            pdu,
+            [(varbind.resolve_with_mib(self._mib_view_controller)[0].get_oid(), v2c.null) for varbind in varbinds]
+        )
+        message = v2c.Message()
+        v2c.apiMessage.set_defaults(message)
+        v2c.apiMessage.set_community(message, community)
+        v2c.apiMessage.set_pdu(message, pdu)
+        return encoder.encode(message)
+
+    async def get(
+            self,
+            ip_v4: str,
+            community: str,
+            varbinds: Sequence[ObjectType],
+            timeout: float = 1,
+            retries: int = 0
+    ) -> tuple[errind.ErrorIndication, Integer32 | int, Integer32 | int, tuple[ObjectType, ...]]:
+        """
+        Отправляет snmp v2c get запрос хосту ip_v4.
+        :param ip_v4: ipv4 хоста.
+        :param community: Коммьюнити хоста.
+        :param varbinds: Оиды запроса, обёрнутые ObjectType.
+        :param timeout: Таймаут запроса, в секундах.
+        :param retries: Количество повторных отправок запроса после таймаута.
+        :return: tuple вида (error_indication, error_status, error_index, var_binds), как у get_cmd.
+        """
+        if self._transport is None:
+            await self.open()
+        request_id = self._get_next_request_id()
+        pending = _PendingRequest(
+            future=asyncio.get_running_loop().create_future(),
+            message=self._build_message(request_id, community, varbinds),
+            addr=(ip_v4, self._port),
+            retries_left=retries,
+            timeout_ticks=max(1, math.ceil(timeout / self._tick_interval))
+        )
+        self._pending[request_id] = pending
+        self._transport.sendto(pending.message, pending.addr)
+        self._schedule_timeout(request_id, pending)
+        try:
+            return await pending.future
+        finally:
+            self._pending.pop(request_id, None)
+
+
+def get_batch_engine(engine: SnmpEngine) -> BatchSnmpEngine | None:
+    """
+    Возвращает BatchSnmpEngine, принадлежащий engine, если для engine включён
+    режим пакетной отправки запросов(enable_batch_mode), иначе None.
+    :param engine: SnmpEngine хостов.
+    :return: Экземпляр BatchSnmpEngine или None.
+    """
+    return engine.cache.get('sdp_lib_batch_engine')
+
+
+def enable_batch_mode(engine: SnmpEngine, **kwargs) -> BatchSnmpEngine:
+    """
+    Включает для engine режим пакетной отправки запросов: snmp-get запросы
+    SnmpRequests хостов с этим engine будут отправляться через один UDP сокет.
+    :param engine: SnmpEngine хостов.
+    :param kwargs: Аргументы BatchSnmpEngine.
+    :return: Экземпляр BatchSnmpEngine, принадлежащий engine.
+    """
+    batch_engine = get_batch_engine(engine)
+    if batch_engine is None:
+        kwargs.setdefault('mib_view_controller', CommandGeneratorVarBinds.get_mib_view_controller(engine.cache))
+        batch_engine = engine.cache['sdp_lib_batch_engine'] = BatchSnmpEngine(**kwargs)
+    return batch_engine
+
+
+def disable_batch_mode(engine: SnmpEngine) -> None:
+    """
+    Отключает для engine режим пакетной отправки запросов и закрывает сокет.
+    :param engine: SnmpEngine хостов.
+    :return: None
+    """
+    batch_engine = engine.cache.pop('sdp_lib_batch_engine', None)
+    if batch_engine is not None:
+        batch_engine.close()
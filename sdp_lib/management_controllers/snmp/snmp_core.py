@@ -6,6 +6,10 @@ from typing import Self, TypeVar, Any
 from collections.abc import Callable
 
 from pysnmp.entity.engine import SnmpEngine
+from pysnmp.proto.rfc1905 import (
+    NoSuchInstance,
+    NoSuchObject
+)
 
 from sdp_lib.management_controllers.exceptions import BadControllerType
 from sdp_lib.management_controllers.hosts_core import Host
@@ -32,7 +36,11 @@ from sdp_lib.management_controllers.snmp import (
 )
 from sdp_lib.management_controllers.structures import SnmpResponseStructure
 from sdp_lib.management_controllers.snmp.set_commands import SnmpEntity
-from sdp_lib.management_controllers.snmp.snmp_utils import ScnConverterMixin
+from sdp_lib.management_controllers.snmp.snmp_utils import (
+    ScnConverterMixin,
+    ScnCache,
+    ug405_scn_cache
+)
 from sdp_lib.management_controllers.snmp.snmp_requests import SnmpRequests
 from sdp_lib.management_controllers.snmp.snmp_utils import (
     swarco_stcip_varbinds,
@@ -190,6 +198,11 @@ class SnmpHosts(Host):
 
 class Ug405Hosts(SnmpHosts, ScnConverterMixin):
 
+    scn_cache: ScnCache = ug405_scn_cache
+
+    # errorStatus noSuchName(SNMPv1)
+    no_such_name_error_status = 2
+
     def __init__(
             self,
             *,
@@ -201,6 +214,8 @@ class Ug405Hosts(SnmpHosts, ScnConverterMixin):
         super().__init__(ipv4=ipv4, engine=engine, host_id=host_id)
         self.scn_as_chars = scn
         self.scn_as_ascii_string = self._get_scn_as_ascii_from_scn_as_chars_attr()
+        # True на время запроса с scn из кэша(self._collect_data_and_send_snmp_request_ug405)
+        self._request_with_cached_scn = False
 
     @property
     def snmp_config(self) -> HostSnmpConfig:
@@ -223,20 +238,56 @@ class Ug405Hosts(SnmpHosts, ScnConverterMixin):
         иначе False.
         """
 
-    async def _get_dependency_data_and_add_error_if_has(self):
+    def _check_snmp_response_errors_and_add_to_host_data_if_has(self):
+        """
+        Если запрос отправлен с scn из кэша и ответ соответствует неактуальному scn
+        (self._is_stale_scn_response), ответ не разбирается: запрос будет повторён
+        с актуальным scn. Иначе ответ проверяется как у остальных snmp-хостов.
+        """
+        if super()._check_snmp_response_errors_and_add_to_host_data_if_has():
+            return True
+        return self._request_with_cached_scn and self._is_stale_scn_response()
+
+    def _is_stale_scn_response(self) -> bool:
+        """
+        Проверяет, что ответ соответствует запросу с неактуальным scn: errorStatus noSuchName
+        или значения noSuchInstance/noSuchObject в varbinds.
+        :return: True, если ответ получен для несуществующих oid, иначе False.
+        """
+        if self.last_response[SnmpResponseStructure.ERROR_INDICATION] is not None:
+            return False
+        if self.last_response[SnmpResponseStructure.ERROR_STATUS] == self.no_such_name_error_status:
+            return True
+        return any(
+            isinstance(val, (NoSuchInstance, NoSuchObject))
+            for _, val in self.last_response[SnmpResponseStructure.VAR_BINDS]
+        )
+
+    async def _get_dependency_data_and_add_error_if_has(self, use_scn_cache: bool = True) -> bool:
         """
         Получает и обрабатывает зависимость для snmp-запросов.
         В данной реализации получение scn и установка в соответствующие атрибуты.
+        Если scn хоста есть в self.scn_cache, запрос не отправляется.
+        :param use_scn_cache: Если False, scn будет получен запросом к хосту в любом случае.
+        :return: True, если scn взят из кэша, иначе False.
         """
 
+        if use_scn_cache:
+            cached_scn = self.scn_cache.get(self.ip_v4)
+            if cached_scn is not None:
+                self.scn_as_chars, self.scn_as_ascii_string = cached_scn
+                return True
+
         self.last_response = await self._method_for_get_scn(varbinds=[CommonVarbindsUg405.site_id_varbind])
 
         if self._check_snmp_response_errors_and_add_to_host_data_if_has():
-            return
+            return False
         try:
             self._set_scn_from_response()
+            self.scn_cache.add(self.ip_v4, self.scn_as_chars, self.scn_as_ascii_string)
         except BadControllerType as e:
             self.add_data_to_data_response_attrs(e)
+        return False
 
     async def _collect_data_and_send_snmp_request_ug405(
             self,
@@ -245,12 +296,18 @@ class Ug405Hosts(SnmpHosts, ScnConverterMixin):
             varbinds_generate_method: Callable,
             value: int | str = None,
             parse_method: Callable = None,
+            use_scn_cache: bool = True
     ):
         """
         Основной метод-драйвер для формирования snmp запроса.
+        Если get-запрос с scn из кэша получил noSuchName/noSuchInstance(self._is_stale_scn_response),
+        scn удаляется из кэша и запрос повторяется с предварительным получением актуального scn.
+        Перед set-запросом scn всегда запрашивается у хоста: запись с неактуальным scn
+        не повторяется, так как часть set-запросов(utcType2OperationMode) уже могла быть выполнена.
         """
 
-        await self._get_dependency_data_and_add_error_if_has()
+        is_set_request = method == self._request_sender.snmp_set
+        scn_from_cache = await self._get_dependency_data_and_add_error_if_has(use_scn_cache and not is_set_request)
         if self.response_errors:
             return self
 
@@ -260,7 +317,7 @@ class Ug405Hosts(SnmpHosts, ScnConverterMixin):
                 method=method
             )
             # self.set_varbinds_for_request(varbinds_generate_method(self.scn_as_ascii_string))
-        elif method == self._request_sender.snmp_set:
+        elif is_set_request:
 
             if self._operation_mode_dependency:
                 await self.set_operation_mode3_across_operation_mode2()
@@ -279,7 +336,23 @@ class Ug405Hosts(SnmpHosts, ScnConverterMixin):
         else:
             self._parse_method_config = self._get_default_processed_config()
 
-        return await self._make_request_and_build_response()
+        self._request_with_cached_scn = scn_from_cache
+        try:
+            await self._make_request_and_build_response()
+        finally:
+            self._request_with_cached_scn = False
+        if scn_from_cache and self._is_stale_scn_response():
+            self.scn_cache.invalidate(self.ip_v4)
+            self.remove_errors_from_response()
+            self.remove_data_from_response()
+            return await self._collect_data_and_send_snmp_request_ug405(
+                method=method,
+                varbinds_generate_method=varbinds_generate_method,
+                value=value,
+                parse_method=parse_method,
+                use_scn_cache=False
+            )
+        return self
 
     async def get_states(self) -> Self:
         """
@@ -397,7 +470,9 @@ class Ug405Hosts(SnmpHosts, ScnConverterMixin):
             extras=True,
             oid_handler=build_func_with_remove_scn(self.scn_as_ascii_string, get_val_as_str),
             val_oid_handler=pretty_print,
-            host_protocol=FieldsNames.protocol_ug405
+            host_protocol=FieldsNames.protocol_ug405,
+            compiled=True,
+            oid_suffix=self.scn_as_ascii_string
         )
 
     def _get_default_processed_config(self):
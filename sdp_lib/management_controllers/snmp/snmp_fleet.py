@@ -0,0 +1,179 @@
+import asyncio
+import time
+from collections.abc import (
+    AsyncIterator,
+    Iterable
+)
+from typing import TypeAlias
+
+from pysnmp.entity.engine import SnmpEngine
+
+from sdp_lib.management_controllers.constants import AllowedControllers
+from sdp_lib.management_controllers.exceptions import BadControllerType
+from sdp_lib.management_controllers.snmp.rtt_estimator import (
+    RttEstimators,
+    get_rtt_estimators
+)
+from sdp_lib.management_controllers.snmp.snmp_batch import (
+    disable_batch_mode,
+    enable_batch_mode,
+    get_batch_engine
+)
+from sdp_lib.management_controllers.state_store import StateStore
+from sdp_lib.management_controllers.snmp.snmp_core import (
+    SnmpHosts,
+    SwarcoStcip,
+    PotokS,
+    PotokP,
+    PeekUg405
+)
+
+
+T_HostRecord: TypeAlias = tuple[AllowedControllers | str, str, str | int]
+
+
+class FleetPoller:
+    """
+    Опрос текущего состояния(get_states) большого количества дорожных контроллеров по snmp.
+    Все хосты используют один SnmpEngine, объекты хостов создаются один раз и переиспользуются
+    между циклами опроса. Количество одновременных запросов ограничено max_concurrent.
+    """
+
+    matches_type_controller_to_host_class: dict[str, type[SnmpHosts]] = {
+        AllowedControllers.SWARCO: SwarcoStcip,
+        AllowedControllers.POTOK_S: PotokS,
+        AllowedControllers.POTOK_P: PotokP,
+        AllowedControllers.PEEK: PeekUg405,
+    }
+
+    def __init__(
+            self,
+            hosts: Iterable[T_HostRecord] = None,
+            *,
+            engine: SnmpEngine = None,
+            max_concurrent: int = 200,
+            batch: bool = False,
+            state_store: StateStore = None
+    ):
+        """
+        :param hosts: Записи хостов вида (тип контроллера, ipv4, host_id).
+                      Пример: [('Swarco', '10.179.14.185', '3281'), ('Поток (P)', '10.179.63.241', '2600')]
+        :param engine: Общий для всех хостов SnmpEngine. Если не передан, будет создан новый.
+        :param max_concurrent: Максимальное количество одновременно выполняемых запросов.
+        :param batch: Если True, snmp-get запросы всех хостов отправляются через
+                      один UDP сокет(snmp_batch.BatchSnmpEngine).
+        :param state_store: Хранилище состояний. Если передано, после опроса каждого
+                            хоста его состояние обновляется в state_store.
+        """
+        if max_concurrent < 1:
+            raise ValueError(f'Значение max_concurrent должно быть больше 0, передано: {max_concurrent}')
+        self._engine = engine or SnmpEngine()
+        self._max_concurrent = max_concurrent
+        self._state_store = state_store
+        # True, если режим пакетной отправки включён этим FleetPoller и отключается в self.close()
+        self._owns_batch = batch and get_batch_engine(self._engine) is None
+        if batch:
+            enable_batch_mode(self._engine)
+        self._hosts: dict[tuple[str, str], SnmpHosts] = {}
+        self.last_cycle_time: float | None = None
+        if hosts is not None:
+            self.add_hosts(hosts)
+
+    def __len__(self):
+        return len(self._hosts)
+
+    @property
+    def engine(self) -> SnmpEngine:
+        return self._engine
+
+    @property
+    def rtt_estimators(self) -> RttEstimators:
+        """ Оценки RTT хостов. Состояние для мониторинга: self.rtt_estimators.export() """
+        return get_rtt_estimators(self._engine)
+
+    @property
+    def state_store(self) -> StateStore | None:
+        return self._state_store
+
+    @property
+    def hosts(self) -> list[SnmpHosts]:
+        return list(self._hosts.values())
+
+    def _create_host(self, type_controller: str, ipv4: str, host_id: str | int) -> SnmpHosts:
+        try:
+            host_class = self.matches_type_controller_to_host_class[type_controller]
+        except KeyError:
+            raise BadControllerType(type_controller)
+        return host_class(ipv4=ipv4, host_id=host_id, engine=self._engine)
+
+    def add_hosts(self, hosts: Iterable[T_HostRecord]) -> None:
+        """
+        Добавляет хосты для опроса. Повторно переданный хост с тем же
+        типом контроллера и ipv4 заменяет ранее добавленный.
+        :param hosts: Записи хостов вида (тип контроллера, ipv4, host_id).
+        :return: None
+        """
+        for type_controller, ipv4, host_id in hosts:
+            self._hosts[(type_controller, ipv4)] = self._create_host(type_controller, ipv4, host_id)
+
+    def remove_hosts(self, hosts: Iterable[T_HostRecord]) -> None:
+        """
+        Удаляет хосты из опроса.
+        :param hosts: Записи хостов вида (тип контроллера, ipv4, host_id).
+        :return: None
+        """
+        for type_controller, ipv4, _ in hosts:
+            self._hosts.pop((type_controller, ipv4), None)
+
+    async def _get_states(self, host: SnmpHosts, semaphore: asyncio.Semaphore) -> SnmpHosts:
+        """
+        Опрашивает хост. Исключение при опросе записывается в ошибки хоста,
+        чтобы ошибка одного ДК не прерывала цикл опроса остальных.
+        :param host: Опрашиваемый хост.
+        :param semaphore: Семафор, ограничивающий количество одновременных запросов.
+        :return: Опрошенный хост.
+        """
+        async with semaphore:
+            host.remove_errors_from_response()
+            host.remove_data_from_response()
+            try:
+                await host.get_states()
+            except Exception as exc:
+                host.add_data_to_data_response_attrs(exc)
+        if self._state_store is not None:
+            self._state_store.update(host)
+        return host
+
+    async def poll(self) -> AsyncIterator[SnmpHosts]:
+        """
+        Выполняет один цикл опроса всех хостов и отдаёт хосты по мере
+        получения ответа от каждого из них(в порядке завершения запросов).
+        :return: Асинхронный итератор по опрошенным хостам.
+        """
+        start_time = time.perf_counter()
+        semaphore = asyncio.Semaphore(self._max_concurrent)
+        tasks = [asyncio.create_task(self._get_states(host, semaphore)) for host in self._hosts.values()]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.last_cycle_time = time.perf_counter() - start_time
+
+    def close(self) -> None:
+        """
+        Закрывает UDP сокет режима пакетной отправки запросов, если он был включён этим FleetPoller.
+        Режим пакетной отправки, включённый для переданного engine ранее, не отключается.
+        :return: None
+        """
+        if self._owns_batch:
+            disable_batch_mode(self._engine)
+            self._owns_batch = False
+
+    async def poll_all(self) -> list[SnmpHosts]:
+        """
+        Выполняет один цикл опроса всех хостов.
+        :return: Список опрошенных хостов в порядке завершения запросов.
+        """
+        return [host async for host in self.poll()]
@@ -1,13 +1,105 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from typing import KeysView, Any, TypeVar
 
 from pysnmp.hlapi.v3arch.asyncio import *
 from pysnmp.proto import errind, rfc1905
 
+from sdp_lib.management_controllers.circuit_breaker import (
+    CircuitBreaker,
+    snmp_circuit_breaker
+)
 from sdp_lib.management_controllers.snmp.oids import Oids
+from sdp_lib.management_controllers.snmp.rtt_estimator import (
+    RttEstimator,
+    get_rtt_estimators
+)
+from sdp_lib.management_controllers.snmp.snmp_batch import get_batch_engine
 
 snmp_engine = SnmpEngine()
 
 
+class TransportTargetsCache:
+    """
+    Кэш UdpTransportTarget с вытеснением по времени жизни(ttl) и по давности использования(LRU).
+    Ключ кэша: (ip, retries). Позволяет не создавать транспорт(и не резолвить адрес)
+    на каждый snmp-запрос к одному и тому же хосту. Таймаут не входит в ключ, так как
+    меняется вместе с оценкой RTT хоста(RttEstimator.timeout): он устанавливается
+    транспорту из кэша при каждом вызове self.get.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 600):
+        """
+        :param maxsize: Максимальное количество транспортов в кэше.
+        :param ttl: Время жизни транспорта в кэше, в секундах.
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._targets: OrderedDict[tuple[str, int], tuple[UdpTransportTarget, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._targets)
+
+    async def get(self, ip: str, timeout: float, retries: int) -> UdpTransportTarget:
+        """
+        Возвращает транспорт из кэша с установленным таймаутом timeout. Если транспорта
+        нет в кэше или истекло время его жизни, создаёт новый и добавляет в кэш.
+        Таймаут транспорта считывается pysnmp при вызове get_cmd/set_cmd/next_cmd до первого
+        переключения задач, поэтому один транспорт может использоваться одновременными
+        запросами с разными таймаутами.
+        :param ip: ipv4 хоста.
+        :param timeout: Таймаут запроса, в секундах.
+        :param retries: Количество попыток запроса.
+        :return: Экземпляр UdpTransportTarget.
+        """
+        key = (ip, retries)
+        try:
+            target, created = self._targets[key]
+            if time.monotonic() - created < self._ttl:
+                self._targets.move_to_end(key)
+                self.hits += 1
+                target.timeout = timeout
+                return target
+        except KeyError:
+            pass
+
+        self.misses += 1
+        target = await UdpTransportTarget.create((ip, 161), timeout=timeout, retries=retries)
+        self._targets[key] = target, time.monotonic()
+        self._targets.move_to_end(key)
+        while len(self._targets) > self._maxsize:
+            self._targets.popitem(last=False)
+        return target
+
+    def invalidate(self, ip: str = None) -> None:
+        """
+        Удаляет транспорты хоста ip из кэша. Если ip не передан, очищает кэш полностью.
+        :param ip: ipv4 хоста.
+        :return: None
+        """
+        if ip is None:
+            self._targets.clear()
+            return
+        for key in [k for k in self._targets if k[0] == ip]:
+            del self._targets[key]
+
+
+def get_transport_targets_cache(engine: SnmpEngine) -> TransportTargetsCache:
+    """
+    Возвращает кэш транспортов, принадлежащий engine. Кэш хранится
+    в engine.cache и создаётся при первом обращении.
+    :param engine: SnmpEngine, которому принадлежит кэш.
+    :return: Экземпляр TransportTargetsCache.
+    """
+    try:
+        return engine.cache['sdp_lib_transport_targets']
+    except KeyError:
+        return engine.cache.setdefault('sdp_lib_transport_targets', TransportTargetsCache())
+
+
 async def get(
         ip_v4: str,
         community: str,
@@ -43,7 +135,7 @@ async def get(
     return await get_cmd(
         engine,
         CommunityData(community),
-        await UdpTransportTarget.create((ip_v4, 161), timeout=timeout, retries=retries),
+        await get_transport_targets_cache(engine).get(ip_v4, timeout, retries),
         ContextData(),
         *[ObjectType(ObjectIdentity(oid), rfc1905.unSpecified) for oid in oids]
     )
@@ -60,7 +152,7 @@ async def snmp_get_next(
     return await next_cmd(
         engine,
         CommunityData(community),
-        await UdpTransportTarget.create((ip_v4, 161), timeout=timeout, retries=retries),
+        await get_transport_targets_cache(engine).get(ip_v4, timeout, retries),
         ContextData(),
         *[ObjectType(ObjectIdentity(oid)) for oid in oids]
     )
@@ -87,6 +179,8 @@ async def snmp_set(
 
 class SnmpRequests:
 
+    circuit_breaker: CircuitBreaker = snmp_circuit_breaker
+
     def __init__(self, instance):
         self._instance_host = instance
         self.ip = instance._ipv4
@@ -94,16 +188,69 @@ class SnmpRequests:
         self.community_w = instance.snmp_config.community_w
         # self.engine = instance._driver
 
+    @property
+    def engine(self) -> SnmpEngine:
+        return self._instance_host.driver or snmp_engine
+
+    async def _get_transport_target(self, timeout: float, retries: int) -> UdpTransportTarget:
+        return await get_transport_targets_cache(self.engine).get(self._instance_host.ip_v4, timeout, retries)
+
+    @property
+    def rtt_estimator(self) -> RttEstimator:
+        return get_rtt_estimators(self.engine).get(self._instance_host.ip_v4)
+
+    async def _send_request(
+            self,
+            request_method: Callable,
+            community: str,
+            varbinds: list[ObjectType] | tuple[ObjectType, ...],
+            timeout: float | None,
+            retries: int
+    ) -> tuple[errind.ErrorIndication, Integer32 | int, Integer32 | int, tuple[ObjectType, ...]]:
+        """
+        Отправляет запрос request_method(get_cmd, set_cmd, next_cmd) и обновляет оценку RTT хоста.
+        Если timeout не передан, используется таймаут из оценки RTT хоста(self.rtt_estimator).
+        Если цепь хоста в self.circuit_breaker разомкнута, запрос не отправляется и
+        сразу возвращается последняя ошибка подключения: (error, 0, 0, ()).
+        """
+        ip = self._instance_host.ip_v4
+        if not self.circuit_breaker.allow_request(ip):
+            return self.circuit_breaker.get_error(ip), 0, 0, ()
+
+        rtt_estimator = self.rtt_estimator
+        if timeout is None:
+            timeout = rtt_estimator.timeout
+        start_time = time.monotonic()
+        batch_engine = get_batch_engine(self.engine) if request_method is get_cmd else None
+        if batch_engine is not None:
+            response = await batch_engine.get(self._instance_host.ip_v4, community, varbinds, timeout, retries)
+        else:
+            response = await request_method(
+                self.engine,
+                CommunityData(community),
+                await self._get_transport_target(timeout, retries),
+                ContextData(),
+                *varbinds
+            )
+        rtt_estimator.add_response(response[0], time.monotonic() - start_time, retries)
+        if isinstance(response[0], errind.RequestTimedOut):
+            self.circuit_breaker.record_failure(ip, response[0])
+        elif response[0] is None:
+            self.circuit_breaker.record_success(ip)
+        return response
+
     async def snmp_get(
             self,
             varbinds: list[ObjectType] | tuple[ObjectType],
-            timeout: float = 1,
+            timeout: float = None,
             retries: int = 0
     ) -> tuple[errind.ErrorIndication, Integer32 | int, Integer32 | int, tuple[ObjectType, ...]]:
         """
         Метод get запросов по snmp v2 протоколу.
+        Если для engine хоста включён режим пакетной отправки(snmp_batch.enable_batch_mode),
+        запрос отправляется через общий для всех хостов UDP сокет BatchSnmpEngine.
         :param oids: список oids, которые будут отправлены в get запросе.
-        :param timeout: таймаут запроса, в секундах.
+        :param timeout: таймаут запроса, в секундах. Если None, таймаут берётся из оценки RTT хоста.
         :param retries: количество попыток запроса.
         :return: tuple вида (error_indication, error_status, error_index, var_binds)
                  error_indication -> errind.ErrorIndication, если есть ошибка в запросе/ответе,
@@ -125,13 +272,7 @@ class SnmpRequests:
         ******************************
         """
         # print(f'oids: {oids}')
-        return await get_cmd(
-            self._instance_host.driver or snmp_engine,
-            CommunityData(self.community_r),
-            await UdpTransportTarget.create((self._instance_host.ip_v4, 161), timeout=timeout, retries=retries),
-            ContextData(),
-            *varbinds
-        )
+        return await self._send_request(get_cmd, self.community_r, varbinds, timeout, retries)
         # print(f'error_indication: {error_indication}\n'
         #       f'error_status: {error_status}\n'
         #       f'error_index: {error_index}\n'
@@ -142,30 +283,22 @@ class SnmpRequests:
     async def snmp_set(
             self,
             varbinds: tuple[ObjectType, ...] | list[ObjectType],
-            timeout: float = 1,
+            timeout: float = None,
             retries: int = 0
     ) -> tuple[errind.ErrorIndication, Integer32 | int, Integer32 | int, tuple[ObjectType, ...]]:
 
-        return await set_cmd(
-            self._instance_host.driver or snmp_engine,
-            CommunityData(self.community_w),
-            await UdpTransportTarget.create((self.ip, 161), timeout=timeout, retries=retries),
-            ContextData(),
-            *varbinds
-            # *[ObjectType(ObjectIdentity(oid), val) for oid, val in oids]
-            # *[ObjectType(ObjectIdentity('1.3.6.1.4.1.1618.3.7.2.11.1.0'), Unsigned32('2')) for oid, val in oids]
-        )
+        return await self._send_request(set_cmd, self.community_w, varbinds, timeout, retries)
 
     async def snmp_get_next(
             self,
             varbinds: list[ObjectType] | tuple[ObjectType],
-            timeout: float = 1,
+            timeout: float = None,
             retries: int = 0
     ) -> tuple[errind.ErrorIndication, Integer32 | int, Integer32 | int, tuple[ObjectType, ...]]:
         """
         Метод get запросов по snmp v2 протоколу.
         :param oids: список oids, которые будут отправлены в get запросе.
-        :param timeout: таймаут запроса, в секундах.
+        :param timeout: таймаут запроса, в секундах. Если None, таймаут берётся из оценки RTT хоста.
         :param retries: количество попыток запроса.
         :return: tuple вида (error_indication, error_status, error_index, var_binds)
                  error_indication -> errind.ErrorIndication, если есть ошибка в запросе/ответе,
@@ -187,13 +320,7 @@ class SnmpRequests:
         ******************************
         """
         # print(f'oids: {oids}')
-        return await next_cmd(
-            self._instance_host.driver or snmp_engine,
-            CommunityData(self.community_r),
-            await UdpTransportTarget.create((self.ip, 161), timeout=timeout, retries=retries),
-            ContextData(),
-            *varbinds
-        )
+        return await self._send_request(next_cmd, self.community_r, varbinds, timeout, retries)
         # print(f'error_indication: {error_indication}\n'
         #       f'error_status: {error_status}\n'
         #       f'error_index: {error_index}\n'
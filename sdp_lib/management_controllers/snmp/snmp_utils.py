@@ -1,5 +1,7 @@
 import logging
 import math
+import time
+from collections import OrderedDict
 from collections.abc import Iterable
 from typing import Type
 
@@ -116,6 +118,57 @@ def create_varbinds_get_state_with_scn(
         )
     return varbinds_get_state
 
+
+class ScnVarbindsCache:
+    """
+    Ленивый кэш varbinds с scn с вытеснением по давности использования(LRU).
+    Ключ кэша: scn в виде ascii строки, значение: varbinds для oids_pattern с добавленным scn.
+    Varbinds для scn создаются при первом обращении, а не для всех возможных scn заранее.
+    """
+
+    def __init__(self, oids_pattern: T_Oids, maxsize: int = 1024):
+        """
+        :param oids_pattern: Оиды, к которым добавляется scn.
+        :param maxsize: Максимальное количество наборов varbinds в кэше.
+        """
+        self._oids_pattern = oids_pattern
+        self._maxsize = maxsize
+        self._varbinds: OrderedDict[str, T_Varbinds] = OrderedDict()
+
+    def __len__(self):
+        return len(self._varbinds)
+
+    def __contains__(self, scn_as_ascii: str):
+        return scn_as_ascii in self._varbinds
+
+    def get(self, scn_as_ascii: str) -> T_Varbinds:
+        """
+        Возвращает varbinds для scn. Если varbinds нет в кэше, создаёт их и добавляет в кэш.
+        :param scn_as_ascii: scn в виде ascii строки. Пример: .1.6.67.79.51.57.57.53
+        :return: Кортеж varbinds.
+        """
+        try:
+            self._varbinds.move_to_end(scn_as_ascii)
+            return self._varbinds[scn_as_ascii]
+        except KeyError:
+            pass
+
+        varbinds = add_scn_to_oids(scn_as_ascii, self._oids_pattern, wrap_oids_by_object_type=True, container=tuple)
+        self._varbinds[scn_as_ascii] = varbinds
+        while len(self._varbinds) > self._maxsize:
+            self._varbinds.popitem(last=False)
+        return varbinds
+
+    def warm_up(self, scns_as_chars: Iterable[str]) -> None:
+        """
+        Заранее создаёт varbinds для известных scn.
+        :param scns_as_chars: scn в виде символов. Пример: ['CO3995', 'CO1']
+        :return: None
+        """
+        for scn_as_chars in scns_as_chars:
+            self.get(convert_chars_string_to_ascii_string(scn_as_chars))
+
+
 oid_vals_stages_6_and_7_hex = {' ', '@'}
 
 def convert_val_as_hex_to_decimal(val: str) -> int | None:
@@ -218,6 +271,53 @@ class ScnConverterMixin:
         return None
 
 
+class ScnCache:
+    """
+    Кэш scn ДК по протоколу UG405 с ограничением времени жизни(ttl).
+    Ключ кэша: ipv4 хоста, значение: scn в виде символов и в виде ascii строки.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        """
+        :param ttl: Время жизни scn в кэше, в секундах.
+        """
+        self._ttl = ttl
+        self._scn: dict[str, tuple[str, str, float]] = {}
+
+    def __len__(self):
+        return len(self._scn)
+
+    def get(self, ipv4: str) -> tuple[str, str] | None:
+        """
+        Возвращает scn хоста из кэша.
+        :param ipv4: ipv4 хоста.
+        :return: Кортеж (scn_as_chars, scn_as_ascii_string), если scn есть в кэше
+                 и не истекло время его жизни, иначе None.
+        """
+        try:
+            scn_as_chars, scn_as_ascii_string, created = self._scn[ipv4]
+        except KeyError:
+            return None
+        if time.monotonic() - created >= self._ttl:
+            del self._scn[ipv4]
+            return None
+        return scn_as_chars, scn_as_ascii_string
+
+    def add(self, ipv4: str, scn_as_chars: str, scn_as_ascii_string: str) -> None:
+        self._scn[ipv4] = scn_as_chars, scn_as_ascii_string, time.monotonic()
+
+    def invalidate(self, ipv4: str = None) -> None:
+        """
+        Удаляет scn хоста ipv4 из кэша. Если ipv4 не передан, очищает кэш полностью.
+        :param ipv4: ipv4 хоста.
+        :return: None
+        """
+        if ipv4 is None:
+            self._scn.clear()
+        else:
+            self._scn.pop(ipv4, None)
+
+
 class HexValueToIntegerStageConverter:
 
     @classmethod
@@ -301,7 +401,7 @@ class CommonVarbindsUg405:
     integer32_val2 = Integer32(2)
     integer32_val3 = Integer32(3)
 
-    states_varbinds: dict[str, Iterable[T_Varbinds]]
+    states_varbinds: ScnVarbindsCache
     states_oids: T_Oids
 
     @classmethod
@@ -313,12 +413,15 @@ class CommonVarbindsUg405:
         return cls.operation_mode1_varbind
 
     def get_varbinds_current_states(self, scn_as_ascii: str):
-        try:
-            return self.states_varbinds[scn_as_ascii]
-        except KeyError:
-            return add_scn_to_oids(
-                scn_as_ascii, self.states_oids, True
-            )
+        return self.states_varbinds.get(scn_as_ascii)
+
+    def warm_up(self, scns_as_chars: Iterable[str]) -> None:
+        """
+        Заранее создаёт varbinds получения состояния для известных scn.
+        :param scns_as_chars: scn в виде символов. Пример: ['CO3995', 'CO1']
+        :return: None
+        """
+        self.states_varbinds.warm_up(scns_as_chars)
 
     def get_varbinds_set_stage(
             self,
@@ -336,13 +439,16 @@ class CommonVarbindsUg405:
 
 class VarbPotokP(CommonVarbindsUg405):
     states_oids = oids.oids_state_potok_p
-    states_varbinds = create_varbinds_get_state_with_scn(oids.oids_state_potok_p)
+    states_varbinds = ScnVarbindsCache(oids.oids_state_potok_p)
 
 
 class VarbPeek(CommonVarbindsUg405):
     """ Класс для создания синглтона varbinds peek """
 
 
+# Общий кэш scn для всех хостов UG405
+ug405_scn_cache = ScnCache()
+
 # Синглтоны varbinds для каждого типа дк
 swarco_stcip_varbinds = VarbSwarco()
 potok_stcip_varbinds = VarbPotokS()
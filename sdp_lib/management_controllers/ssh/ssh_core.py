@@ -1,11 +1,26 @@
 import asyncio
+import contextlib
 import os
-from typing import Self, Sequence
-from collections import deque
+import re
+import time
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable
+)
+from typing import Any, Self, Sequence
+from collections import (
+    OrderedDict,
+    deque
+)
 
 import asyncssh
 from asyncssh import SSHClientProcess
 
+from sdp_lib.management_controllers.circuit_breaker import (
+    CircuitBreaker,
+    ssh_circuit_breaker
+)
 from sdp_lib.management_controllers.exceptions import ReadFromInteractiveShellError
 from sdp_lib.management_controllers.fields_names import FieldsNames
 from sdp_lib.management_controllers.hosts_core import Host
@@ -22,7 +37,8 @@ from sdp_lib.management_controllers.ssh.constants import (
 from sdp_lib.management_controllers.ssh.swarco_terminal import (
     ItcTerminal,
     is_log_l2,
-    get_commands_set_stage, login_commands, instat102_and_display, process_stdout_instat, process_terminal_stdout
+    get_commands_set_stage, login_commands, instat102_and_display, process_stdout_instat, process_terminal_stdout,
+    prompt_pattern, split_stdout_by_commands
 )
 
 
@@ -41,49 +57,110 @@ async def read_timed(
     :param bufsize: Размер буфера в байтах.
     :return: Вывод данных в строковом представлении.
     """
-    ret = ''
-    print(f'in func read_timed')
+    chunks = []
     while True:
         try:
-            ret += await asyncio.wait_for(stream.read(bufsize), timeout)
-            ret = ret.replace('\u0000', '')
-            # print(f'ret >>>> {ret}')
+            chunks.append(await asyncio.wait_for(stream.read(bufsize), timeout))
         except (asyncio.TimeoutError, asyncio.CancelledError):
-            return ret
-        # return ret
+            return ''.join(chunks).replace('\u0000', '')
 
-        # if cnt > 3 and not ret:
-        #     raise ReadFromInteractiveShellError()
+
+async def read_until_prompt(
+    stream: asyncssh.SSHReader,
+    timeout: float = 3,
+    bufsize: int = 1024,
+    prompt: re.Pattern = prompt_pattern
+) -> str:
+    """
+    Читает данные из потока вывода до появления приглашения терминала в конце вывода.
+    :param stream: Поток обмена данными.
+    :param timeout: Максимальное время чтения в секундах, если приглашение не появилось.
+    :param bufsize: Размер буфера в байтах.
+    :param prompt: Шаблон приглашения в конце вывода.
+    :return: Вывод данных в строковом представлении.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    chunks = []
+    tail = ''
+    while (remaining := deadline - loop.time()) > 0:
+        try:
+            chunk = await asyncio.wait_for(stream.read(bufsize), remaining)
+        except asyncio.TimeoutError:
+            break
+        if not chunk:
+            break
+        chunk = chunk.replace('\u0000', '')
+        chunks.append(chunk)
+        # Приглашение может прийти в нескольких частях, поэтому проверяется конец последних частей
+        tail = (tail + chunk)[-32:]
+        if prompt.search(tail):
+            break
+    return ''.join(chunks)
 
 
 class SwarcoItcUserConnectionsSSH:
     """
     Класс ssh соединений.
     """
+
+    circuit_breaker: CircuitBreaker = ssh_circuit_breaker
+
     def __init__(
             self,
             ip: str,
+            port: int = 22,
             connect_timeout: float = 20,
             login_timeout: float = 10,
             open_interactive_process_timeout: float = 2,
     ):
+        """
+        :param port: Порт ssh сервера ДК.
+        """
         self._ipv4 = ip
+        self._port = port
         self._connect_timeout = connect_timeout
         self._login_timeout = login_timeout
         self._open_interactive_process_timeout = open_interactive_process_timeout
         self._ssh_connection = None
         self._ssh_process = None
         self._last_conn_time = None
+        self.last_used = time.monotonic()
+        # Количество выполняемых с соединением операций(self.use)
+        self.in_use = 0
+        self._lock = asyncio.Lock()
         self.command_timeout = .2
         self._connection_errors = deque(maxlen=1)
 
+    @contextlib.asynccontextmanager
+    async def use(self) -> AsyncIterator[Self]:
+        """
+        Захватывает соединение на время операции: операции разных хостов с одним
+        сеансом интерактивной оболочки выполняются по очереди, и SshSessionPool
+        не закрывает используемые соединения.
+        :return: Асинхронный итератор контекстного менеджера, возвращающий self.
+        """
+        async with self._lock:
+            self.in_use += 1
+            try:
+                yield self
+            finally:
+                self.in_use -= 1
+                self.last_used = time.monotonic()
+
     async def create_connect(self) -> bool:
         """
         Создает ssh соединение.
+        Если цепь хоста в self.circuit_breaker разомкнута, соединение не создаётся
+        и в стек добавляется последняя ошибка подключения.
         """
+        if not self.circuit_breaker.allow_request(self._ipv4):
+            self.add_connection_error(self.circuit_breaker.get_error(self._ipv4))
+            return False
         try:
             self._ssh_connection = await asyncssh.connect(
                 host=self._ipv4,
+                port=self._port,
                 username=itc_login,
                 password=itc_passwd,
                 options=asyncssh.SSHClientConnectionOptions(connect_timeout=self._connect_timeout,
@@ -92,9 +169,11 @@ class SwarcoItcUserConnectionsSSH:
                 encryption_algs=enc_algs,
                 known_hosts=None,
             )
+            self.circuit_breaker.record_success(self._ipv4)
+            self._last_conn_time = time.monotonic()
             return True
         except (OSError, asyncssh.Error):
-            self.add_connection_error('SSH connection failed')
+            self.circuit_breaker.record_failure(self._ipv4, self.add_connection_error('SSH connection failed'))
         return False
 
     async def create_proc(self):
@@ -111,7 +190,7 @@ class SwarcoItcUserConnectionsSSH:
                 timeout=self._open_interactive_process_timeout
             )
             return True
-        except (asyncio.TimeoutError, asyncio.CancelledError):
+        except (asyncio.TimeoutError, asyncio.CancelledError, asyncssh.Error):
             return False
 
     def add_connection_error(self, error: str | Exception) -> str | Exception:
@@ -143,6 +222,25 @@ class SwarcoItcUserConnectionsSSH:
             self._connect_timeout = value
         return self._connect_timeout
 
+    @property
+    def is_connected(self) -> bool:
+        """
+        True, если ssh-соединение установлено и не закрыто.
+        """
+        return self._ssh_connection is not None and not self._ssh_connection.is_closed()
+
+    def close(self) -> None:
+        """
+        Закрывает сеанс интерактивной оболочки и ssh-соединение.
+        :return: None
+        """
+        if self._ssh_process is not None:
+            self._ssh_process.close()
+            self._ssh_process = None
+        if self._ssh_connection is not None:
+            self._ssh_connection.close()
+            self._ssh_connection = None
+
     @property
     def ssh_connection(self):
         """
@@ -181,15 +279,41 @@ class SwarcoItcUserConnectionsSSH:
         :return: None
         """
         self._ssh_process.stdin.write(f'{data}\n')
+        self.last_used = time.monotonic()
 
-    async def write_and_read_shell(self, data: str, timeout: float = .6) -> str:
+    async def write_and_read_shell(self, data: str, timeout: float = 3) -> str:
         """
-        Записывает данные в stdin сеанса интерактивной оболочки и ожидает ответа.
+        Записывает данные в stdin сеанса интерактивной оболочки и ожидает ответа
+        до появления приглашения терминала.
         :param data: Данные для записи в stdin.
+        :param timeout: Максимальное время ожидания приглашения в секундах.
         :return: Stdout сеанса интерактивной оболочки.
         """
         self.write_to_shell(data)
-        return await read_timed(self._ssh_process.stdout, timeout=timeout)
+        return await read_until_prompt(self._ssh_process.stdout, timeout=timeout)
+
+    async def write_batch_and_read_shell(self, commands: Sequence[str], timeout: float = 5) -> list[str]:
+        """
+        Записывает команды в stdin сеанса интерактивной оболочки одной записью и ожидает
+        эха последней команды и приглашения терминала после него.
+        :param commands: Команды для записи в stdin.
+        :param timeout: Максимальное время ожидания stdout всех команд в секундах.
+        :return: Список stdout команд в порядке commands(split_stdout_by_commands).
+        """
+        self.write_to_shell('\n'.join(commands))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        chunks = []
+        stdouts = [''] * len(commands)
+        while (remaining := deadline - loop.time()) > 0:
+            chunk = await read_until_prompt(self._ssh_process.stdout, timeout=remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            stdouts = split_stdout_by_commands(''.join(chunks), commands)
+            if prompt_pattern.search(stdouts[-1]):
+                break
+        return stdouts
 
     async def check_connection_and_interactive_session(self) -> bool:
         """
@@ -203,21 +327,23 @@ class SwarcoItcUserConnectionsSSH:
         ok = False
         try:
             self.write_to_shell(ItcTerminal.echo)
-            r = await read_timed(self._ssh_process.stdout)
+            r = await read_until_prompt(self._ssh_process.stdout)
             if 'Ok' in r or 'ITC' in r:
                 return True
-        except (AttributeError, BrokenPipeError, ConnectionResetError):
+        except (AttributeError, BrokenPipeError, ConnectionResetError, asyncssh.Error):
             ok = False
 
         try:
             success = await self.create_proc()
             if success:
-                r = await read_timed(self._ssh_process.stdout)
+                r = await read_until_prompt(self._ssh_process.stdout)
                 if 'ITC' in r:
                     return True
-        except (AttributeError, BrokenPipeError, ConnectionResetError):
+        except (AttributeError, BrokenPipeError, ConnectionResetError, asyncssh.Error):
             ok = False
 
+        # Закрыть неработающее соединение перед созданием нового
+        self.close()
         await self.create_connect()
         if self._connection_errors:
             return False
@@ -230,7 +356,7 @@ class SwarcoItcUserConnectionsSSH:
         if self._connection_errors:
             return False
 
-        r = await read_timed(self._ssh_process.stdout)
+        r = await read_until_prompt(self._ssh_process.stdout)
         print(f'r2: {r}')
         if 'ITC' in r:
             return True
@@ -238,10 +364,131 @@ class SwarcoItcUserConnectionsSSH:
         return False
 
 
+class SshSessionPool:
+    """
+    Пул ssh-соединений с ДК Swarco(SwarcoItcUserConnectionsSSH), ключ - ipv4 хоста.
+    Соединение и сеанс интерактивной оболочки хоста сохраняются между операциями, поэтому
+    повторная операция не требует нового ssh-соединения и входа на уровень L2, пока сеанс
+    остаётся на уровне L2(приглашение '&&>' в stdout команды instat102 ?).
+    Соединения, не используемые дольше idle_timeout, закрываются(self.reap_idle).
+    Если количество соединений превышает max_sessions, закрывается давно не используемое.
+    Соединения, с которыми выполняется операция(SwarcoItcUserConnectionsSSH.in_use), не закрываются:
+    если все соединения используются, количество соединений может временно превысить max_sessions.
+    """
+
+    def __init__(
+            self,
+            *,
+            max_sessions: int = 64,
+            idle_timeout: float = 300,
+            **connection_kwargs
+    ):
+        """
+        :param max_sessions: Максимальное количество соединений.
+        :param idle_timeout: Время, после которого неиспользуемое соединение закрывается, в секундах.
+        :param connection_kwargs: Аргументы SwarcoItcUserConnectionsSSH для новых соединений.
+        """
+        self._max_sessions = max_sessions
+        self._idle_timeout = idle_timeout
+        self._connection_kwargs = connection_kwargs
+        self._sessions: OrderedDict[str, SwarcoItcUserConnectionsSSH] = OrderedDict()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, ipv4: str):
+        return ipv4 in self._sessions
+
+    @property
+    def max_sessions(self) -> int:
+        return self._max_sessions
+
+    def get(self, ipv4: str) -> SwarcoItcUserConnectionsSSH:
+        """
+        Возвращает соединение хоста. Если соединения нет, создаёт новое(без подключения,
+        подключение выполняется check_connection_and_interactive_session).
+        :param ipv4: ipv4 хоста.
+        :return: Экземпляр SwarcoItcUserConnectionsSSH.
+        """
+        self.reap_idle()
+        try:
+            self._sessions.move_to_end(ipv4)
+            return self._sessions[ipv4]
+        except KeyError:
+            pass
+        if len(self._sessions) >= self._max_sessions:
+            not_used = [ipv4 for ipv4, session in self._sessions.items() if not session.in_use]
+            for evicted in not_used[:len(self._sessions) - self._max_sessions + 1]:
+                self._sessions.pop(evicted).close()
+        session = self._sessions[ipv4] = SwarcoItcUserConnectionsSSH(ipv4, **self._connection_kwargs)
+        return session
+
+    def reap_idle(self) -> int:
+        """
+        Закрывает и удаляет из пула соединения, не используемые дольше idle_timeout.
+        Соединения, с которыми выполняется операция, не закрываются.
+        :return: Количество закрытых соединений.
+        """
+        expired_time = time.monotonic() - self._idle_timeout
+        expired = [
+            ipv4 for ipv4, session in self._sessions.items()
+            if not session.in_use and session.last_used < expired_time
+        ]
+        for ipv4 in expired:
+            self._sessions.pop(ipv4).close()
+        return len(expired)
+
+    async def run_reaper(self, interval: float = 30) -> None:
+        """
+        Периодически закрывает неиспользуемые соединения. Запускается как отдельная задача.
+        :param interval: Интервал проверки, в секундах.
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.reap_idle()
+
+    def remove(self, ipv4: str) -> None:
+        session = self._sessions.pop(ipv4, None)
+        if session is not None:
+            session.close()
+
+    def close(self) -> None:
+        """
+        Закрывает все соединения пула.
+        :return: None
+        """
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+    def export(self) -> dict[str, dict[str, Any]]:
+        """
+        Возвращает состояние соединений пула для мониторинга.
+        :return: Словарь вида {ipv4: {'is_connected': ..., 'idle': ...}}
+        """
+        now = time.monotonic()
+        return {
+            ipv4: {
+                'is_connected': session.is_connected,
+                'idle': now - session.last_used,
+            }
+            for ipv4, session in self._sessions.items()
+        }
+
+
+# Общий для ssh хостов пул соединений
+ssh_session_pool = SshSessionPool()
+
+
 class SwarcoSSH(Host):
 
     protocol = FieldsNames.protocol_ssh
 
+    session_pool: SshSessionPool = ssh_session_pool
+
+    pipeline_commands = True
+
     def __init__(self, ip=None, host_id=None, driver: SwarcoItcUserConnectionsSSH = None):
 
         super().__init__(
@@ -252,8 +499,46 @@ class SwarcoSSH(Host):
         self.raw_stdout = None
         self.timeout = .2
 
+    @property
+    def driver(self) -> SwarcoItcUserConnectionsSSH:
+        """
+        Соединение хоста. Если соединение не задано, берётся из self.session_pool.
+        """
+        if self._driver is None and self._ipv4 is not None:
+            return self.session_pool.get(self._ipv4)
+        return self._driver
+
     def create_and_set_driver(self):
-        self.set_driver(SwarcoItcUserConnectionsSSH(self.ip_v4))
+        self.set_driver(self.session_pool.get(self.ip_v4))
+
+    async def _run_in_session(self, operation: Callable[[], Awaitable[Any]]) -> Self:
+        """
+        Выполняет операцию с соединением хоста, захваченным на время операции(SwarcoItcUserConnectionsSSH.use).
+        Перед операцией проверяет соединение и сеанс интерактивной оболочки. Если проверка завершилась
+        разрывом ssh-соединения(например, соединение из пула было закрыто ДК), соединение закрывается
+        и проверка выполняется ещё раз с новым соединением. Ошибка во время операции не приводит
+        к повторной отправке команд: соединение закрывается, ошибка добавляется в ответ.
+        :param operation: Операция хоста.
+        :return: Self.
+        """
+        async with self.driver.use() as session:
+            for attempt in range(2):
+                try:
+                    success_conn = await self.check_ssh_session_with_interactive_shell_and_reconnect_if_need()
+                    break
+                except (asyncssh.ConnectionLost, asyncssh.DisconnectError) as exc:
+                    session.close()
+                    if attempt:
+                        self.add_data_to_data_response_attrs(exc)
+                        return self
+            if not success_conn:
+                return self
+            try:
+                await operation()
+            except (asyncssh.Error, OSError) as exc:
+                session.close()
+                self.add_data_to_data_response_attrs(exc)
+        return self
 
     async def check_ssh_session_with_interactive_shell_and_reconnect_if_need(
             self,
@@ -273,33 +558,41 @@ class SwarcoSSH(Host):
         return success_conn
 
     async def _send_commands(self, terminal_commands_entity):
-
-        states = {}
-        sent_commands = []
-        self.raw_stdout = []
-        self._sent_commands = []
-        print(f'argsargs: {terminal_commands_entity}')
+        """
+        Отправляет команды в сеанс интерактивной оболочки и добавляет в данные ответа
+        обработанный stdout команд, требующих обработки.
+        Если self.pipeline_commands, все команды записываются одной записью,
+        иначе каждая следующая команда отправляется после получения stdout предыдущей.
+        :param terminal_commands_entity: Группы команд вида ((command, need_processing), ...).
+        :return: None
+        """
+        commands, need_processing = [], []
         for group_commands in terminal_commands_entity:
-            for data in group_commands:
-                print(f'data: {data}')
-                command, need_processing = data
-                try:
-                    stdout = await self.driver.write_and_read_shell(command)
-                    self.raw_stdout.append((command, stdout))
-                    self._sent_commands.append(command)
-                    if need_processing:
-                        field_name, processed_data = process_terminal_stdout(command, stdout)
-                        states[field_name] = processed_data
-
-                except ReadFromInteractiveShellError as exc:
-                    raise TypeError('ALARM! FAULT IN SENDING DATA TO SHELL')
-
-                self.add_data_to_data_response_attrs(data={
-                    'states_after_shell_session': states,
-                    'sent_commands': self._sent_commands
-                })
+            for command, processing in group_commands:
+                commands.append(command)
+                need_processing.append(processing)
 
+        if self.pipeline_commands:
+            stdouts = await self.driver.write_batch_and_read_shell(commands)
+        else:
+            stdouts = [await self.driver.write_and_read_shell(command) for command in commands]
 
+        states = {}
+        self.raw_stdout = list(zip(commands, stdouts))
+        self._sent_commands = commands
+        for command, stdout, processing in zip(commands, stdouts, need_processing):
+            if not processing:
+                continue
+            if not stdout:
+                self.add_data_to_data_response_attrs(f'No stdout for command: {command}')
+                continue
+            field_name, processed_data = process_terminal_stdout(command, stdout)
+            states[field_name] = processed_data
+
+        self.add_data_to_data_response_attrs(data={
+            'states_after_shell_session': states,
+            'sent_commands': self._sent_commands
+        })
 
     def _add_to_send_varbinds_attr(self, *args):
 
@@ -307,11 +600,25 @@ class SwarcoSSH(Host):
             self._varbinds_for_request.append(data)
 
 
+    async def get_states(self) -> Self:
+        """
+        Получает состояние ДК: вывод команд itc, instat102 ? и SIMULATE DISPLAY --poll.
+        :return: Self.
+        """
+        return await self._run_in_session(self._get_states)
+
+    async def _get_states(self) -> None:
+        await self._send_commands([instat102_and_display])
+
     async def set_stage(self, stage: int) -> Self:
+        """
+        Устанавливает фазу ДК.
+        :param stage: Номер фазы.
+        :return: Self.
+        """
+        return await self._run_in_session(lambda: self._set_stage(stage))
 
-        success_conn = await self.check_ssh_session_with_interactive_shell_and_reconnect_if_need()
-        if not success_conn:
-            return self
+    async def _set_stage(self, stage: int) -> None:
 
         self._varbinds_for_request = []
 
@@ -334,7 +641,6 @@ class SwarcoSSH(Host):
         #
         # print(f'process_stdout_instat(stdout): {process_stdout_instat(stdout)}')
         # self.add_data_to_data_response_attrs(data={'stdout': process_stdout_instat(stdout)})
-        return self
 
 
         # self._varbinds_for_request = [(comm, False) for comm in swarco_terminal.get_commands_set_stage(stage)]
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable
+)
+from typing import Any
+
+from sdp_lib.management_controllers.ssh.ssh_core import (
+    SshSessionPool,
+    SwarcoSSH,
+    ssh_session_pool
+)
+
+
+T_Operation = Callable[[SwarcoSSH], Awaitable]
+
+
+class HostLatency:
+
+    __slots__ = ('operations', 'errors', 'total', 'last', 'max', 'last_queue_time')
+
+    def __init__(self):
+        self.operations = 0
+        self.errors = 0
+        self.total = 0.
+        self.last = 0.
+        self.max = 0.
+        self.last_queue_time = 0.
+
+    def add(self, elapsed: float, queue_time: float, has_errors: bool) -> None:
+        self.operations += 1
+        self.errors += has_errors
+        self.total += elapsed
+        self.last = elapsed
+        self.max = max(self.max, elapsed)
+        self.last_queue_time = queue_time
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'operations': self.operations,
+            'errors': self.errors,
+            'mean': self.total / self.operations if self.operations else None,
+            'last': self.last,
+            'max': self.max,
+            'last_queue_time': self.last_queue_time,
+        }
+
+
+class SshExecutor:
+    """
+    Выполнение операций(set_stage, get_states и др.) над большим количеством ДК Swarco ITC по ssh.
+    Операции одного хоста выполняются по очереди(в порядке поступления), так как используют
+    один сеанс интерактивной оболочки из session_pool. Операции разных хостов выполняются
+    параллельно, количество одновременно выполняемых операций ограничено max_concurrent.
+    Время выполнения операций хостов для мониторинга: self.export().
+    """
+
+    def __init__(self, *, max_concurrent: int = 32, session_pool: SshSessionPool = None):
+        """
+        :param max_concurrent: Максимальное количество одновременно выполняемых операций.
+                               Не должно превышать session_pool.max_sessions, иначе пул может закрыть
+                               соединение выполняемой операции.
+        :param session_pool: Пул ssh-соединений. Если не передан, используется ssh_session_pool.
+        """
+        self._session_pool = ssh_session_pool if session_pool is None else session_pool
+        if not 0 < max_concurrent <= self._session_pool.max_sessions:
+            raise ValueError(
+                f'Значение max_concurrent должно быть больше 0 и не больше '
+                f'{self._session_pool.max_sessions}, передано: {max_concurrent}'
+            )
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._host_locks: dict[str, asyncio.Lock] = {}
+        self._latencies: dict[str, HostLatency] = {}
+
+    @property
+    def session_pool(self) -> SshSessionPool:
+        return self._session_pool
+
+    def get_host_lock(self, ipv4: str) -> asyncio.Lock:
+        try:
+            return self._host_locks[ipv4]
+        except KeyError:
+            return self._host_locks.setdefault(ipv4, asyncio.Lock())
+
+    def create_host(self, ipv4: str, host_id: str | int = None) -> SwarcoSSH:
+        host = SwarcoSSH(ipv4, host_id)
+        host.session_pool = self._session_pool
+        return host
+
+    async def run(self, ipv4: str, operation: T_Operation, host_id: str | int = None) -> SwarcoSSH:
+        """
+        Выполняет операцию над хостом после завершения предыдущих операций этого хоста.
+        Пример: await executor.run('10.45.154.18', lambda host: host.set_stage(2))
+        :param ipv4: ipv4 хоста.
+        :param operation: Корутинная функция, принимающая экземпляр SwarcoSSH.
+        :param host_id: host_id хоста.
+        :return: Экземпляр SwarcoSSH с данными ответа.
+        """
+        host = self.create_host(ipv4, host_id)
+        queued_at = time.perf_counter()
+        # Сначала очередь хоста, чтобы ожидающие операции не занимали общий лимит
+        async with self.get_host_lock(ipv4):
+            async with self._semaphore:
+                start_time = time.perf_counter()
+                try:
+                    await operation(host)
+                finally:
+                    try:
+                        latency = self._latencies[ipv4]
+                    except KeyError:
+                        latency = self._latencies[ipv4] = HostLatency()
+                    latency.add(time.perf_counter() - start_time, start_time - queued_at, bool(host.response_errors))
+        return host
+
+    async def set_stage(self, ipv4: str, stage: int, host_id: str | int = None) -> SwarcoSSH:
+        return await self.run(ipv4, lambda host: host.set_stage(stage), host_id)
+
+    async def get_states(self, ipv4: str, host_id: str | int = None) -> SwarcoSSH:
+        return await self.run(ipv4, SwarcoSSH.get_states, host_id)
+
+    async def run_many(self, operations: Iterable[tuple[str, T_Operation]]) -> AsyncIterator[SwarcoSSH]:
+        """
+        Выполняет операции над хостами и отдаёт хосты в порядке завершения операций.
+        :param operations: Операции вида (ipv4, корутинная функция, принимающая экземпляр SwarcoSSH).
+        :return: Асинхронный итератор по хостам с данными ответа.
+        """
+        tasks = [asyncio.create_task(self.run(ipv4, operation)) for ipv4, operation in operations]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def set_stage_many(self, stages: Iterable[tuple[str, int]]) -> list[SwarcoSSH]:
+        """
+        Устанавливает фазы хостов.
+        :param stages: Фазы хостов вида (ipv4, фаза).
+                       Пример: [('10.45.154.18', 2), ('10.45.154.19', 0)]
+        :return: Список хостов в порядке завершения операций.
+        """
+        operations = ((ipv4, lambda host, stage=stage: host.set_stage(stage)) for ipv4, stage in stages)
+        return [host async for host in self.run_many(operations)]
+
+    def export(self) -> dict[str, dict[str, Any]]:
+        """
+        Возвращает время выполнения операций хостов для мониторинга.
+        :return: Словарь вида {ipv4: HostLatency.as_dict()}
+        """
+        return {ipv4: latency.as_dict() for ipv4, latency in self._latencies.items()}
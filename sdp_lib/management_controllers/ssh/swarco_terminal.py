@@ -1,4 +1,6 @@
 import os
+import re
+from collections.abc import Sequence
 from enum import StrEnum
 
 from dotenv import load_dotenv
@@ -39,6 +41,37 @@ class ItcTerminal(StrEnum):
 
 
 
+# Приглашение терминала ДК в конце stdout: '>  ', '&&>  ', 'Enter password for level 2>  '
+prompt_pattern = re.compile(r'> +\Z')
+
+
+def split_stdout_by_commands(stdout: str, commands: Sequence[str]) -> list[str]:
+    """
+    Разделяет stdout команд, записанных в stdin одной записью, на stdout каждой команды.
+    Stdout команды начинается с эха команды и заканчивается приглашением терминала
+    перед эхом следующей команды, как при отправке команд по одной.
+    :param stdout: Stdout сеанса интерактивной оболочки после записи команд.
+    :param commands: Записанные команды.
+    :return: Список stdout команд в порядке commands. Если эхо команды не найдено,
+             stdout команды - пустая строка.
+    """
+    starts, pos = [], 0
+    for command in commands:
+        start = stdout.find(f'{command}\r\n', pos)
+        starts.append(start)
+        if start != -1:
+            pos = start + len(command) + 2
+    stdouts, end = [], len(stdout)
+    for start in reversed(starts):
+        if start == -1:
+            stdouts.append('')
+        else:
+            stdouts.append(stdout[start:end])
+            end = start
+    stdouts.reverse()
+    return stdouts
+
+
 def process_stdout_itc(content):
     return content.splitlines()[1:-1]
 
@@ -0,0 +1,145 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import (
+    Any,
+    NamedTuple,
+    Self
+)
+
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.hosts_core import Host
+
+
+class StateDelta(NamedTuple):
+    host_id: str | int
+    ipv4: str
+    # Изменившиеся поля вида {имя поля: (предыдущее значение, новое значение)}
+    changes: dict[str, tuple[Any, Any]]
+    timestamp: float
+
+
+class Subscription:
+    """
+    Асинхронный итератор по изменениям состояний хостов(StateStore.subscribe).
+    Очередь подписчика регистрируется при создании и удаляется после завершения
+    итерации или вызова self.aclose(). Может использоваться как асинхронный контекстный менеджер.
+    """
+
+    def __init__(self, subscribers: set[asyncio.Queue], maxsize: int = 0):
+        """
+        :param subscribers: Очереди подписчиков StateStore.
+        :param maxsize: Максимальный размер очереди подписчика.
+        """
+        self._subscribers = subscribers
+        self._queue = asyncio.Queue(maxsize)
+        self._subscribers.add(self._queue)
+
+    def __aiter__(self) -> AsyncIterator[StateDelta]:
+        return self
+
+    async def __anext__(self) -> StateDelta:
+        if self._queue not in self._subscribers:
+            raise StopAsyncIteration
+        delta = await self._queue.get()
+        if delta is None:
+            await self.aclose()
+            raise StopAsyncIteration
+        return delta
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Отменяет подписку.
+        :return: None
+        """
+        self._subscribers.discard(self._queue)
+
+
+class StateStore:
+    """
+    Хранилище последнего состояния хостов(ключ - host_id, если не задан - ipv4).
+    При каждом обновлении сравнивает новое состояние хоста с предыдущим и
+    отправляет подписчикам только изменения(StateDelta), например смену фазы или режима.
+    Ошибки хоста сравниваются как поле FieldsNames.errors.
+    """
+
+    def __init__(self):
+        self._states: dict[str | int, dict[str, Any]] = {}
+        self._subscribers: set[asyncio.Queue] = set()
+
+    def __len__(self):
+        return len(self._states)
+
+    def __contains__(self, host_id: str | int):
+        return host_id in self._states
+
+    def get(self, host_id: str | int) -> dict[str, Any] | None:
+        """
+        Возвращает последнее состояние хоста.
+        :param host_id: host_id(или ipv4) хоста.
+        :return: Словарь вида {FieldsNames.errors: [...], имя поля: значение, ...} или None.
+        """
+        return self._states.get(host_id)
+
+    def remove(self, host_id: str | int) -> None:
+        self._states.pop(host_id, None)
+
+    @staticmethod
+    def _build_state(host: Host) -> dict[str, Any]:
+        state = {str(FieldsNames.errors): [str(e) for e in host.response_errors]}
+        state |= host.response_data
+        return state
+
+    def update(self, host: Host) -> StateDelta | None:
+        """
+        Обновляет состояние хоста после опроса.
+        :param host: Опрошенный хост.
+        :return: StateDelta, если состояние изменилось(или хост добавлен впервые), иначе None.
+        """
+        key = host.host_id if host.host_id is not None else host.ip_v4
+        state = self._build_state(host)
+        previous = self._states.get(key, {})
+        changes = {
+            field_name: (previous.get(field_name), val)
+            for field_name, val in state.items()
+            if field_name not in previous or previous[field_name] != val
+        }
+        for field_name in previous.keys() - state.keys():
+            changes[field_name] = (previous[field_name], None)
+        self._states[key] = state
+        if not changes:
+            return None
+
+        delta = StateDelta(host.host_id, host.ip_v4, changes, time.time())
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(delta)
+        return delta
+
+    def subscribe(self, maxsize: int = 0) -> 'Subscription':
+        """
+        Подписка на изменения состояний хостов. Подписчик регистрируется при вызове
+        метода и получает все изменения, произошедшие после подписки, в том числе
+        до начала итерации.
+        :param maxsize: Максимальный размер очереди подписчика. Если очередь заполнена,
+                        самое старое изменение отбрасывается. 0 - без ограничения.
+        :return: Асинхронный итератор по StateDelta(Subscription). Завершается после вызова self.close().
+        """
+        return Subscription(self._subscribers, maxsize)
+
+    def close(self) -> None:
+        """
+        Завершает итераторы всех подписчиков.
+        :return: None
+        """
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
@@ -27,3 +27,26 @@ class LexerValuesInConditionString:
         lg.add('NOT', r'not')
         lg.ignore(r'\s+')
         return lg
+
+
+class LexerCompiledConditionString:
+    """
+    Лексер строки условия перехода/продления для compile: функции(токены) и операторы
+    исходной строки без подстановки значений.
+    """
+
+    @classmethod
+    def get_lexer(cls):
+        lg = LexerGenerator()
+        lg.add("ddr", r'ddr\(D\d{1,3}\)')
+        lg.add("ddo", r'ddo\(D\d{1,3}\)')
+        lg.add("ngp", r'ngp\(D\d{1,3}\)')
+        lg.add("fctg", r'fctg\(G\d+\)\s*([<>]=?|==)\s*(\d+)')
+        lg.add('mr', r'mr\(G\d{1,3}\)')
+        lg.add("L_PAREN", r'\(')
+        lg.add("R_PAREN", r'\)')
+        lg.add('NOT', r'not\b')
+        lg.add('AND', r'and\b')
+        lg.add('OR', r'or\b')
+        lg.ignore(r'\s+')
+        return lg
@@ -3,15 +3,31 @@
 из Traffic lights configurator контроллера Поток
 """
 import abc
+import builtins
+from collections.abc import (
+    Callable,
+    Mapping,
+    Sequence
+)
 from typing import List, Dict
 
-from .lexer import LexerValuesInConditionString
+from rply.errors import LexingError
+
+from .lexer import (
+    LexerCompiledConditionString,
+    LexerValuesInConditionString
+)
 from .parser import pg
 from .condition_string import ConditionStringPotokTlc
 
 
 lexer = LexerValuesInConditionString.get_lexer().build()
 parser = pg.build()
+compiled_lexer = LexerCompiledConditionString.get_lexer().build()
+
+# Операторы строки условия в выражении Python. Приоритет операторов Python(or < and < not)
+# совпадает с приоритетом PLUS < MUL < NOT парсера pg.
+python_operators = {'NOT': 'not', 'AND': 'and', 'OR': 'or', 'L_PAREN': '(', 'R_PAREN': ')'}
 
 
 class BaseCondition(metaclass=abc.ABCMeta):
@@ -48,8 +64,14 @@ class ConditionResult(BaseCondition):
         super().__init__(condition_string)
         self.condition_string_for_parse = None
         self.current_result = None
+        self.compiled_condition: CompiledCondition | None = None
+        # Значения последнего вычисления скомпилированного условия. Строка с подставленными
+        # значениями для __repr__ строится из них только при вызове __repr__
+        self._last_values: Dict | None = None
 
     def __repr__(self):
+        if self._last_values is not None:
+            self.func_to_val(self._last_values)
         return (f'Последний полученный результат: {self.current_result}\nУсловие: {self.condition_string}\n'
                 f'Условие с заменённыыми функциями на значения: {self.condition_string_for_parse}')
 
@@ -64,8 +86,15 @@ class ConditionResult(BaseCondition):
         """
 
         if isinstance(data, Dict):
-            self.func_to_val(data)
+            # Строка условия разбирается один раз, значения подставляются в скомпилированное выражение
+            self.check_values(data)
+            if self.compiled_condition is None:
+                self.compiled_condition = compile(self.condition_string)
+            self.current_result = self.compiled_condition(data)
+            self._last_values = data
+            return self.current_result
         elif isinstance(data, str):
+            self._last_values = None
             self.condition_string_for_parse = data
         else:
             raise TypeError(f'Некорректный тип данных: {type(data)}. Допустимый тип "str" или "dict"')
@@ -95,14 +124,123 @@ class ConditionResult(BaseCondition):
                          return -> '(1 or 0) and 1 and 0'
         """
 
+        self.check_values(values)
+        self._last_values = None
         self.condition_string_for_parse = self.condition_string
-
         for name, val in values.items():
-            if not isinstance(val, int) or val not in range(2):
-                raise ValueError(f'Передано неверное значение: {val}. Заменяемое значение должно быть 0 или 1')
             self.condition_string_for_parse = self.condition_string_for_parse.replace(name, str(val))
         return self.condition_string_for_parse
 
+    @staticmethod
+    def check_values(values: Dict):
+        """
+        Проверяет, что значения функций(токенов) равны 0 или 1.
+        :param values: словарь с данными, в котором определено соответствие значения для функции.
+        :return: None
+        """
+
+        for val in values.values():
+            if not isinstance(val, int) or val not in range(2):
+                raise ValueError(f'Передано неверное значение: {val}. Заменяемое значение должно быть 0 или 1')
+
+
+class CompiledCondition(BaseCondition):
+    """
+    Скомпилированная строка условия перехода/продления из tlc конфигурации контроллера Поток.
+    Строка разбирается один раз при создании: функции(токены) заменяются ячейками значений,
+    операторы - операторами Python, и выражение компилируется в функцию. Вычисление не выполняет
+    лексический и синтаксический разбор строки и требует O(количество токенов) операций.
+    Пример:
+        condition = compile('(ddr(D33) or ddr(D34)) and mr(G2) and (fctg(G1)<66)')
+        condition.tokens -> ['ddr(D33)', 'ddr(D34)', 'fctg(G1)<66', 'mr(G2)']
+        condition({'ddr(D33)': 1, 'ddr(D34)': 0, 'mr(G2)': 1, 'fctg(G1)<66': 0}) -> False
+        condition([1, 0, 1, 1]) -> True
+    """
+
+    def __init__(self, condition_string: str, tokens: Sequence[str] = None):
+        """
+        :param condition_string: Строка с условием перехода/продления из tlc конфигурации контроллера Поток.
+                                 Пример: '(ddr(D33) or ddr(D34)) and mr(G2) and (fctg(G1)<66)'
+        :param tokens: Порядок значений токенов в последовательности, передаваемой для вычисления.
+                       Позволяет вычислять разные условия по одному массиву значений всех токенов.
+                       Если не передан - токены условия в порядке сортировки.
+        """
+
+        super().__init__(condition_string)
+        try:
+            lexed = [(token.gettokentype(), token.value.strip()) for token in compiled_lexer.lex(condition_string)]
+        except LexingError as err:
+            raise ValueError(
+                f'Некорректный символ в строке условия(позиция {err.getsourcepos().idx}): {condition_string}'
+            ) from None
+
+        names = {name for token_type, name in lexed if token_type not in python_operators}
+        self.tokens: List[str] = sorted(names) if tokens is None else list(tokens)
+        slots = {token: i for i, token in enumerate(self.tokens)}
+        missed = names - slots.keys()
+        if missed:
+            raise ValueError(f'Токены условия отсутствуют в tokens: {sorted(missed)}')
+
+        by_slot, by_name = [], []
+        for token_type, name in lexed:
+            operator = python_operators.get(token_type)
+            by_slot.append(operator or f'v[{slots[name]}]')
+            by_name.append(operator or f'v[{name!r}]')
+        self._evaluate_sequence = self._compile_expression(by_slot)
+        self._evaluate_mapping = self._compile_expression(by_name)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.condition_string!r})'
+
+    def _compile_expression(self, parts: List[str]) -> Callable:
+        """
+        Компилирует выражение из частей в функцию от значений токенов v.
+        :param parts: Части выражения Python: операторы и обращения к значениям токенов.
+        :return: Функция, возвращающая bool результат выражения.
+        """
+
+        try:
+            if not parts:
+                raise SyntaxError
+            # Функция compile этого модуля перекрывает встроенную, поэтому builtins.compile
+            code = builtins.compile(f'lambda v: bool({" ".join(parts)})', '<condition>', 'eval')
+        except SyntaxError:
+            raise ValueError(f'Некорректная строка условия: {self.condition_string}') from None
+        return eval(code, {'__builtins__': {}, 'bool': bool})
+
+    def __call__(self, values: Mapping[str, int] | Sequence[int]) -> bool:
+        """
+        Возвращает результат условия с заданными значениями токенов.
+        :param values: Значения токенов(0 или 1): словарь вида {токен: значение} или последовательность
+                       значений в порядке self.tokens.
+                       Пример: {'ddr(D33)': 1, 'ddr(D34)': 0, 'mr(G2)': 1, 'fctg(G1)<66': 0} или [1, 0, 1, 0]
+        :return: Результат выражения с заданными значениями токенов(функций)
+        """
+
+        if isinstance(values, Mapping):
+            try:
+                return self._evaluate_mapping(values)
+            except KeyError as err:
+                raise ValueError(f'Не передано значение токена: {err.args[0]}') from None
+        return self._evaluate_sequence(values)
+
+
+# Перекрывает встроенную функцию compile внутри этого модуля:
+# для компиляции кода Python в модуле используется builtins.compile.
+def compile(condition_string: str, tokens: Sequence[str] = None) -> CompiledCondition:
+    """
+    Разбирает строку условия перехода/продления из tlc конфигурации контроллера Поток
+    для многократного вычисления с разными значениями токенов.
+    Пример:
+        condition = compile('ddr(D4) or not ddr(D5)')
+        [condition(snapshot) for snapshot in snapshots]
+    :param condition_string: Строка с условием перехода/продления.
+    :param tokens: Порядок значений токенов в последовательности значений. Подробнее: CompiledCondition.
+    :return: Экземпляр CompiledCondition.
+    """
+
+    return CompiledCondition(condition_string, tokens)
+
 
 class Tokens(BaseCondition):
     """
@@ -0,0 +1,18 @@
+import pytest_asyncio
+
+
+@pytest_asyncio.fixture
+async def itc_server(monkeypatch):
+    # Модули ssh читают переменные окружения ДК при импорте, поэтому импортируются
+    # только тестами, которым нужен сервер, а не при загрузке conftest
+    from sdp_lib.management_controllers.ssh import ssh_core
+    from tests.itc_ssh_server import ItcTerminalServer
+
+    # Алгоритмы и кодировка asyncssh по умолчанию вместо заданных в .env для ДК
+    monkeypatch.setattr(ssh_core, 'kex_algs', ())
+    monkeypatch.setattr(ssh_core, 'enc_algs', ())
+    monkeypatch.setattr(ssh_core, 'proc_ssh_encoding', 'utf-8')
+    server = ItcTerminalServer()
+    await server.start()
+    yield server
+    server.close()
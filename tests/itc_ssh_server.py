@@ -0,0 +1,125 @@
+"""
+Простейший ssh сервер, имитирующий терминал ДК Swarco ITC, для тестов и бенчмарков.
+Поддерживает команды ECHO, lang UK, вход на уровень L2, instatNNN ?, inpNNN=V,
+itc и SIMULATE DISPLAY --poll. Эхо введённой команды, вывод и приглашение('>  ' или '&&>  ')
+отправляются так же, как терминалом ДК.
+"""
+import asyncio
+
+import asyncssh
+
+from sdp_lib.management_controllers.ssh.constants import (
+    itc_login,
+    itc_passwd
+)
+from sdp_lib.management_controllers.ssh.swarco_terminal import ItcTerminal
+
+
+class ItcTerminalServer:
+
+    def __init__(self, response_delay: float = 0, rtt: float = 0):
+        """
+        :param response_delay: Задержка ответа на каждую команду, в секундах.
+        :param rtt: Время передачи данных до клиента(имитация задержки сети), в секундах.
+                    В отличие от response_delay не задерживает обработку следующих команд.
+        """
+        self.response_delay = response_delay
+        self.rtt = rtt
+        self.connections = 0
+        self.l2_logins = 0
+        self.commands: list[str] = []
+        self.inputs = {num_inp: 0 for num_inp in range(102, 172)}
+        self._server: asyncssh.SSHAcceptor | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        terminal = self
+
+        class Server(asyncssh.SSHServer):
+
+            def connection_made(self, conn):
+                terminal.connections += 1
+
+            def begin_auth(self, username):
+                return True
+
+            def password_auth_supported(self):
+                return True
+
+            def validate_password(self, username, password):
+                return username == itc_login and password == itc_passwd
+
+        self._server = await asyncssh.create_server(
+            Server, host, port,
+            server_host_keys=[asyncssh.generate_private_key('ssh-ed25519')],
+            process_factory=self._handle_process,
+            line_editor=False,
+            encoding='utf-8'
+        )
+
+    def close(self) -> None:
+        self._server.close()
+
+    def _get_instat(self, num_inp: int) -> str:
+        nums = range(num_inp, num_inp + 70)
+        return (
+            '\r\n'
+            f'     {"".join(str(num // 100) for num in nums)}\r\n'
+            f'     {"".join(str(num // 10 % 10) for num in nums)}\r\n'
+            f'     {"".join(str(num % 10) for num in nums)}\r\n'
+            f' 68: {"".join(str(self.inputs.get(num, 0)) for num in nums)}\r\r\n'
+        )
+
+    def _process_command(self, command: str, is_l2: bool) -> str:
+        if command == ItcTerminal.echo or command == ItcTerminal.lang_uk:
+            return 'Ok.\r\n'
+        elif command.startswith('instat') and command.endswith('?'):
+            return self._get_instat(int(command.removeprefix('instat').removesuffix('?')))
+        elif command.startswith('inp') and '=' in command:
+            if not is_l2:
+                return 'Access denied.\r\n'
+            num_inp, val = command.removeprefix('inp').split('=')
+            self.inputs[int(num_inp)] = int(val)
+            return 'Ok.\r\n'
+        elif command == ItcTerminal.itc_command:
+            return 'ITC-2 Linux\r\nSwarco Traffic Systems\r\n'
+        elif command == ItcTerminal.display_command:
+            return (
+                'Line 1: *** ITC-2 Linux  ***\r\nLine 2: 12998 16.04-23:36:14\r\n'
+                'Line 3: P1CL      TVP    208\r\nLine 4: 1-1 ON_ERR S1/S1 0  \r\nSignals: 1 0 0 0 0 0 0 0\r\n\r\n'
+            )
+        return f'Unknown command: {command}\r\n'
+
+    async def _handle_process(self, process: asyncssh.SSHServerProcess) -> None:
+        if self.rtt:
+            loop, write = asyncio.get_running_loop(), process.stdout.write
+            process.stdout.write = lambda data: loop.call_later(self.rtt, write, data)
+        is_l2 = False
+        process.stdout.write('\r\n*** ITC-2 Linux ***\r\n>  ')
+        try:
+            while line := await process.stdin.readline():
+                command = line.rstrip('\r\n')
+                self.commands.append(command)
+                process.stdout.write(f'{command}\r\n')
+                if self.response_delay:
+                    await asyncio.sleep(self.response_delay)
+                if command == ItcTerminal.l2_login:
+                    process.stdout.write('Enter password for level 2>  ')
+                    password = (await process.stdin.readline()).rstrip('\r\n')
+                    self.commands.append(password)
+                    process.stdout.write(f'{password}\r\n')
+                    if password == ItcTerminal.l2_pass:
+                        is_l2 = True
+                        self.l2_logins += 1
+                        process.stdout.write('Code level 2 opened.\r\n')
+                    else:
+                        process.stdout.write('Wrong password.\r\n')
+                else:
+                    process.stdout.write(self._process_command(command, is_l2))
+                process.stdout.write('&&>  ' if is_l2 else '>  ')
+        except (asyncssh.BreakReceived, asyncssh.TerminalSizeChanged, ConnectionError):
+            pass
+        process.exit(0)
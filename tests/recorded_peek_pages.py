@@ -0,0 +1,51 @@
+"""
+Контент web страниц ДК Peek: записанный и сформированный по его образцу.
+"""
+
+main_page = (
+    ':TITLE;##MENU_001a##\n:SUBTITLE;Moscow: Панфиловс пр / Андреевка\n:TFT_NAVBAR;10\n:REFRESH_LOCK;1\n\n'
+    ':BEGINTABLE\n:W;;200px;\n\n:D;;##T_PLAN##;005 -             \n\n:D;;##T_TIMINGSET##;005\n\n'
+    ':D;;##T_TIME##;2025-03-01 16:08:41\n:D;;##T_ALARMS##;ISWC\n\n\n:ENDTABLE\n\n'
+    '<b>##T_STREAM## 1</b>\n:BEGINTABLE\n:W;;200px;\n:D;;##T_STATE##;УПРАВЛЕНИЕ\n:D;;##T_CYCLE##;0 (0)\n'
+    ':D;;##T_MODE## (##T_STAGE##);FT (3)\n:ENDTABLE\n\n'
+    '<b>##T_STREAM## 2</b>\n:BEGINTABLE\n:W;;200px;\n:D;;##T_STATE##;УПРАВЛЕНИЕ\n:D;;##T_CYCLE##;0 (0)\n'
+    ':D;;##T_MODE## (##T_STAGE##);FT (6)\n:ENDTABLE\n\n\n\n\n\n\n\n\n\n\n\n'
+    ':BEGIN_TFT_ONLY\n<div id="nav_home">\n<br /><br />\n<ul>\n'
+    '<li><button type=button OnClick=\'top.doDataHref("cell1370.hvi",1)\'>##CELL_1370##</button></li>\n'
+    '<li><button type=button OnClick=\'top.doDataHref("cell1240.hvi",1)\'>##CELL_1240##</button></li>\n'
+    '<li><button type=button OnClick=\'top.doHref("detswico.hvi",1)\'>##T_DETSWICO##</button></li>\n'
+    '</ul>\n</div>\n:END_TFT_ONLY\n'
+)
+
+def build_main_page_with_streams(num_streams: int) -> str:
+    """
+    Формирует контент основной страницы с num_streams потоками на основе main_page.
+    """
+    head, _, tail = main_page.partition('<b>##T_STREAM## 1</b>')
+    tail = tail[tail.index(':BEGIN_TFT_ONLY'):]
+    streams = ''.join(
+        f'<b>##T_STREAM## {num}</b>\n:BEGINTABLE\n:W;;200px;\n:D;;##T_STATE##;УПРАВЛЕНИЕ\n'
+        f':D;;##T_CYCLE##;{num * 10} (90)\n:D;;##T_MODE## (##T_STAGE##);VA ({num % 8 + 1})\n:ENDTABLE\n\n'
+        for num in range(1, num_streams + 1)
+    )
+    return f'{head}{streams}{tail}'
+
+
+main_page_4_streams = build_main_page_with_streams(4)
+
+
+inputs_names = (
+    'MPP_MAN', 'MPP_FL', 'MPP_OFF', *(f'MPP_PH{num}' for num in range(1, 9)),
+    *(f'DET{num}' for num in range(1, 25))
+)
+
+inputs_page = (
+    ':TITLE;##MENU_032a##\n:SUBTITLE;Moscow: Панфиловс пр / Андреевка\n:TFT_NAVBAR;10\n\n'
+    ':BEGINTABLE\n:W;40px;40px;120px;40px;80px;60px;\n'
+    ':H;##T_INDEX##;##T_NUMBER##;##T_NAME##;##T_STATE##;##T_TIME##;##T_ACTUATOR##\n'
+    + ''.join(
+        f':D;{index};{index + 1};{name};{int(name == "MPP_MAN")};{index * 7};{"ВКЛ" if name == "MPP_MAN" else "-"}\n'
+        for index, name in enumerate(inputs_names)
+    )
+    + ':ENDTABLE\n'
+)
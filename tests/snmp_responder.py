@@ -0,0 +1,67 @@
+"""
+Простейший snmp v1/v2c респондер для тестов и бенчмарков. На любой запрос
+возвращает те же оиды со значением Integer(1).
+"""
+import asyncio
+import multiprocessing
+
+from pyasn1.codec.ber import (
+    decoder,
+    encoder
+)
+from pysnmp.proto import api
+
+
+class SnmpResponderProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self):
+        self.transport = None
+        self.received = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.received += 1
+        p_mod = api.PROTOCOL_MODULES[int(api.decodeMessageVersion(data))]
+        request, _ = decoder.decode(data, asn1Spec=p_mod.Message())
+        response = p_mod.apiMessage.get_response(request)
+        request_pdu = p_mod.apiMessage.get_pdu(request)
+        response_pdu = p_mod.apiMessage.get_pdu(response)
+        p_mod.apiPDU.set_varbinds(
+            response_pdu,
+            [(oid, p_mod.Integer(1)) for oid, _ in p_mod.apiPDU.get_varbinds(request_pdu)]
+        )
+        self.transport.sendto(encoder.encode(response), addr)
+
+
+async def start_responder(
+        host: str = '127.0.0.1',
+        port: int = 161
+) -> tuple[asyncio.DatagramTransport, SnmpResponderProtocol]:
+    """
+    Запускает респондер на host:port.
+    Порт 161 привилегированный, для запуска требуются права root.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.create_datagram_endpoint(SnmpResponderProtocol, local_addr=(host, port))
+
+
+def _serve_forever(host: str, port: int, ready) -> None:
+    async def serve():
+        await start_responder(host, port)
+        ready.set()
+        await asyncio.Event().wait()
+    asyncio.run(serve())
+
+
+def start_responder_process(host: str = '127.0.0.1', port: int = 161) -> multiprocessing.Process:
+    """
+    Запускает респондер в отдельном процессе, чтобы обработка запросов
+    не конкурировала за процессор с измеряемым кодом.
+    """
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=_serve_forever, args=(host, port, ready), daemon=True)
+    process.start()
+    ready.wait(5)
+    return process
@@ -0,0 +1,87 @@
+import pytest
+from pysnmp.entity.engine import SnmpEngine
+from pysnmp.proto import errind
+
+from sdp_lib.management_controllers import circuit_breaker as circuit_breaker_module
+from sdp_lib.management_controllers.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState
+)
+from sdp_lib.management_controllers.http.request_sender import AsyncHttpRequests
+from sdp_lib.management_controllers.snmp.snmp_core import SwarcoStcip
+from sdp_lib.management_controllers.snmp.snmp_requests import SnmpRequests
+from sdp_lib.management_controllers.ssh.ssh_core import SwarcoItcUserConnectionsSSH
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+@pytest.fixture
+def monotonic(monkeypatch):
+    now = [100.]
+    monkeypatch.setattr(circuit_breaker_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_closed_open_half_open(monotonic):
+    breaker = CircuitBreaker(failure_threshold=2, open_timeout=10, max_open_timeout=15)
+    ip = '10.0.0.1'
+    breaker.record_failure(ip, 'timeout')
+    assert breaker.get_state(ip) == CircuitState.CLOSED and breaker.allow_request(ip)
+    breaker.record_failure(ip, 'timeout')
+    assert breaker.get_state(ip) == CircuitState.OPEN and not breaker.allow_request(ip)
+    assert breaker.get_error(ip) == 'timeout'
+
+    monotonic[0] += 10
+    assert breaker.allow_request(ip)
+    assert breaker.get_state(ip) == CircuitState.HALF_OPEN and not breaker.allow_request(ip)
+    breaker.record_failure(ip, 'timeout')
+    assert breaker.get_state(ip) == CircuitState.OPEN
+    assert breaker.export()[ip]['open_timeout'] == 15
+
+    monotonic[0] += 15
+    assert breaker.allow_request(ip)
+    breaker.record_success(ip)
+    assert breaker.get_state(ip) == CircuitState.CLOSED and len(breaker) == 0
+
+
+@pytest.mark.asyncio
+async def test_snmp_requests_short_circuit(monkeypatch, monotonic):
+    calls = 0
+
+    async def get_cmd(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return errind.requestTimedOut, 0, 0, ()
+
+    breaker = CircuitBreaker(failure_threshold=2)
+    monkeypatch.setattr(SnmpRequests, 'circuit_breaker', breaker)
+    monkeypatch.setattr('sdp_lib.management_controllers.snmp.snmp_requests.get_cmd', get_cmd)
+    host = SwarcoStcip(ipv4='10.0.0.1', engine=SnmpEngine())
+    for _ in range(5):
+        host.remove_errors_from_response()
+        await host.get_states()
+        assert host.response_errors == [errind.requestTimedOut]
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_snmp_failures_do_not_open_other_protocols(monkeypatch, monotonic):
+    async def get_cmd(*args, **kwargs):
+        return errind.requestTimedOut, 0, 0, ()
+
+    monkeypatch.setattr('sdp_lib.management_controllers.snmp.snmp_requests.get_cmd', get_cmd)
+    breakers = (
+        SnmpRequests.circuit_breaker, AsyncHttpRequests.circuit_breaker, SwarcoItcUserConnectionsSSH.circuit_breaker
+    )
+    assert len(set(map(id, breakers))) == 3
+    host = SwarcoStcip(ipv4='10.0.0.2', engine=SnmpEngine())
+    try:
+        for _ in range(5):
+            await host.get_states()
+        assert SnmpRequests.circuit_breaker.get_state('10.0.0.2') == CircuitState.OPEN
+        for breaker in breakers[1:]:
+            assert breaker.get_state('10.0.0.2') == CircuitState.CLOSED
+            assert breaker.get_error('10.0.0.2') is None
+    finally:
+        SnmpRequests.circuit_breaker.reset('10.0.0.2')
@@ -0,0 +1,195 @@
+import io
+import random
+
+import pytest
+
+from sdp_lib.conflicts.calculate_conflicts import (
+    BaseConflictsAndStagesCalculations,
+    CommonConflictsAndStagesAPI,
+    DataFields,
+    OutputDataCalculations,
+    SwarcoConflictsAndStagesAPI
+)
+from sdp_lib.conflicts.conflicts_matrix import (
+    ConflictsMatrix,
+    get_bits
+)
+
+
+raw_stages = {
+    '1': '1,4,2,3,5,5,5,5,3,4,2',
+    '2': '1,6,7,7,3',
+    '3': '9,10,8,13,3,10,',
+    '4': '5,6,4'
+}
+
+
+def create_random_stages(num_groups: int, num_stages: int, seed: int) -> dict[str, str]:
+    rnd = random.Random(seed)
+    return {
+        str(stage): ','.join(map(str, rnd.sample(range(1, num_groups + 1), rnd.randint(1, num_groups // 2))))
+        for stage in range(1, num_stages + 1)
+    }
+
+
+def calculate(stages: dict[str, str], check_with_supervisor: bool = False) -> BaseConflictsAndStagesCalculations:
+    calc = BaseConflictsAndStagesCalculations(stages)
+    calc.check_with_supervisor = check_with_supervisor
+    calc.processing_data_for_calculation()
+    calc.calculate_conflicts_and_stages()
+    return calc
+
+
+def test_get_bits():
+    assert get_bits(0b101001) == [0, 3, 5]
+    assert get_bits(0) == []
+
+
+def test_conflicts_matrix():
+    matrix = ConflictsMatrix({'1': {1, 2}, '2': {2, 3}, '3': {2}}, [1, 2, 3, 4])
+    assert matrix.get_enemy_groups(1) == {3, 4}
+    assert matrix.get_enemy_groups(2) == {4}
+    assert matrix.get_group_stages(2) == {'1', '2', '3'}
+    assert matrix.is_always_green(2) and not matrix.is_always_green(1)
+    assert matrix.is_always_red(4) and not matrix.is_always_red(3)
+    assert matrix.is_conflict(1, 3) and not matrix.is_conflict(1, 2) and not matrix.is_conflict(1, 1)
+
+
+def test_groups_property():
+    groups_property = calculate(raw_stages).instance_data[DataFields.groups_property.value]
+    assert sorted(groups_property) == list(range(1, 14))
+    assert groups_property[3] == {
+        DataFields.stages.value: {'1', '2', '3'},
+        DataFields.enemy_groups.value: {11, 12},
+        DataFields.always_red.value: False,
+        DataFields.always_green.value: False
+    }
+    assert groups_property[11][DataFields.always_red.value]
+    assert groups_property[11][DataFields.enemy_groups.value] == set(range(1, 14)) - {11}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_conflicts_match_supervisor(seed):
+    # Ошибка, если конфликты не совпадают с рассчитанными полным перебором
+    calculate(create_random_stages(48, 128, seed), check_with_supervisor=True)
+
+
+def test_build_data_with_float_groups():
+    calc = CommonConflictsAndStagesAPI({'1': '1,2,3.1', '2': '2,3.2'})
+    calc.build_data()
+    groups_property = calc.instance_data[DataFields.groups_property.value]
+    assert not calc.instance_data[DataFields.allow_make_config.value]
+    assert groups_property[3.1][DataFields.enemy_groups.value] == [3.2]
+    assert groups_property[2][DataFields.always_green.value]
+
+
+def test_output_data():
+    calc = OutputDataCalculations({'1': '1,2', '2': '2,3'})
+    calc.processing_data_for_calculation()
+    calc.calculate_conflicts_and_stages()
+    calc.create_data_for_output()
+    data = calc.instance_data
+    assert data[DataFields.output_matrix.value] == [
+        ['| *|', '|01|', '|02|', '|03|'],
+        ['|01|', '| *|', '| O|', '| K|'],
+        ['|02|', '| O|', '| *|', '| O|'],
+        ['|03|', '| K|', '| O|', '| *|'],
+    ]
+    assert data[DataFields.matrix_F997.value] == [
+        ['X;', '  . ;', '03.0;'],
+        ['  . ;', 'X;', '  . ;'],
+        ['03.0;', '  . ;', 'X;'],
+    ]
+    assert data[DataFields.numbers_conflicts_groups.value] == ['3;', ';', '1;']
+    assert data[DataFields.stages_bin_vals_f009.value] == '002;006;004;'
+    assert data[DataFields.sum_conflicts.value] == 2
+
+
+def test_stages_bin_vals_above_int64():
+    stages = {str(stage): '1' for stage in range(1, 71)}
+    stages['8'] = '1,2'
+    stages['70'] = '1,2'
+    calc = OutputDataCalculations(stages)
+    calc.processing_data_for_calculation()
+    calc.calculate_conflicts_and_stages()
+    calc.create_data_for_output()
+    assert calc.instance_data[DataFields.stages_bin_vals.value] == [
+        sum(2 ** stage for stage in range(1, 71) if stage != 8) + 1, 2 ** 70 + 1
+    ]
+
+
+src_ptc2 = (
+    'Header\n'
+    'NewSheet693  : Work.997\n;old;\n;old;\nNeXt\n'
+    'NewSheet693  : Work.001\n;old;\nNeXt\n'
+    'NewSheet693  : Work.006\n;old;\nNeXt\n'
+    'NewSheet693  : Work.009\n;001;;1;\nNeXt\n'
+    'Tail\n'
+)
+
+expected_ptc2 = (
+    'Header\n'
+    'NewSheet693  : Work.997\nX;  . ;03.0;\n  . ;X;  . ;\n03.0;  . ;X;\nNeXt\n'
+    'NewSheet693  : Work.001\n;old;\nNeXt\n'
+    'NewSheet693  : Work.006\nNeXt\n'
+    'NewSheet693  : Work.009\n;002;;1;\n;006;;1;\n;004;;1;\nNeXt\n'
+    'Tail\n'
+)
+
+
+def test_swarco_create_config(monkeypatch, tmp_path):
+    # build_data сохраняет conflicts.json в текущей директории
+    monkeypatch.chdir(tmp_path)
+    src = tmp_path / 'test.PTC2'
+    src.write_text(src_ptc2)
+    calc = SwarcoConflictsAndStagesAPI({'1': '1,2', '2': '2,3'}, path_to_src_config=str(src))
+    calc.build_data()
+    assert (tmp_path / 'new_test.PTC2').read_text() == expected_ptc2
+    assert calc.instance_data[DataFields.config_file.value][DataFields.created.value]
+
+
+@pytest.mark.parametrize('block_size', [1, 5, 17, 40])
+def test_swarco_config_chunks_across_blocks(block_size):
+    calc = SwarcoConflictsAndStagesAPI({'1': '1,2', '2': '2,3'})
+    for func in (calc.processing_data_for_calculation, calc.calculate_conflicts_and_stages, calc.create_data_for_output):
+        func()
+    assert ''.join(calc.iter_config_chunks(io.StringIO(src_ptc2), block_size=block_size)) == expected_ptc2
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_update_stage_matches_full_calculation(seed):
+    rnd = random.Random(seed)
+    # Номера групп не с 1: столбцы F997 соответствуют номерам групп, а не строкам матрицы
+    stages = {
+        str(stage): ','.join(map(str, rnd.sample(range(3, 20), rnd.randint(3, 8)))) for stage in range(1, 9)
+    }
+    calc = CommonConflictsAndStagesAPI(stages)
+    calc.build_data()
+    for _ in range(30):
+        stage = str(rnd.randint(1, 9))
+        groups = ','.join(map(str, rnd.sample(range(3, 20), rnd.randint(3, 10))))
+        stages[stage] = groups
+        calc.update_stage(stage, groups)
+        expected = CommonConflictsAndStagesAPI(dict(stages))
+        expected.build_data()
+        for field in (
+                DataFields.groups_property, DataFields.output_matrix, DataFields.matrix_F997,
+                DataFields.numbers_conflicts_groups, DataFields.stages_bin_vals, DataFields.stages_bin_vals_f009,
+                DataFields.sum_conflicts, DataFields.always_red_groups, DataFields.number_of_stages
+        ):
+            assert calc.instance_data[field.value] == expected.instance_data[field.value], field
+
+
+def test_update_stage_patches_only_stage_groups():
+    calc = CommonConflictsAndStagesAPI({'1': '1,2,3', '2': '3,4', '3': '5,6', '4': '1,6'})
+    calc.build_data()
+    matrix = calc.conflicts_matrix
+    assert calc.update_stage('2', '3,4,5') == {3, 4, 5}
+    # Матрица не создавалась заново
+    assert calc.conflicts_matrix is matrix
+    assert calc.instance_data[DataFields.groups_property.value][5][DataFields.enemy_groups.value] == [1, 2]
+    assert calc.instance_data[DataFields.numbers_conflicts_groups.value][4] == '1;2;'
+    # Новое направление меняет состав направлений, расчёт выполняется заново
+    assert calc.update_stage('2', '3,4,7') == set(range(1, 8))
+    assert calc.conflicts_matrix is not matrix
+    assert calc.instance_data[DataFields.type_controller.value] == CommonConflictsAndStagesAPI.controller_type
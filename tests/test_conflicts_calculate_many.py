@@ -0,0 +1,43 @@
+import pytest
+
+from sdp_lib.conflicts.calculate_conflicts import (
+    DataFields,
+    SwarcoConflictsAndStagesAPI
+)
+from sdp_lib.conflicts.calculate_many import calculate_many
+from tests.test_conflicts import create_random_stages
+
+
+configs = [create_random_stages(16, 8, seed) for seed in range(12)]
+
+
+def get_enemy_groups(data: dict) -> dict:
+    return {
+        group: properties[DataFields.enemy_groups.value]
+        for group, properties in data[DataFields.groups_property.value].items()
+    }
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_results_in_input_order(workers):
+    serial = calculate_many(configs, workers=1)
+    results = calculate_many(configs, workers=workers, shard_size=2)
+    assert len(results) == len(configs)
+    assert all(result.error is None for result in results)
+    assert [get_enemy_groups(r.data) for r in results] == [get_enemy_groups(r.data) for r in serial]
+    assert results[0].data['raw_stages_data'] == configs[0]
+
+
+def test_item_errors_do_not_abort_batch():
+    results = calculate_many([configs[0], None, {'1': '1,a'}, configs[1]], workers=2, shard_size=1)
+    assert results[0].error is None and results[3].error is None
+    assert results[1].data is None and results[1].error.startswith('AttributeError')
+    # Ошибки входных данных возвращаются в данных расчёта
+    assert results[2].error is None and results[2].data[DataFields.errors.value]
+
+
+def test_api_class(monkeypatch, tmp_path):
+    # SwarcoConflictsAndStagesAPI.build_data сохраняет conflicts.json в текущей директории
+    monkeypatch.chdir(tmp_path)
+    result, = calculate_many([configs[0]], api_class=SwarcoConflictsAndStagesAPI)
+    assert result.data[DataFields.type_controller.value] == 'Swarco'
@@ -0,0 +1,90 @@
+import pytest
+
+from sdp_lib.conflicts.calculate_conflicts import (
+    CommonConflictsAndStagesAPI,
+    DataFields
+)
+from sdp_lib.conflicts.results_cache import ConflictsResultsCache
+
+
+stages = {'1': '1,2,3', '2': '3,4', '3': '5,6', '4': '1,6'}
+
+output_fields = (
+    DataFields.groups_property, DataFields.output_matrix, DataFields.matrix_F997,
+    DataFields.numbers_conflicts_groups, DataFields.stages_bin_vals, DataFields.stages_bin_vals_f009,
+    DataFields.sum_conflicts, DataFields.always_red_groups
+)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ConflictsResultsCache(max_size=2)
+    monkeypatch.setattr(CommonConflictsAndStagesAPI, 'results_cache', cache)
+    return cache
+
+
+def build(stages_groups_data: dict[str, str]) -> CommonConflictsAndStagesAPI:
+    calc = CommonConflictsAndStagesAPI(stages_groups_data)
+    calc.build_data()
+    return calc
+
+
+def test_same_layout_is_calculated_once(cache):
+    expected = CommonConflictsAndStagesAPI(stages)
+    expected.results_cache = None
+    expected.build_data()
+
+    build(stages)
+    # Порядок фаз, порядок и повторы направлений не влияют на ключ
+    reordered = {'4': '6,1', '3': '6,5,5', '2': '4,3', '1': '3,2,1'}
+    calc = build(reordered)
+    assert cache.export() == {'size': 1, 'hits': 1, 'disk_hits': 0, 'misses': 1}
+    assert calc.instance_data['raw_stages_data'] is reordered
+    assert list(calc.instance_data[DataFields.sorted_stages_data.value]) == ['4', '3', '2', '1']
+    for field in output_fields:
+        assert calc.instance_data[field.value] == expected.instance_data[field.value], field
+
+
+def test_cached_result_is_not_shared(cache):
+    build(stages).update_stage('2', '3,4,5')
+    calc = build(stages)
+    assert cache.hits == 1
+    assert calc.instance_data[DataFields.groups_property.value][5][DataFields.enemy_groups.value] == [1, 2, 3, 4]
+    # Матрица из кэша позволяет обновлять фазу без полного расчёта
+    matrix = calc.conflicts_matrix
+    calc.update_stage('2', '3,4,5')
+    assert calc.conflicts_matrix is matrix
+
+
+def test_lru_eviction(cache):
+    other = {'1': '1,2', '2': '3'}
+    build(stages), build(other), build(stages)
+    build({'1': '1', '2': '2'})
+    # Вытеснен результат, использованный раньше остальных
+    build(other)
+    assert cache.export() == {'size': 2, 'hits': 1, 'disk_hits': 0, 'misses': 4}
+
+
+def test_key_depends_on_controller_type_and_group_type():
+    sorted_stages = {'1': {1, 2}, '2': {3}}
+    key = ConflictsResultsCache.make_key('Общий', sorted_stages)
+    assert key == ConflictsResultsCache.make_key('Общий', {'2': {3}, '1': {2, 1}})
+    assert key != ConflictsResultsCache.make_key('Swarco', sorted_stages)
+    assert key != ConflictsResultsCache.make_key('Общий', {'1': {1, 2.0}, '2': {3}})
+
+
+def test_disk_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(CommonConflictsAndStagesAPI, 'results_cache', ConflictsResultsCache(path=tmp_path))
+    expected = build(stages)
+    cache = ConflictsResultsCache(path=tmp_path)
+    monkeypatch.setattr(CommonConflictsAndStagesAPI, 'results_cache', cache)
+    calc = build(stages)
+    assert cache.export() == {'size': 1, 'hits': 1, 'disk_hits': 1, 'misses': 0}
+    for field in output_fields:
+        assert calc.instance_data[field.value] == expected.instance_data[field.value], field
+
+
+def test_errors_are_not_cached(cache):
+    calc = build({'1': '1,2', '2': 'x'})
+    assert calc.instance_data[DataFields.errors.value]
+    assert cache.export() == {'size': 0, 'hits': 0, 'disk_hits': 0, 'misses': 0}
@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from tests.recorded_peek_pages import (
+    inputs_page,
+    main_page
+)
+from sdp_lib.management_controllers.http.http_core import HttpSessionFactory
+from sdp_lib.management_controllers.http.peek import routes
+from sdp_lib.management_controllers.http.peek.peek_http import (
+    DataFromWeb,
+    PeekWebHosts
+)
+from sdp_lib.management_controllers.parsers.parsers_peek_http_new import (
+    InputsPageParser,
+    MainPageParser
+)
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+@pytest.mark.asyncio
+async def test_post_all_pages_limited_by_host_semaphore():
+    running, max_running, received = 0, 0, 0
+
+    async def handler(request):
+        nonlocal running, max_running, received
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(.02)
+        running -= 1
+        received += 1
+        return web.Response(text='ok')
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        async with HttpSessionFactory(limit_per_host=3) as session_factory:
+            host = PeekWebHosts('127.0.0.1', session_factory=session_factory)
+            host._base_url = f'http://127.0.0.1:{port}/'
+            start_time = time.perf_counter()
+            await host.post_all_pages(DataFromWeb.inputs_page_set, payload_data=[{'i': i} for i in range(12)])
+            elapsed = time.perf_counter() - start_time
+            assert not host.response_errors
+            assert received == 12
+            assert max_running == 3
+            assert elapsed < 1
+            assert host.driver is session_factory.get_session()
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_fetch_and_parse_stops_reading_after_stream_tables():
+    release = asyncio.Event()
+    tail_is_sent = None
+    head, sep, tail = main_page.encode().partition(b':BEGIN_TFT_ONLY\n')
+
+    async def handler(request):
+        nonlocal tail_is_sent
+        response = web.StreamResponse(headers={'Content-Type': 'text/html; charset=utf-8'})
+        await response.prepare(request)
+        if request.path.endswith(routes.get_inputs):
+            page = inputs_page.encode()
+            for start in range(0, len(page), 100):
+                await response.write(page[start: start + 100])
+        else:
+            # Кириллица разрезана между частями тела ответа
+            await response.write(head[:41])
+            await response.write(head[41:] + sep)
+            await release.wait()
+            try:
+                await response.write(tail)
+                tail_is_sent = True
+            except ConnectionResetError:
+                tail_is_sent = False
+                return response
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        async with HttpSessionFactory() as session_factory:
+            host = PeekWebHosts('127.0.0.1', session_factory=session_factory)
+            host._base_url = f'http://127.0.0.1:{port}/'
+            start_time = time.perf_counter()
+            await asyncio.wait_for(host.get_states(), 2)
+            assert time.perf_counter() - start_time < 1
+            assert not host.response_errors
+            assert host.response_data == MainPageParser().parse(main_page)
+            release.set()
+            await asyncio.sleep(.1)
+            assert tail_is_sent is False
+
+            host = PeekWebHosts('127.0.0.1', session_factory=session_factory)
+            host._base_url = f'http://127.0.0.1:{port}/'
+            await host.get_inputs()
+            assert not host.response_errors
+            assert host.response_data == InputsPageParser().parse(inputs_page)
+    finally:
+        release.set()
+        await runner.cleanup()
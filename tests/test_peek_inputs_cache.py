@@ -0,0 +1,178 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from tests.recorded_peek_pages import inputs_page
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.http.http_core import HttpSessionFactory
+from sdp_lib.management_controllers.http.peek import routes
+from sdp_lib.management_controllers.http.peek.inputs_cache import PeekInputsCache
+from sdp_lib.management_controllers.http.peek.inputs_table import (
+    actuators_chars,
+    get_actuator_code
+)
+from sdp_lib.management_controllers.http.peek.peek_http import PeekWebHosts
+from sdp_lib.management_controllers.http.peek.static_data import ActuatorAsValue
+from sdp_lib.management_controllers.http.peek.varbinds import (
+    InputsVarbinds,
+    inputs_prefix,
+    key_payload,
+    val_payload
+)
+from sdp_lib.management_controllers.parsers.parsers_peek_http_new import InputsPageParser
+from sdp_lib.management_controllers.structures import InputsStructure
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+inputs = InputsPageParser().parse(inputs_page)[str(FieldsNames.inputs)]
+
+
+def test_apply_payloads():
+    cache = PeekInputsCache()
+    version = cache.update('10.0.0.1', inputs)
+    varbinds = InputsVarbinds(inputs)
+    payloads = [
+        varbinds.create_payload(inputs['MPP_PH2'][InputsStructure.INDEX], ActuatorAsValue.ON),
+        varbinds.create_payload(inputs['MPP_MAN'][InputsStructure.INDEX], ActuatorAsValue.VF),
+    ]
+    assert cache.apply_payloads('10.0.0.1', payloads, version)
+    cached = cache.get('10.0.0.1')
+    assert cached.version == version + 1
+    assert cached.inputs['MPP_PH2'][InputsStructure.ACTUATOR] == 'ВКЛ'
+    assert cached.inputs['MPP_PH2'][InputsStructure.STATE] == '1'
+    assert cached.inputs['MPP_MAN'][InputsStructure.ACTUATOR] == '-'
+    assert cached.inputs['MPP_MAN'][InputsStructure.STATE] == '1'
+    assert inputs['MPP_PH2'][InputsStructure.ACTUATOR] == '-'
+
+    # Версия изменилась после формирования payloads
+    assert not cache.apply_payloads('10.0.0.1', payloads, version)
+    assert cache.get('10.0.0.1') is None
+    assert cache.get_version('10.0.0.1') == version + 1
+
+
+def test_stale_inputs():
+    cache = PeekInputsCache(max_age=0)
+    cache.update('10.0.0.1', inputs)
+    assert cache.get('10.0.0.1') is None
+
+
+class PeekInputsServer:
+    """ Имитация web страницы входов ДК Peek, применяющая установленные значения актуаторов. """
+
+    def __init__(self):
+        self.requests = []
+        self.post_status = 200
+        self.apply_posts = True
+        self.actuators = {}
+        self._runner: web.AppRunner | None = None
+        self.port = None
+
+    def render_inputs_page(self) -> str:
+        lines = []
+        for line in inputs_page.splitlines(keepends=True):
+            if line.startswith(':D;'):
+                index, num, name, state, _time, actuator = line.rstrip('\n').split(';')[1:]
+                actuator = self.actuators.get(index, actuator)
+                # Состояние входа при ВКЛ/ВЫКЛ следует актуатору
+                state = {'ВКЛ': '1', 'ВЫКЛ': '0'}.get(actuator, state)
+                line = f':D;{index};{num};{name};{state};{_time};{actuator}\n'
+            lines.append(line)
+        return ''.join(lines)
+
+    async def handler(self, request):
+        data = dict(await request.post())
+        self.requests.append((request.method, data))
+        if request.path.endswith(routes.get_inputs):
+            return web.Response(text=self.render_inputs_page(), content_type='text/html')
+        if self.post_status != 200:
+            return web.Response(status=self.post_status)
+        if self.apply_posts:
+            index = data[key_payload].removeprefix(inputs_prefix)
+            self.actuators[index] = actuators_chars[get_actuator_code(data[val_payload])]
+        return web.Response(text='ok')
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self.handler)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        await self._runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def peek_server():
+    server = PeekInputsServer()
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def create_host(peek_server):
+    async with HttpSessionFactory() as session_factory:
+        cache = PeekInputsCache()
+
+        def create_host():
+            host = PeekWebHosts('127.0.0.1', session_factory=session_factory)
+            host._base_url = f'http://127.0.0.1:{peek_server.port}/'
+            host.inputs_cache = cache
+            return host
+
+        yield create_host
+
+
+@pytest.mark.asyncio
+async def test_set_stage_uses_cached_inputs(peek_server, create_host):
+    host = await create_host().set_stage(3)
+    assert not host.response_errors
+    # MPP_MAN уже ВКЛ, устанавливается только MPP_PH3, затем MPP_PH3 читается с web страницы
+    assert [method for method, _ in peek_server.requests] == ['GET', 'POST', 'GET']
+    assert host.response_data[str(FieldsNames.inputs)]['MPP_PH3'][InputsStructure.ACTUATOR] == 'ВКЛ'
+
+    peek_server.requests.clear()
+    host = await create_host().set_stage(5)
+    assert not host.response_errors
+    assert [method for method, _ in peek_server.requests] == ['POST', 'POST', 'GET']
+    assert host.inputs_cache.get('127.0.0.1').version == 3
+
+    peek_server.requests.clear()
+    host = await create_host().set_stage(5)
+    assert peek_server.requests == []
+    assert host.response_data[str(FieldsNames.inputs)]['MPP_PH5'][InputsStructure.ACTUATOR] == 'ВКЛ'
+
+
+@pytest.mark.asyncio
+async def test_not_confirmed_inputs(peek_server, create_host):
+    await create_host().get_inputs()
+    peek_server.apply_posts = False
+    peek_server.requests.clear()
+
+    host = await create_host().set_stage(3)
+    assert host.response_errors
+    # После чтения затронутых входов состояние запрашивается полностью
+    assert [method for method, _ in peek_server.requests] == ['POST', 'GET', 'GET']
+    cached = host.inputs_cache.get('127.0.0.1')
+    assert cached is not None
+    assert cached.inputs['MPP_PH3'][InputsStructure.ACTUATOR] == '-'
+
+
+@pytest.mark.asyncio
+async def test_failed_post_refreshes_cache(peek_server, create_host):
+    host = await create_host().get_inputs()
+    version = host.inputs_cache.get_version('127.0.0.1')
+    peek_server.post_status = 500
+    peek_server.requests.clear()
+
+    host = await create_host().set_stage(3)
+    assert host.response_errors
+    assert [method for method, _ in peek_server.requests] == ['POST', 'GET']
+    # Кэш обновлён полученной web страницей входов
+    cached = host.inputs_cache.get('127.0.0.1')
+    assert cached is not None and cached.version == version + 1
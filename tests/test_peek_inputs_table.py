@@ -0,0 +1,66 @@
+from tests.recorded_peek_pages import inputs_page
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.http.peek.inputs_table import (
+    UNKNOWN,
+    InputsTable
+)
+from sdp_lib.management_controllers.http.peek.static_data import ActuatorAsValue
+from sdp_lib.management_controllers.http.peek.varbinds import (
+    InputsVarbinds,
+    inputs_prefix,
+    mpp_stages_inputs
+)
+from sdp_lib.management_controllers.parsers.parsers_peek_http_new import InputsPageParser
+
+
+inputs = InputsPageParser().parse(inputs_page)[str(FieldsNames.inputs)]
+
+
+def get_payloads_names(table, payloads):
+    return [
+        (table.names[table.get_row_by_index(inp.removeprefix(inputs_prefix))], str(val))
+        for (_, inp), (_, val) in payloads
+    ]
+
+
+def test_inputs_table():
+    table = InputsTable.from_dict(inputs)
+    assert len(table) == len(inputs)
+    assert table.as_dict() == inputs
+    assert table['MPP_MAN'] == inputs['MPP_MAN']
+    assert table.states[table.get_row('MPP_MAN')] == 1
+    assert table.actuators[table.get_row('MPP_MAN')] == int(ActuatorAsValue.ON)
+
+    stages_rows = table.get_rows(mpp_stages_inputs | {'NOT_EXISTS'})
+    assert [table.names[row] for row in stages_rows] == [f'MPP_PH{num}' for num in range(1, 9)]
+    table.set_actuator(table.get_row('MPP_PH2'), int(ActuatorAsValue.ON))
+    table.set_actuator(table.get_row('MPP_PH4'), int(ActuatorAsValue.ON))
+    assert [table.names[row] for row in table.select(stages_rows, actuator=ActuatorAsValue.ON)] == [
+        'MPP_PH2', 'MPP_PH4'
+    ]
+    assert table.select(stages_rows, state=1) == table.select(stages_rows, actuator=ActuatorAsValue.ON)
+    assert table['MPP_PH2'][3:] == ('1', inputs['MPP_PH2'][4], 'ВКЛ')
+    assert InputsTable.from_dict(inputs)['MPP_PH2'] == inputs['MPP_PH2']
+
+
+def test_inputs_table_unknown_values():
+    table = InputsTable([('0', '1', 'IN1', '?', '0', 'x')])
+    assert table.states[0] == UNKNOWN
+    assert table.actuators[0] == UNKNOWN
+    assert table['IN1'] == ('0', '1', 'IN1', '', '0', '')
+
+
+def test_inputs_varbinds():
+    table = InputsTable.from_dict(inputs)
+    table.set_actuator(table.get_row('MPP_PH2'), int(ActuatorAsValue.ON))
+    varbinds = InputsVarbinds(table)
+
+    assert get_payloads_names(table, varbinds.get_varbinds_set_stage(3)) == [('MPP_PH2', '1'), ('MPP_PH3', '2')]
+    assert get_payloads_names(table, varbinds.get_varbinds_set_stage(2)) == []
+    assert get_payloads_names(table, varbinds.get_varbinds_set_stage(0)) == [('MPP_MAN', '1'), ('MPP_PH2', '0')]
+    assert get_payloads_names(
+        table, varbinds.get_varbinds_as_from_name({'MPP_PH2': 'ВКЛ', 'MPP_PH3': '2', 'NOT_EXISTS': '2'})
+    ) == [('MPP_PH3', '2')]
+    assert InputsVarbinds(inputs).get_varbinds_set_stage(3) == InputsVarbinds(
+        InputsTable.from_dict(inputs)
+    ).get_varbinds_set_stage(3)
@@ -0,0 +1,87 @@
+import pytest
+
+from tests.recorded_peek_pages import (
+    build_main_page_with_streams,
+    inputs_page,
+    main_page
+)
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.parsers.parsers_peek_http_new import (
+    InputsPageParser,
+    MainPageParser
+)
+
+
+def build_xp_data(xp, status, mode, stage):
+    return {
+        str(FieldsNames.curr_xp): xp,
+        str(FieldsNames.curr_status): status,
+        str(FieldsNames.curr_mode): mode,
+        str(FieldsNames.curr_stage): stage,
+    }
+
+
+main_page_expected = {
+    str(FieldsNames.curr_address): 'Moscow: Панфиловс пр / Андреевка',
+    str(FieldsNames.curr_plan): '005',
+    str(FieldsNames.curr_plan_param): '005',
+    str(FieldsNames.curr_time): '2025-03-01 16:08:41',
+    str(FieldsNames.curr_alarms): 'ISWC',
+    str(FieldsNames.num_streams): 2,
+    str(FieldsNames.streams_data): [
+        build_xp_data('1', 'УПРАВЛЕНИЕ', 'FT', '3'),
+        build_xp_data('2', 'УПРАВЛЕНИЕ', 'FT', '6'),
+    ]
+}
+
+
+@pytest.mark.parametrize('content', [main_page, main_page.replace('\n', '\r\n')])
+def test_main_page_parser(content):
+    parser = MainPageParser()
+    assert parser.parse(content) == main_page_expected
+    assert parser.all_xp_data == [('1', 'УПРАВЛЕНИЕ', 'FT', '3'), ('2', 'УПРАВЛЕНИЕ', 'FT', '6')]
+
+
+def test_main_page_parser_many_streams():
+    data = MainPageParser().parse(build_main_page_with_streams(4))
+    assert data[str(FieldsNames.num_streams)] == 4
+    assert data[str(FieldsNames.streams_data)][3] == build_xp_data('4', 'УПРАВЛЕНИЕ', 'VA', '5')
+
+
+def test_main_page_parser_missing_values():
+    content = (
+        main_page
+        .replace(':D;;##T_PLAN##;005 -             ', ':D;;##T_PLAN##;')
+        .replace(':D;;##T_MODE## (##T_STAGE##);FT (6)', ':D;;##T_MODE## (##T_STAGE##);')
+    )
+    data = MainPageParser().parse(content)
+    assert data[str(FieldsNames.curr_plan)] is None
+    assert data[str(FieldsNames.streams_data)][1] == build_xp_data('2', 'УПРАВЛЕНИЕ', None, None)
+
+
+def test_main_page_parser_ignores_tft_only_section():
+    content = main_page.replace(':END_TFT_ONLY', '<b>##T_STREAM## 3</b>\n:END_TFT_ONLY')
+    assert MainPageParser().parse(content) == main_page_expected
+
+
+def feed_by_chunks(parser, content: str, chunk_size: int) -> int:
+    """ Передаёт content парсеру частями по chunk_size символов, возвращает количество переданных символов. """
+    for start in range(0, len(content), chunk_size):
+        if parser.feed(content[start: start + chunk_size]):
+            return start + chunk_size
+    return len(content)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 10 ** 6])
+def test_main_page_parser_feed(chunk_size):
+    parser = MainPageParser()
+    fed = feed_by_chunks(parser, main_page, chunk_size)
+    assert parser.close() == main_page_expected
+    assert fed < main_page.index(':BEGIN_TFT_ONLY') + len(':BEGIN_TFT_ONLY') + chunk_size + 1
+
+
+@pytest.mark.parametrize('chunk_size', [1, 13, 10 ** 6])
+def test_inputs_page_parser_feed(chunk_size):
+    parser = InputsPageParser()
+    assert feed_by_chunks(parser, inputs_page.rstrip('\n'), chunk_size) == len(inputs_page.rstrip('\n'))
+    assert parser.close() == InputsPageParser().parse(inputs_page)
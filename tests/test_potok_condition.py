@@ -0,0 +1,61 @@
+import itertools
+import random
+
+import pytest
+
+from sdp_lib.potok_controller.potok_user_api import (
+    ConditionResult,
+    compile
+)
+
+
+conditions = (
+    '(ddr(D33) or ddr(D34) or ddr(D35) or ddr(D36)) and (fctg(G1)<66)',
+    'ddr(D4) or ddr(D5) or ddr(D6) or ddr(D7) and mr(G1)',
+    'not ddr(D1) and not (ddr(D2) or mr(G3)) or ngp(D4)',
+    '(ddr(D41) and (ddr(D41) or ddo(D45)) or (not ddr(D43) and ddr(D44)) and mr(G1)) and fctg(G1) >= 40',
+)
+
+
+def parse_with_values(condition_string: str, values: dict[str, int]) -> bool:
+    condition = ConditionResult(condition_string)
+    return condition.get_condition_result(condition.func_to_val(values))
+
+
+@pytest.mark.parametrize('condition_string', conditions)
+def test_compiled_condition_matches_parser(condition_string):
+    compiled = compile(condition_string)
+    for vals in itertools.product((0, 1), repeat=len(compiled.tokens)):
+        values = dict(zip(compiled.tokens, vals))
+        expected = parse_with_values(condition_string, values)
+        assert compiled(values) is expected
+        assert compiled(vals) is expected
+
+
+def test_shared_tokens_order():
+    all_tokens = ['mr(G1)', 'ddr(D1)', 'ddr(D2)', 'ddr(D3)']
+    first, second = compile('ddr(D1) and mr(G1)', all_tokens), compile('ddr(D2) or not ddr(D3)', all_tokens)
+    snapshot = [1, 1, 0, 1]
+    assert first(snapshot) is True and second(snapshot) is False
+    with pytest.raises(ValueError):
+        compile('ddr(D4) and mr(G1)', all_tokens)
+
+
+@pytest.mark.parametrize('condition_string', ('ddr(D21) ddr(D22)', '(ddr(D1)', 'ddr(D1) or %', ''))
+def test_invalid_condition(condition_string):
+    with pytest.raises(ValueError):
+        compile(condition_string)
+
+
+def test_condition_result_uses_compiled_condition():
+    condition = ConditionResult(conditions[0])
+    rnd = random.Random(0)
+    for _ in range(10):
+        values = {token: rnd.randint(0, 1) for token in compile(conditions[0]).tokens}
+        assert condition.get_condition_result(values) is parse_with_values(conditions[0], values)
+        assert ConditionResult(conditions[0]).func_to_val(values) in repr(condition)
+    assert condition.compiled_condition is not None
+    with pytest.raises(ValueError):
+        condition.get_condition_result({'ddr(D33)': 1})
+    with pytest.raises(ValueError):
+        condition.get_condition_result({'ddr(D33)': '1'})
@@ -0,0 +1,60 @@
+import pytest
+from pysnmp.entity.engine import SnmpEngine
+from pysnmp.proto import errind
+
+from tests.snmp_responder import start_responder
+from sdp_lib.management_controllers.snmp.rtt_estimator import (
+    RttEstimator,
+    get_rtt_estimators
+)
+from sdp_lib.management_controllers.snmp.snmp_batch import enable_batch_mode
+from sdp_lib.management_controllers.snmp.snmp_core import SwarcoStcip
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+def test_rto_follows_rtt():
+    estimator = RttEstimator()
+    assert estimator.timeout == 1
+    estimator.add_sample(.1)
+    assert (estimator.srtt, estimator.rttvar) == (.1, .05)
+    assert estimator.rto == pytest.approx(.3)
+    assert estimator.timeout == .3
+    for _ in range(50):
+        estimator.add_sample(.01)
+    assert estimator.rto == .2
+    estimator.add_sample(.213)
+    assert estimator.timeout in (.25, .3, .35, .4, .45, .5)
+    assert round(estimator.timeout / .05, 6).is_integer()
+
+
+def test_backoff_and_unreachable():
+    estimator = RttEstimator(max_rto=3, unreachable_threshold=3, unreachable_timeout=.1)
+    estimator.add_response(errind.requestTimedOut, 1)
+    assert estimator.timeout == 2
+    estimator.add_response(errind.requestTimedOut, 2)
+    assert estimator.timeout == 3
+    estimator.add_response(errind.requestTimedOut, 3)
+    assert estimator.is_unreachable and estimator.timeout == .1
+    estimator.add_response(None, .05, retries=1)
+    assert not estimator.is_unreachable and estimator.samples == 0
+    estimator.add_response(None, .05)
+    assert estimator.samples == 1
+    assert estimator.as_dict()['timeouts'] == 3
+
+
+@pytest.mark.asyncio
+async def test_snmp_requests_update_estimator():
+    transport, _ = await start_responder('127.0.0.1', 0)
+    engine = SnmpEngine()
+    batch_engine = enable_batch_mode(engine, port=transport.get_extra_info('sockname')[1])
+    try:
+        host = await SwarcoStcip(ipv4='127.0.0.1', engine=engine).get_states()
+        assert not host.response_errors
+        exported = get_rtt_estimators(engine).export()
+        assert exported['127.0.0.1']['samples'] == 1
+        assert exported['127.0.0.1']['timeout'] == .2
+    finally:
+        batch_engine.close()
+        transport.close()
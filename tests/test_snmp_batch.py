@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from pysnmp.entity.engine import SnmpEngine
+from pysnmp.proto import errind
+
+from tests.snmp_responder import (
+    SnmpResponderProtocol,
+    start_responder
+)
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.snmp.snmp_batch import (
+    BatchSnmpEngine,
+    enable_batch_mode,
+    get_batch_engine
+)
+from sdp_lib.management_controllers.snmp.snmp_core import SwarcoStcip
+from sdp_lib.management_controllers.snmp.snmp_utils import swarco_stcip_varbinds
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+class DroppingProtocol(SnmpResponderProtocol):
+    """ Принимает запросы и не отвечает на них. """
+
+    def datagram_received(self, data, addr):
+        self.received += 1
+
+
+async def start(protocol_factory) -> tuple[asyncio.DatagramTransport, SnmpResponderProtocol, int]:
+    transport, protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+        protocol_factory, local_addr=('127.0.0.1', 0)
+    )
+    return transport, protocol, transport.get_extra_info('sockname')[1]
+
+
+@pytest.mark.asyncio
+async def test_get_matches_responses_by_request_id():
+    transport, protocol = await start_responder('127.0.0.1', 0)
+    batch_engine = BatchSnmpEngine(port=transport.get_extra_info('sockname')[1])
+    try:
+        varbinds = swarco_stcip_varbinds.get_varbinds_current_states()
+        results = await asyncio.gather(
+            *(batch_engine.get('127.0.0.1', 'public', varbinds[:i], timeout=1) for i in range(1, 8))
+        )
+        for i, (error_indication, error_status, error_index, var_binds) in enumerate(results, 1):
+            assert error_indication is None and not error_status and not error_index
+            assert len(var_binds) == i
+            assert [str(oid) for oid, _ in var_binds] == [str(oid) for oid, _ in varbinds[:i]]
+            assert all(val.prettyPrint() == '1' for _, val in var_binds)
+        assert protocol.received == 7
+        assert len(batch_engine) == 0
+    finally:
+        batch_engine.close()
+        transport.close()
+
+
+@pytest.mark.asyncio
+async def test_get_timeout_with_retries():
+    transport, protocol, port = await start(DroppingProtocol)
+    batch_engine = BatchSnmpEngine(port=port)
+    try:
+        varbinds = swarco_stcip_varbinds.get_varbinds_current_states()
+        error_indication, *_, var_binds = await batch_engine.get('127.0.0.1', 'public', varbinds, timeout=.05, retries=2)
+        assert isinstance(error_indication, errind.RequestTimedOut)
+        assert var_binds == ()
+        assert protocol.received == 3
+    finally:
+        batch_engine.close()
+        transport.close()
+
+
+@pytest.mark.asyncio
+async def test_snmp_requests_use_batch_engine():
+    transport, protocol = await start_responder('127.0.0.1', 0)
+    engine = SnmpEngine()
+    batch_engine = enable_batch_mode(engine, port=transport.get_extra_info('sockname')[1])
+    assert get_batch_engine(engine) is batch_engine
+    try:
+        host = await SwarcoStcip(ipv4='127.0.0.1', engine=engine).get_states()
+        assert not host.response_errors
+        assert host.response_data[FieldsNames.curr_status] == str(FieldsNames.three_light)
+        assert protocol.received == 1
+    finally:
+        batch_engine.close()
+        transport.close()
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from pysnmp.entity.engine import SnmpEngine
+
+from sdp_lib.management_controllers.constants import AllowedControllers
+from sdp_lib.management_controllers.exceptions import BadControllerType
+from sdp_lib.management_controllers.snmp import snmp_core
+from sdp_lib.management_controllers.snmp.snmp_batch import (
+    disable_batch_mode,
+    enable_batch_mode,
+    get_batch_engine
+)
+from sdp_lib.management_controllers.snmp.snmp_fleet import FleetPoller
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+records = [
+    (AllowedControllers.SWARCO, '10.0.0.1', '1'),
+    (AllowedControllers.POTOK_S, '10.0.0.2', '2'),
+    (AllowedControllers.POTOK_P, '10.0.0.3', '3'),
+    (AllowedControllers.PEEK, '10.0.0.4', '4'),
+]
+
+
+def test_add_hosts_shares_engine():
+    engine = SnmpEngine()
+    poller = FleetPoller(records, engine=engine)
+    assert len(poller) == 4
+    assert [type(h) for h in poller.hosts] == [
+        snmp_core.SwarcoStcip, snmp_core.PotokS, snmp_core.PotokP, snmp_core.PeekUg405
+    ]
+    assert all(h.driver is engine for h in poller.hosts)
+
+
+def test_close_disables_only_own_batch_mode():
+    engine = SnmpEngine()
+    batch_engine = enable_batch_mode(engine)
+    FleetPoller(records, engine=engine, batch=True).close()
+    FleetPoller(records, engine=engine).close()
+    assert get_batch_engine(engine) is batch_engine
+    disable_batch_mode(engine)
+
+    poller = FleetPoller(records, batch=True)
+    assert get_batch_engine(poller.engine) is not None
+    poller.close()
+    assert get_batch_engine(poller.engine) is None
+
+
+def test_bad_controller_type():
+    with pytest.raises(BadControllerType):
+        FleetPoller([('Unknown', '10.0.0.1', '1')])
+
+
+@pytest.mark.asyncio
+async def test_poll_streams_results_with_concurrency_limit(monkeypatch):
+    running, max_running = 0, 0
+
+    async def get_states(self):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(.01 * int(self.host_id))
+        running -= 1
+        self.add_data_to_data_response_attrs(data={'host_id': self.host_id})
+        return self
+
+    monkeypatch.setattr(snmp_core.StcipHosts, 'get_states', get_states)
+    poller = FleetPoller(
+        ((AllowedControllers.SWARCO, f'10.0.0.{i}', str(i)) for i in range(10, 0, -1)),
+        max_concurrent=3
+    )
+    for _ in range(2):
+        hosts = [host async for host in poller.poll()]
+        assert sorted(h.host_id for h in hosts) == sorted(str(i) for i in range(1, 11))
+        assert all(h.response_data == {'host_id': h.host_id} for h in hosts)
+    assert max_running == 3
+
+
+@pytest.mark.asyncio
+async def test_poll_continues_after_host_exception(monkeypatch):
+    async def get_states(self):
+        if self.host_id == '1':
+            raise ValueError('bad response')
+        await asyncio.sleep(.01)
+        self.add_data_to_data_response_attrs(data={'host_id': self.host_id})
+        return self
+
+    monkeypatch.setattr(snmp_core.StcipHosts, 'get_states', get_states)
+    poller = FleetPoller((AllowedControllers.SWARCO, f'10.0.0.{i}', str(i)) for i in range(1, 4))
+    hosts = {host.host_id: host async for host in poller.poll()}
+    assert sorted(hosts) == ['1', '2', '3']
+    assert [type(e) for e in hosts['1'].response_errors] == [ValueError]
+    assert all(hosts[i].response_data == {'host_id': i} and not hosts[i].response_errors for i in ('2', '3'))
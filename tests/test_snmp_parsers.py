@@ -0,0 +1,112 @@
+import pytest
+from pysnmp.proto.rfc1902 import (
+    Integer32,
+    ObjectName,
+    OctetString,
+    Unsigned32
+)
+from pysnmp.proto.rfc1905 import noSuchInstance
+from pysnmp.smi import (
+    builder,
+    view
+)
+from pysnmp.smi.rfc1902 import (
+    ObjectIdentity,
+    ObjectType
+)
+
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.parsers.snmp_parsers.processing_methods import (
+    build_func_with_remove_scn,
+    decode_val_by_type,
+    get_val_as_str
+)
+from sdp_lib.management_controllers.parsers.snmp_parsers.varbinds_parsers import (
+    ParsersVarbindsPotokP,
+    ParsersVarbindsPotokS,
+    ParsersVarbindsSwarco,
+    pretty_processing_stcip
+)
+from sdp_lib.management_controllers.snmp.oids import Oids
+from sdp_lib.management_controllers.snmp.snmp_utils import convert_chars_string_to_ascii_string
+
+
+mib_view_controller = view.MibViewController(builder.MibBuilder())
+scn = convert_chars_string_to_ascii_string('CO3995')
+
+
+def build_varbinds(oids_and_values):
+    return tuple(
+        ObjectType(ObjectIdentity(ObjectName(str(oid))), val).resolve_with_mib(mib_view_controller)
+        for oid, val in oids_and_values
+    )
+
+
+pretty_processing_ug405 = pretty_processing_stcip._replace(
+    oid_handler=build_func_with_remove_scn(scn, get_val_as_str),
+    host_protocol=FieldsNames.protocol_ug405,
+    oid_suffix=scn
+)
+
+
+@pytest.mark.parametrize(
+    'parser_class, config, oids_and_values',
+    [
+        (
+            ParsersVarbindsSwarco,
+            pretty_processing_stcip,
+            (
+                (Oids.swarcoUTCTrafftechFixedTimeStatus, Integer32(0)),
+                (Oids.swarcoUTCTrafftechPlanSource, Integer32(7)),
+                (Oids.swarcoUTCStatusEquipment, Integer32(1)),
+                (Oids.swarcoUTCTrafftechPhaseStatus, Integer32(3)),
+                (Oids.swarcoUTCTrafftechPlanCurrent, Integer32(5)),
+                (Oids.swarcoUTCDetectorQty, Integer32(12)),
+                (Oids.swarcoSoftIOStatus, OctetString('0' * 179 + '10')),
+                ('1.3.6.1.4.1.1618.3.99.1.0', noSuchInstance),
+            )
+        ),
+        (
+            ParsersVarbindsPotokS,
+            pretty_processing_stcip,
+            (
+                (Oids.swarcoUTCStatusEquipment, Integer32(3)),
+                (Oids.swarcoUTCTrafftechPhaseStatus, Integer32(4)),
+                (Oids.swarcoUTCTrafftechPlanCurrent, Integer32(2)),
+                (Oids.swarcoUTCStatusMode, Integer32(8)),
+                (Oids.swarcoUTCDetectorQty, Unsigned32(4)),
+            )
+        ),
+        (
+            ParsersVarbindsPotokP,
+            pretty_processing_ug405,
+            (
+                (Oids.utcType2OperationMode, Integer32(1)),
+                (f'{Oids.potokP_utcReplyDarkStatus}{scn}', Integer32(0)),
+                (f'{Oids.utcReplyFR}{scn}', Integer32(0)),
+                (f'{Oids.utcReplyGn}{scn}', OctetString(hexValue='0400')),
+                (f'{Oids.potokP_utcReplyPlanStatus}{scn}', Integer32(3)),
+                (f'{Oids.potokP_utcReplyLocalAdaptiv}{scn}', Integer32(1)),
+                (Oids.utcType2ScootDetectorCount, Integer32(8)),
+                (f'{Oids.utcReplyDF}{scn}', Integer32(0)),
+                (f'{Oids.utcReplyMC}{scn}', Integer32(0)),
+            )
+        ),
+    ]
+)
+def test_parse_compiled_equals_parse(parser_class, config, oids_and_values):
+    varbinds = build_varbinds(oids_and_values)
+    expected = parser_class().parse(varbinds=varbinds, config=config._replace(compiled=False))
+    assert parser_class().parse(varbinds=varbinds, config=config) == expected
+    assert expected[FieldsNames.curr_stage] is not None
+
+
+@pytest.mark.parametrize(
+    'val',
+    [
+        Integer32(-5), Unsigned32(7), OctetString('CO3995'), OctetString(hexValue='00ff'),
+        OctetString(''), OctetString(hexValue='7f'), noSuchInstance
+    ]
+)
+def test_decode_val_by_type(val):
+    assert decode_val_by_type(val) == val.prettyPrint()
@@ -0,0 +1,52 @@
+import pytest
+from pysnmp.entity.engine import SnmpEngine
+
+from sdp_lib.management_controllers.snmp.snmp_requests import (
+    TransportTargetsCache,
+    get_transport_targets_cache
+)
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+def test_cache_owned_by_engine():
+    engine = SnmpEngine()
+    assert get_transport_targets_cache(engine) is get_transport_targets_cache(engine)
+    assert get_transport_targets_cache(engine) is not get_transport_targets_cache(SnmpEngine())
+
+
+@pytest.mark.asyncio
+async def test_transport_targets_cache_lru_and_ttl():
+    cache = TransportTargetsCache(maxsize=2)
+    target = await cache.get('127.0.0.1', 1, 0)
+    assert await cache.get('127.0.0.1', 1, 0) is target
+    assert await cache.get('127.0.0.1', 1, 1) is not target
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    await cache.get('127.0.0.2', 1, 0)
+    assert len(cache) == 2
+    assert await cache.get('127.0.0.1', 1, 0) is not target
+
+    cache.invalidate('127.0.0.1')
+    assert len(cache) == 1
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+    expired = TransportTargetsCache(ttl=0)
+    target = await expired.get('127.0.0.1', 1, 0)
+    assert await expired.get('127.0.0.1', 1, 0) is not target
+
+
+@pytest.mark.asyncio
+async def test_transport_targets_cache_updates_timeout():
+    cache = TransportTargetsCache(maxsize=2)
+    target = await cache.get('127.0.0.1', .2, 0)
+    await cache.get('127.0.0.2', .2, 0)
+    # Таймаут из оценки RTT меняется с шагом RttEstimator, транспорт хоста при этом не пересоздаётся
+    for timeout in (.25, .3, .35, .2):
+        assert await cache.get('127.0.0.1', timeout, 0) is target
+        assert target.timeout == timeout
+    await cache.get('127.0.0.2', .3, 0)
+    assert (cache.hits, cache.misses, len(cache)) == (5, 2, 2)
@@ -0,0 +1,145 @@
+import pytest
+from pysnmp.proto.rfc1902 import (
+    Integer32,
+    ObjectName,
+    OctetString
+)
+from pysnmp.proto.rfc1905 import noSuchInstance
+from pysnmp.smi import (
+    builder,
+    view
+)
+
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.snmp import oids
+from sdp_lib.management_controllers.snmp.snmp_core import PotokP
+from sdp_lib.management_controllers.snmp.snmp_requests import SnmpRequests
+from sdp_lib.management_controllers.snmp.snmp_utils import (
+    ScnCache,
+    convert_chars_string_to_ascii_string
+)
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+mib_view_controller = view.MibViewController(builder.MibBuilder())
+
+
+class FakePotokP:
+    """ Имитация ответов ДК Поток(P) с заданным scn. """
+
+    def __init__(self, scn_as_chars: str):
+        self.scn_as_chars = scn_as_chars
+        self.requests = []
+
+    async def snmp_get(self, sender, varbinds, timeout=1, retries=0):
+        self.requests.append(varbinds)
+        scn = convert_chars_string_to_ascii_string(self.scn_as_chars)
+        var_binds = []
+        for varbind in varbinds:
+            oid = str(varbind.resolve_with_mib(mib_view_controller)[0])
+            if oid == oids.Oids.utcReplySiteID:
+                var_binds.append((ObjectName(oid), OctetString(self.scn_as_chars)))
+            elif any(oid.startswith(missing_oid) for missing_oid in self.missing_oids):
+                var_binds.append((ObjectName(oid), noSuchInstance))
+            elif oid == f'{oids.Oids.utcReplyGn}{scn}':
+                var_binds.append((ObjectName(oid), OctetString(hexValue='04')))
+            elif oid.endswith(scn) or oid in set(oids.Oids):
+                var_binds.append((ObjectName(oid), Integer32(1)))
+            else:
+                var_binds.append((ObjectName(oid), noSuchInstance))
+        return None, 0, 0, tuple(var_binds)
+
+    async def snmp_set(self, sender, varbinds, timeout=1, retries=0):
+        self.set_requests.append(varbinds)
+        scn = convert_chars_string_to_ascii_string(self.scn_as_chars)
+        var_binds = [varbind.resolve_with_mib(mib_view_controller) for varbind in varbinds]
+        if self.reject_set or any(
+            not str(oid).endswith(scn) and str(oid) not in set(oids.Oids) for oid, _ in var_binds
+        ):
+            # noSuchName
+            return None, 2, 1, tuple(var_binds)
+        return None, 0, 0, tuple(var_binds)
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    controller = FakePotokP('CO1')
+    controller.set_requests, controller.reject_set, controller.missing_oids = [], False, ()
+    monkeypatch.setattr(SnmpRequests, 'snmp_get', lambda s, *a, **kw: controller.snmp_get(s, *a, **kw))
+    monkeypatch.setattr(SnmpRequests, 'snmp_set', lambda s, *a, **kw: controller.snmp_set(s, *a, **kw))
+    monkeypatch.setattr(PotokP, 'scn_cache', ScnCache())
+    return controller
+
+
+@pytest.mark.asyncio
+async def test_get_states_uses_cached_scn(controller):
+    host = await PotokP(ipv4='10.0.0.1').get_states()
+    assert not host.response_errors
+    assert host.response_data[FieldsNames.curr_stage] == 3
+    assert len(controller.requests) == 2
+
+    host = await PotokP(ipv4='10.0.0.1').get_states()
+    assert not host.response_errors
+    assert host.scn_as_chars == 'CO1'
+    assert len(controller.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_scn_is_invalidated(controller):
+    await PotokP(ipv4='10.0.0.1').get_states()
+    controller.scn_as_chars = 'CO2'
+    controller.requests.clear()
+
+    host = await PotokP(ipv4='10.0.0.1').get_states()
+    assert not host.response_errors
+    assert host.scn_as_chars == 'CO2'
+    assert host.response_data[FieldsNames.curr_stage] == 3
+    assert len(controller.requests) == 3
+    assert PotokP.scn_cache.get('10.0.0.1') == ('CO2', convert_chars_string_to_ascii_string('CO2'))
+
+
+@pytest.mark.asyncio
+async def test_set_refreshes_scn_before_write(controller):
+    await PotokP(ipv4='10.0.0.1').get_states()
+    controller.scn_as_chars = 'CO2'
+    controller.requests.clear()
+
+    host = await PotokP(ipv4='10.0.0.1').set_stage(2)
+    assert not host.response_errors
+    assert host.scn_as_chars == 'CO2'
+    # scn запрошен у хоста до записи, запись отправлена один раз
+    assert len(controller.requests) == 1
+    assert len(controller.set_requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_set_is_not_resent(controller):
+    await PotokP(ipv4='10.0.0.1').get_states()
+    controller.reject_set = True
+
+    host = await PotokP(ipv4='10.0.0.1').set_stage(2)
+    assert host.response_errors
+    assert len(controller.set_requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_partial_response_is_parsed(controller):
+    controller.missing_oids = (oids.Oids.utcReplyFR, )
+    host = await PotokP(ipv4='10.0.0.1').get_states()
+    assert not host.response_errors
+    assert host.response_data[FieldsNames.curr_stage] == 3
+    assert len(controller.requests) == 2
+
+    # С scn из кэша ответ с noSuchInstance запрашивается повторно с актуальным scn
+    host = await PotokP(ipv4='10.0.0.1').get_states()
+    assert not host.response_errors
+    assert host.response_data[FieldsNames.curr_stage] == 3
+    assert len(controller.requests) == 5
+
+
+def test_scn_cache_ttl():
+    cache = ScnCache(ttl=0)
+    cache.add('10.0.0.1', 'CO1', convert_chars_string_to_ascii_string('CO1'))
+    assert cache.get('10.0.0.1') is None
+    assert len(cache) == 0
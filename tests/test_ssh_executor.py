@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from sdp_lib.management_controllers.ssh import ssh_core
+from sdp_lib.management_controllers.ssh.ssh_core import SshSessionPool
+from sdp_lib.management_controllers.ssh.ssh_executor import SshExecutor
+from sdp_lib.management_controllers.ssh.swarco_terminal import matches_stage_to_num_inp
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+def test_max_concurrent_not_above_pool_size():
+    with pytest.raises(ValueError):
+        SshExecutor(max_concurrent=5, session_pool=SshSessionPool(max_sessions=4))
+
+
+@pytest.mark.asyncio
+async def test_serializes_host_and_limits_fleet(monkeypatch):
+    running: dict[str, int] = {}
+    max_running, max_running_per_host = 0, 0
+    calls = []
+
+    async def set_stage(self, stage):
+        nonlocal max_running, max_running_per_host
+        running[self.ip_v4] = running.get(self.ip_v4, 0) + 1
+        max_running = max(max_running, sum(running.values()))
+        max_running_per_host = max(max_running_per_host, running[self.ip_v4])
+        await asyncio.sleep(.01)
+        calls.append((self.ip_v4, stage))
+        running[self.ip_v4] -= 1
+        return self
+
+    monkeypatch.setattr(ssh_core.SwarcoSSH, 'set_stage', set_stage)
+    executor = SshExecutor(max_concurrent=3, session_pool=SshSessionPool())
+    stages = [(f'10.0.0.{i % 5}', stage) for i, stage in enumerate(range(1, 16))]
+    hosts = await executor.set_stage_many(stages)
+    assert len(hosts) == 15
+    assert max_running == 3
+    assert max_running_per_host == 1
+    # Операции одного хоста выполняются в порядке поступления
+    for ipv4 in {ipv4 for ipv4, _ in stages}:
+        assert [s for i, s in calls if i == ipv4] == [s for i, s in stages if i == ipv4]
+    export = executor.export()
+    assert sorted(export) == [f'10.0.0.{i}' for i in range(5)]
+    assert all(latency['operations'] == 3 and latency['errors'] == 0 for latency in export.values())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_operations_on_one_shell(itc_server):
+    pool = SshSessionPool(port=itc_server.port)
+    executor = SshExecutor(session_pool=pool)
+    try:
+        hosts = await asyncio.gather(
+            executor.set_stage('127.0.0.1', 2),
+            executor.get_states('127.0.0.1'),
+            executor.set_stage('127.0.0.1', 4),
+        )
+        assert not any(host.response_errors for host in hosts)
+        assert hosts[1].response_data['states_after_shell_session']['instat102'][-1][2:] == '01000000'
+        assert itc_server.inputs[matches_stage_to_num_inp[4]] == 1
+        assert itc_server.inputs[matches_stage_to_num_inp[2]] == 0
+        assert itc_server.connections == 1
+        assert executor.export()['127.0.0.1']['operations'] == 3
+    finally:
+        pool.close()
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from sdp_lib.management_controllers.ssh.ssh_core import (
+    SshSessionPool,
+    SwarcoSSH,
+    read_until_prompt
+)
+from sdp_lib.management_controllers.ssh.swarco_terminal import (
+    login_commands,
+    matches_stage_to_num_inp,
+    split_stdout_by_commands
+)
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+class ChunksStream:
+
+    def __init__(self, *chunks: str):
+        self._chunks = list(chunks)
+
+    async def read(self, bufsize: int) -> str:
+        if self._chunks:
+            return self._chunks.pop(0)
+        await asyncio.sleep(3600)
+
+
+@pytest.mark.asyncio
+async def test_read_until_prompt_split_between_chunks():
+    stream = ChunksStream('instat102 ?\r\n 68: 0000\r\n&', '&>', '  ', 'not read')
+    assert await read_until_prompt(stream, timeout=1) == 'instat102 ?\r\n 68: 0000\r\n&&>  '
+
+
+@pytest.mark.asyncio
+async def test_read_until_prompt_returns_on_timeout_without_prompt():
+    stream = ChunksStream('instat102 ?\r\n', '\x00 68: 0000\r\n')
+    start = time.perf_counter()
+    assert await read_until_prompt(stream, timeout=.2) == 'instat102 ?\r\n 68: 0000\r\n'
+    assert time.perf_counter() - start < .5
+
+
+@pytest.mark.asyncio
+async def test_set_stage_without_fixed_timeouts(itc_server):
+    pool = SshSessionPool(port=itc_server.port)
+    try:
+        host = SwarcoSSH('127.0.0.1')
+        host.session_pool = pool
+        start = time.perf_counter()
+        await host.set_stage(3)
+        assert time.perf_counter() - start < 2
+        assert not host.response_errors
+        assert itc_server.inputs[matches_stage_to_num_inp[3]] == 1
+        assert itc_server.inputs[102] == 1
+        assert itc_server.l2_logins == 1
+        host = SwarcoSSH('127.0.0.1')
+        host.session_pool = pool
+        await host.set_stage(4)
+        assert not host.response_errors
+        assert itc_server.inputs[matches_stage_to_num_inp[4]] == 1
+        assert itc_server.l2_logins == 1
+    finally:
+        pool.close()
+
+
+def test_split_stdout_by_commands():
+    stdout = 'inp104=0\r\nOk.\r\n&&>  inp105=1\r\nOk.\r\n&&>  instat102 ?\r\n 68: 0001\r\n&&>  '
+    assert split_stdout_by_commands(stdout, ['inp104=0', 'l2', 'inp105=1', 'instat102 ?']) == [
+        'inp104=0\r\nOk.\r\n&&>  ', '', 'inp105=1\r\nOk.\r\n&&>  ', 'instat102 ?\r\n 68: 0001\r\n&&>  '
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pipelined_commands_stdout_matches_sequential(itc_server):
+    raw_stdout = []
+    for pipeline_commands in (False, True):
+        itc_server.inputs = dict.fromkeys(itc_server.inputs, 0)
+        pool = SshSessionPool(port=itc_server.port)
+        try:
+            host = SwarcoSSH('127.0.0.1')
+            host.session_pool = pool
+            host.pipeline_commands = pipeline_commands
+            await host.set_stage(2)
+            assert not host.response_errors
+            raw_stdout.append(host.raw_stdout)
+        finally:
+            pool.close()
+    assert raw_stdout[0] == raw_stdout[1]
+    assert [command for command, _ in raw_stdout[1]] == [
+        *login_commands, 'inp102=1', 'inp105=1', 'itc', 'instat102 ?', 'SIMULATE DISPLAY --poll'
+    ]
@@ -0,0 +1,135 @@
+import asyncio
+
+import asyncssh
+import pytest
+
+from sdp_lib.management_controllers.ssh.ssh_core import (
+    SshSessionPool,
+    SwarcoSSH
+)
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+def test_pool_evicts_least_recently_used():
+    pool = SshSessionPool(max_sessions=2)
+    first = pool.get('10.0.0.1')
+    pool.get('10.0.0.2')
+    assert pool.get('10.0.0.1') is first
+    pool.get('10.0.0.3')
+    assert '10.0.0.2' not in pool
+    assert len(pool) == 2
+
+
+def test_pool_reaps_idle_sessions():
+    pool = SshSessionPool(idle_timeout=10)
+    pool.get('10.0.0.1')
+    pool.get('10.0.0.2')
+    pool.get('10.0.0.1').last_used -= 11
+    assert pool.reap_idle() == 1
+    assert '10.0.0.1' not in pool
+    assert '10.0.0.2' in pool
+
+
+@pytest.mark.asyncio
+async def test_pool_does_not_close_sessions_in_use():
+    pool = SshSessionPool(max_sessions=2, idle_timeout=10)
+    first = pool.get('10.0.0.1')
+    pool.get('10.0.0.2')
+    async with first.use():
+        first.last_used -= 11
+        assert pool.reap_idle() == 0
+        pool.get('10.0.0.3')
+        assert pool.get('10.0.0.1') is first
+        assert '10.0.0.2' not in pool
+        pool.get('10.0.0.3').in_use += 1
+        pool.get('10.0.0.4')
+        assert len(pool) == 3
+    assert not first.in_use
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_connection_between_hosts_operations(itc_server):
+    pool = SshSessionPool(port=itc_server.port)
+    try:
+        for _ in range(2):
+            host = SwarcoSSH('127.0.0.1')
+            host.session_pool = pool
+            assert await host.check_ssh_session_with_interactive_shell_and_reconnect_if_need()
+            assert not host.response_errors
+        assert itc_server.connections == 1
+        assert pool.export()['127.0.0.1']['is_connected']
+        assert not itc_server.l2_logins
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_operations_do_not_share_shell_output(itc_server):
+    itc_server.response_delay = .01
+    pool = SshSessionPool(port=itc_server.port)
+    try:
+        hosts = [SwarcoSSH('127.0.0.1') for _ in range(3)]
+        for host in hosts:
+            host.session_pool = pool
+        await asyncio.gather(hosts[0].set_stage(3), hosts[1].get_states(), hosts[2].get_states())
+        assert itc_server.connections == 1
+        for host in hosts:
+            assert not host.response_errors
+            assert all(stdout.startswith(command) for command, stdout in host.raw_stdout)
+        assert 'inp102=1' in hosts[0].response_data['sent_commands']
+        assert hosts[1].response_data['sent_commands'] == hosts[2].response_data['sent_commands'] == [
+            'itc', 'instat102 ?', 'SIMULATE DISPLAY --poll'
+        ]
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnects_once_on_stale_pooled_connection(itc_server):
+    pool = SshSessionPool(port=itc_server.port)
+    try:
+        host = SwarcoSSH('127.0.0.1')
+        host.session_pool = pool
+        assert await host.check_ssh_session_with_interactive_shell_and_reconnect_if_need()
+        session = pool.get('127.0.0.1')
+        check_connection = session.check_connection_and_interactive_session
+
+        async def check_stale_connection():
+            session.check_connection_and_interactive_session = check_connection
+            raise asyncssh.ConnectionLost('connection lost')
+
+        session.check_connection_and_interactive_session = check_stale_connection
+        host = SwarcoSSH('127.0.0.1')
+        host.session_pool = pool
+        await host.get_states()
+        assert not host.response_errors
+        assert host.response_data['states_after_shell_session']
+        assert itc_server.connections == 2
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_error_after_write_is_not_replayed(itc_server):
+    pool = SshSessionPool(port=itc_server.port)
+    calls = 0
+
+    async def write_batch_and_read_shell(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        raise TimeoutError
+
+    try:
+        host = SwarcoSSH('127.0.0.1')
+        host.session_pool = pool
+        assert await host.check_ssh_session_with_interactive_shell_and_reconnect_if_need()
+        pool.get('127.0.0.1').write_batch_and_read_shell = write_batch_and_read_shell
+        await host.set_stage(3)
+        assert calls == 1
+        assert [type(e) for e in host.response_errors] == [TimeoutError]
+        assert not pool.get('127.0.0.1').is_connected
+        assert itc_server.connections == 1
+    finally:
+        pool.close()
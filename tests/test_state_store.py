@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from sdp_lib.management_controllers.constants import AllowedControllers
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.snmp import snmp_core
+from sdp_lib.management_controllers.snmp.snmp_core import SwarcoStcip
+from sdp_lib.management_controllers.snmp.snmp_fleet import FleetPoller
+from sdp_lib.management_controllers.state_store import StateStore
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+def make_host(host_id='1', error=None, **data) -> SwarcoStcip:
+    host = SwarcoStcip(ipv4='10.0.0.1', host_id=host_id)
+    host.add_data_to_data_response_attrs(error=error, data=data)
+    return host
+
+
+def test_update_returns_only_changes():
+    store = StateStore()
+    delta = store.update(make_host(current_stage=1, current_mode='VA'))
+    assert delta.changes == {
+        str(FieldsNames.errors): (None, []), 'current_stage': (None, 1), 'current_mode': (None, 'VA')
+    }
+    assert store.update(make_host(current_stage=1, current_mode='VA')) is None
+
+    delta = store.update(make_host(current_stage=1, current_mode='FT'))
+    assert delta.host_id == '1' and delta.changes == {'current_mode': ('VA', 'FT')}
+
+    delta = store.update(make_host(error='No SNMP response received before timeout'))
+    assert delta.changes == {
+        str(FieldsNames.errors): ([], ['No SNMP response received before timeout']),
+        'current_stage': (1, None),
+        'current_mode': ('FT', None),
+    }
+    assert len(store) == 1
+
+
+@pytest.mark.asyncio
+async def test_subscribe_and_fleet_poller(monkeypatch):
+    stages = iter([1, 1, 2])
+
+    async def get_states(self):
+        self.add_data_to_data_response_attrs(data={'current_stage': next(stages)})
+        return self
+
+    monkeypatch.setattr(snmp_core.StcipHosts, 'get_states', get_states)
+    store = StateStore()
+    poller = FleetPoller([(AllowedControllers.SWARCO, '10.0.0.1', '1')], state_store=store)
+
+    async def consume():
+        return [delta.changes async for delta in store.subscribe()]
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    for _ in range(3):
+        await poller.poll_all()
+    store.close()
+    assert await consumer == [
+        {str(FieldsNames.errors): (None, []), 'current_stage': (None, 1)},
+        {'current_stage': (1, 2)},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_subscription_receives_deltas_before_iteration():
+    store = StateStore()
+    subscription = store.subscribe()
+    store.update(make_host(current_stage=1))
+    store.update(make_host(current_stage=2))
+    store.close()
+    assert [delta.changes.get('current_stage') async for delta in subscription] == [(None, 1), (1, 2)]
+
+    async with store.subscribe() as subscription:
+        store.update(make_host(current_stage=3))
+    store.update(make_host(current_stage=4))
+    assert [delta.changes['current_stage'] async for delta in subscription] == []
@@ -77,3 +77,22 @@ def test_convert_val_as_hex_to_decimal():
         assert num_stage == convert_val_as_hex_to_decimal(stg_as_hex)
 
 
+
+def test_scn_varbinds_cache_is_lazy_and_bounded():
+    cache = ScnVarbindsCache(oids.oids_state_potok_p, maxsize=2)
+    assert len(cache) == 0
+    scn1, scn2, scn3 = (convert_chars_string_to_ascii_string(f'CO{i}') for i in range(1, 4))
+    varbinds = cache.get(scn1)
+    assert isinstance(varbinds, tuple) and len(varbinds) == len(oids.oids_state_potok_p)
+    assert cache.get(scn1) is varbinds
+    cache.get(scn2)
+    cache.get(scn1)
+    cache.get(scn3)
+    assert len(cache) == 2
+    assert scn1 in cache and scn3 in cache and scn2 not in cache
+
+def test_scn_varbinds_cache_warm_up():
+    cache = ScnVarbindsCache(oids.oids_state_potok_p)
+    cache.warm_up(['CO1', 'CO3995'])
+    assert len(cache) == 2
+    assert convert_chars_string_to_ascii_string('CO3995') in cache